@@ -3,7 +3,7 @@ Example: collect messages from a contact using the event-based pattern.
 
 Muestra el patrón correcto con:
   - on_logged_in event + done_event
-  - _page_lock para evitar race conditions
+  - client.scheduler para evitar race conditions (con prioridad y deadline)
   - Manejo de errores sin masking
   - Debug logging por timestamp
 
@@ -19,6 +19,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
 from whatsplay import Client, LocalProfileAuth
+from whatsplay.scheduler import PRIORITY_SCRAPE
 
 
 async def collect_messages(contact: str, limit: int = 20):
@@ -39,10 +40,10 @@ async def collect_messages(contact: str, limit: int = 20):
         t0 = asyncio.get_event_loop().time()
 
         try:
-            # ── usar _page_lock para evitar race conditions ──
-            async with client._page_lock:
+            # ── reservar la página en el scheduler para evitar race conditions ──
+            async with client.scheduler.slot(PRIORITY_SCRAPE, "collect", deadline=60):
                 elapsed = asyncio.get_event_loop().time() - t0
-                print(f"[collect:{elapsed:.2f}s] _page_lock adquirido, abriendo chat...")
+                print(f"[collect:{elapsed:.2f}s] página reservada, abriendo chat...")
 
                 ok = await client.open(contact)
                 elapsed = asyncio.get_event_loop().time() - t0
@@ -37,7 +37,10 @@ async def investigate():
                     continue
 
                 print(f"  duration={msg.duration!r}")
-                container = msg.container
+                container = await msg.get_container()
+                if not container:
+                    print("  ⚠️  container not rendered")
+                    continue
 
                 # 1. All attrs of container
                 html = await container.evaluate("el => el.outerHTML")
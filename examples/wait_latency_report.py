@@ -0,0 +1,71 @@
+"""
+Example: latency report of the condition-based waits.
+
+Abre un contacto, colecta sus mensajes y (opcionalmente) le envía un
+archivo, y al final imprime ``WAIT_STATS.format_report()``: cuánto tardó
+cada espera por condición frente al sleep fijo que reemplazó.
+
+Uso:
+  CONTACTO="Nombre del contacto" [ARCHIVO=/ruta/al/archivo] [VUELTAS=3] \\
+      python examples/wait_latency_report.py
+"""
+
+import os
+import sys
+import asyncio
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from whatsplay import Client, LocalProfileAuth
+from whatsplay.scheduler import PRIORITY_SCRAPE
+from whatsplay.waits import WAIT_STATS
+
+
+async def run(contact: str, path: str, rounds: int):
+    auth = LocalProfileAuth(data_dir=str(Path(__file__).parent / "whatsapp_session"))
+    client = Client(auth=auth, headless=False)
+    done = asyncio.Event()
+
+    @client.event("on_logged_in")
+    async def on_logged_in():
+        try:
+            for i in range(rounds):
+                t0 = time.monotonic()
+                async with client.scheduler.slot(PRIORITY_SCRAPE, "latency", deadline=60):
+                    if not await client.open(contact):
+                        print(f"❌ No se pudo abrir {contact}")
+                        return
+                    messages = await client.collect_messages()
+                    await client.close()
+                print(f"[vuelta {i + 1}] {len(messages)} mensajes en {time.monotonic() - t0:.2f}s")
+
+            if path:
+                t0 = time.monotonic()
+                ok = await client.send_file(contact, path)
+                print(f"[send_file] {ok} en {time.monotonic() - t0:.2f}s")
+        finally:
+            print()
+            print(WAIT_STATS.format_report())
+            await client.stop()
+            done.set()
+
+    @client.event("on_qr")
+    async def on_qr(qr):
+        print("📱 QR recibido — escanealo con WhatsApp")
+
+    await client.start()
+    await done.wait()
+
+
+async def main():
+    contact = os.environ.get("CONTACTO", "")
+    if not contact:
+        print("Uso: CONTACTO='Nombre del contacto' python examples/wait_latency_report.py")
+        sys.exit(1)
+    await run(contact, os.environ.get("ARCHIVO", ""), int(os.environ.get("VUELTAS", "3")))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
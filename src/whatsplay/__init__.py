@@ -10,6 +10,7 @@ from whatsplay.auth.no_auth import NoAuth
 from whatsplay.chat_manager import ChatManager
 from whatsplay.state_manager import StateManager
 from whatsplay.object.message import Message, FileMessage, VoiceMessage
+from whatsplay.receipts import DeliveryReceipt
 from whatsplay.codec_detector import detect_codec, get_codec_name
 
 __version__ = "2.2.0"
@@ -25,6 +26,7 @@ __all__ = [
     "Message",
     "FileMessage",
     "VoiceMessage",
+    "DeliveryReceipt",
     "detect_codec",
     "get_codec_name",
 ]
@@ -0,0 +1,331 @@
+"""
+Send one message or file to many chats.
+
+``Broadcaster`` goes over the existing send path one recipient at a time: a
+send only returns once its bubble shows the server tick, so every recipient
+is confirmed before the next chat is opened. Only later statuses
+(``wait_for="delivered"``/``"read"``) are awaited in the background. Sends
+are paced by a global and a per-chat token bucket, and every outcome is
+appended to a checkpoint file so an interrupted broadcast resumes where it
+stopped.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from .chat_index import normalize_chat_key
+from .receipts import RECEIPT_SENT
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+# Defaults: one send every 2s overall, at most one per chat every 5s
+DEFAULT_BROADCAST_RATE = 0.5
+DEFAULT_BROADCAST_BURST = 1
+DEFAULT_PER_CHAT_RATE = 0.2
+# Recipients whose receipts may be awaited at the same time
+DEFAULT_BROADCAST_WINDOW = 10
+
+# Recipient states in the checkpoint
+BROADCAST_SENDING = "sending"
+BROADCAST_SENT = "sent"
+# Sent, but ``wait_for`` was not confirmed in time; never resent
+BROADCAST_UNCONFIRMED = "unconfirmed"
+BROADCAST_FAILED = "failed"
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Attributes:
+        rate: Tokens added per second (None or 0 disables the limit)
+        burst: Maximum tokens stored
+    """
+
+    def __init__(self, rate: Optional[float], burst: int = 1, clock=time.monotonic) -> None:
+        """
+        Initialize the bucket, full.
+
+        Args:
+            rate: Tokens added per second (None or 0 disables the limit)
+            burst: Maximum tokens stored
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting."""
+        if not self.rate:
+            return True
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def delay(self) -> float:
+        """Seconds until the next token is available."""
+        if not self.rate:
+            return 0.0
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    async def acquire(self) -> None:
+        """Wait for a token and take it."""
+        while not self.try_acquire():
+            await asyncio.sleep(self.delay())
+
+
+class BroadcastCheckpoint:
+    """
+    Append-only record of a broadcast's progress.
+
+    The file is JSON lines: a header with the broadcast's fingerprint, then
+    one ``{"target", "status"}`` line per state change, flushed to disk as
+    it is written. A torn last line (crash mid-write) is ignored on load.
+
+    Attributes:
+        path: Checkpoint file
+        fingerprint: Hash of the message/file being broadcast
+        status: target key -> last recorded status
+    """
+
+    def __init__(self, path: str, fingerprint: str) -> None:
+        """
+        Open (or create) a checkpoint.
+
+        Args:
+            path: Checkpoint file
+            fingerprint: Hash of the message/file being broadcast
+
+        Raises:
+            ValueError: If the file belongs to a different broadcast
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.status: Dict[str, str] = {}
+        self._load()
+        self._file = open(path, "a", encoding="utf-8")
+        if os.path.getsize(path) == 0:
+            self._write({"fingerprint": fingerprint})
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if number == 0:
+                    if record.get("fingerprint") != self.fingerprint:
+                        raise ValueError(
+                            f"Checkpoint {self.path} belongs to a different broadcast"
+                        )
+                    continue
+                if record.get("target"):
+                    self.status[record["target"]] = record.get("status")
+
+    def _write(self, record: Dict[str, str]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def mark(self, target: str, status: str) -> None:
+        """Record a recipient's new status."""
+        self.status[target] = status
+        self._write({"target": target, "status": status})
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def broadcast_fingerprint(message: Optional[str], file: Optional[str]) -> str:
+    """Identify a broadcast by its content, so checkpoints are not mixed up."""
+    digest = hashlib.sha256()
+    digest.update((message or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(os.path.abspath(file).encode("utf-8") if file else b"")
+    return digest.hexdigest()[:16]
+
+
+class Broadcaster:
+    """
+    Sends one message and/or file to many chats.
+
+    Attributes:
+        client: Client used to send
+        window: Recipients whose receipts may be awaited at the same time
+    """
+
+    def __init__(self, client: "Client", window: int = DEFAULT_BROADCAST_WINDOW) -> None:
+        """
+        Initialize the broadcaster.
+
+        Args:
+            client: Client used to send
+            window: Recipients whose receipts may be awaited at the same time
+        """
+        self.client = client
+        self.window = window
+        # Per-chat buckets outlive a single broadcast
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def _is_phone(target: str) -> bool:
+        """True if the target is a phone number (opened via ``send?phone=``)."""
+        return normalize_chat_key(target).isdigit()
+
+    def _chat_bucket(self, key: str, rate: Optional[float]) -> TokenBucket:
+        bucket = self._chat_buckets.get(key)
+        if bucket is None or bucket.rate != rate:
+            bucket = self._chat_buckets[key] = TokenBucket(rate)
+        return bucket
+
+    async def _send_one(
+        self,
+        target: str,
+        message: Optional[str],
+        file: Optional[str],
+        wait_for: Optional[str],
+        timeout: float,
+    ) -> str:
+        """
+        Send the file and/or message to one recipient and await the receipts.
+
+        Returns:
+            ``"sent"``, ``"failed"`` if nothing was sent, or ``"unconfirmed"``
+            if something was sent but not confirmed
+        """
+        chat_manager = self.client.chat_manager
+        open_via_url = self._is_phone(target)
+        receipts = []
+        if file:
+            receipt = await chat_manager.send_file_tracked(target, file, open_via_url=open_via_url)
+            if receipt is None:
+                return BROADCAST_FAILED
+            receipts.append(receipt)
+        if message:
+            receipt = await chat_manager.send_message_tracked(target, message, open_via_url)
+            if receipt is None:
+                # The file went out: sending again would duplicate it
+                return BROADCAST_UNCONFIRMED if receipts else BROADCAST_FAILED
+            receipts.append(receipt)
+        results = await asyncio.gather(
+            *(chat_manager._await_receipt(r, wait_for, timeout) for r in receipts)
+        )
+        confirmed = all(results) and all(r.msg_id for r in receipts)
+        return BROADCAST_SENT if confirmed else BROADCAST_UNCONFIRMED
+
+    async def run(
+        self,
+        targets: Iterable[str],
+        message: Optional[str] = None,
+        file: Optional[str] = None,
+        checkpoint: Optional[str] = None,
+        rate: Optional[float] = DEFAULT_BROADCAST_RATE,
+        per_chat_rate: Optional[float] = DEFAULT_PER_CHAT_RATE,
+        burst: int = DEFAULT_BROADCAST_BURST,
+        wait_for: Optional[str] = RECEIPT_SENT,
+        timeout: float = 30.0,
+        retry_failed: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Send ``message`` and/or ``file`` to every target.
+
+        Args:
+            targets: Chat names or phone numbers (phone numbers are opened via URL)
+            message: Text to send
+            file: Path of a file to send (sent before the text)
+            checkpoint: Progress file; recipients already recorded there are
+                not sent again
+            rate: Sends per second across all recipients (None: unlimited)
+            per_chat_rate: Sends per second to the same chat (None: unlimited)
+            burst: Sends allowed back to back before ``rate`` applies
+            wait_for: Receipt status that counts as sent, or None
+            timeout: Maximum time to wait for each receipt in seconds
+            retry_failed: Also resend recipients that failed, or whose send
+                was interrupted, in a previous run (``"unconfirmed"``
+                recipients are never resent)
+
+        Returns:
+            Target -> ``"sent"``, ``"unconfirmed"`` (sent, but ``wait_for``
+            not seen in time) or ``"failed"``, in target order (including
+            recipients completed by a previous run)
+
+        Raises:
+            ValueError: If neither ``message`` nor ``file`` is given, or the
+                checkpoint belongs to a different broadcast
+        """
+        if not message and not file:
+            raise ValueError("broadcast needs a message or a file")
+
+        # One entry per chat, first occurrence wins
+        ordered: Dict[str, str] = {}
+        for target in targets:
+            key = normalize_chat_key(target)
+            if key and key not in ordered:
+                ordered[key] = target
+
+        store = (
+            BroadcastCheckpoint(checkpoint, broadcast_fingerprint(message, file))
+            if checkpoint else None
+        )
+        results: Dict[str, str] = {}
+        global_bucket = TokenBucket(rate, burst)
+        window = asyncio.Semaphore(self.window)
+        tasks: List[asyncio.Task] = []
+
+        async def deliver(key: str, target: str) -> None:
+            try:
+                status = await self._send_one(target, message, file, wait_for, timeout)
+            except Exception as e:
+                logger.error("broadcast: error sending to %s: %s", target, e)
+                status = BROADCAST_FAILED
+            finally:
+                window.release()
+            results[target] = status
+            if store:
+                store.mark(key, results[target])
+
+        try:
+            for key, target in ordered.items():
+                previous = store.status.get(key) if store else None
+                done = previous in (BROADCAST_SENT, BROADCAST_UNCONFIRMED)
+                if done or (previous and not retry_failed):
+                    results[target] = previous if done else BROADCAST_FAILED
+                    continue
+
+                await window.acquire()
+                await global_bucket.acquire()
+                await self._chat_bucket(key, per_chat_rate).acquire()
+                if store:
+                    store.mark(key, BROADCAST_SENDING)
+                tasks.append(asyncio.create_task(deliver(key, target)))
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if store:
+                store.close()
+
+        return {target: results[target] for target in ordered.values() if target in results}
@@ -0,0 +1,170 @@
+"""
+Persistent chat-resolution index.
+
+Remembers, for every chat name or phone number, how the chat was last
+reached: a visible sidebar row, a search hit or a ``send?phone=`` URL.
+``WhatsAppElements.open`` tries the cheapest known route first, so chats
+seen by sidebar crawls are clicked directly instead of typed into search,
+and numbers that only opened by URL fall back to it (reloading the page)
+only when their row and search both fail.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Routes, cheapest first
+ROUTE_ROW = "row"
+ROUTE_SEARCH = "search"
+ROUTE_URL = "url"
+ROUTE_ORDER = (ROUTE_ROW, ROUTE_SEARCH, ROUTE_URL)
+
+CHAT_INDEX_FILENAME = "chat_index.json"
+CHAT_INDEX_VERSION = 1
+
+
+def normalize_chat_key(query: str) -> str:
+    """
+    Key under which a chat name or number is indexed.
+
+    Phone numbers are reduced to their digits ("+54 9 11 2233-4455" and
+    "5491122334455" share a key); names are compared case-insensitively.
+    """
+    query = (query or "").strip()
+    if re.fullmatch(r"[\d\s()+\-.]+", query) and re.search(r"\d", query):
+        return re.sub(r"\D", "", query)
+    return query.casefold()
+
+
+class ChatIndex:
+    """
+    Maps chat names and numbers to the route that last opened them.
+
+    Entries are ``{"title": str, "route": str, "updated": float}``. The index
+    is kept in memory and written to ``path`` (atomically) by ``save``.
+
+    Attributes:
+        path: JSON file backing the index (None keeps it in memory only)
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Initialize the index, loading ``path`` if it exists.
+
+        Args:
+            path: JSON file backing the index (None keeps it in memory only)
+        """
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, query: str) -> bool:
+        return normalize_chat_key(query) in self._entries
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """Return the entry of a chat name or number, if indexed."""
+        return self._entries.get(normalize_chat_key(query))
+
+    def route(self, query: str) -> Optional[str]:
+        """Return the route that last opened a chat, if indexed."""
+        entry = self.get(query)
+        return entry["route"] if entry else None
+
+    def record(self, query: str, route: str, title: Optional[str] = None) -> None:
+        """
+        Remember how a chat was reached.
+
+        Args:
+            query: Name or number the chat was opened with
+            route: One of ``ROUTE_ORDER``
+            title: Title shown in the chat header, if known
+        """
+        if route not in ROUTE_ORDER or not query:
+            return
+        keys = {normalize_chat_key(query)}
+        if title:
+            keys.add(normalize_chat_key(title))
+        for key in keys:
+            entry = self._entries.get(key)
+            new_title = title or (entry or {}).get("title") or query
+            if entry and entry["route"] == route and entry["title"] == new_title:
+                continue
+            self._entries[key] = {"title": new_title, "route": route, "updated": time.time()}
+            self._dirty = True
+
+    def observe_rows(self, titles: Iterable[str]) -> None:
+        """
+        Record chats seen as sidebar rows by a crawl.
+
+        A row only replaces a URL route, not a search route: rows in the
+        virtualized list may not be rendered the next time the chat is opened,
+        and search still finds them.
+
+        Args:
+            titles: Chat titles of the rows (group name for groups)
+        """
+        for title in titles:
+            if not title:
+                continue
+            key = normalize_chat_key(title)
+            entry = self._entries.get(key)
+            if entry is None or entry["route"] == ROUTE_URL:
+                self._entries[key] = {"title": title, "route": ROUTE_ROW, "updated": time.time()}
+                self._dirty = True
+
+    def forget(self, query: str) -> None:
+        """Drop a chat from the index (e.g. after its route stopped working)."""
+        if self._entries.pop(normalize_chat_key(query), None) is not None:
+            self._dirty = True
+
+    def load(self) -> None:
+        """Load entries from ``path``. A missing or corrupt file leaves the index empty."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entries = data.get("chats", {}) if isinstance(data, dict) else {}
+            self._entries = {
+                key: entry for key, entry in entries.items()
+                if isinstance(entry, dict) and entry.get("route") in ROUTE_ORDER
+            }
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load chat index %s: %s", self.path, e)
+            self._entries = {}
+        self._dirty = False
+
+    def save(self) -> bool:
+        """
+        Write the index to ``path`` if it changed.
+
+        Returns:
+            True if the file was written
+        """
+        if not self.path or not self._dirty:
+            return False
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".chat_index.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": CHAT_INDEX_VERSION, "chats": self._entries}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            if tmp and os.path.exists(tmp):
+                os.unlink(tmp)
+            logger.warning("Could not save chat index %s: %s", self.path, e)
+            return False
+        self._dirty = False
+        return True
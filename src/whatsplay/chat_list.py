@@ -0,0 +1,146 @@
+"""
+In-memory model of the WhatsApp Web sidebar.
+
+This module keeps the last known state of every unread chat (name,
+preview, last activity, unread count and position) and turns each sweep
+of the chat list into a list of diffs, so events can be edge-triggered
+instead of re-emitting the same chats on every tick.
+"""
+
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+# Diff types
+CHAT_UNREAD = "unread"  # Chat became unread
+CHAT_NEW_MESSAGE = "new_message"  # Preview or last activity changed
+CHAT_UNREAD_INCREASE = "unread_increase"  # Unread count went up
+CHAT_MOVED_UP = "moved_up"  # Chat moved up in the list
+CHAT_READ = "read"  # Chat is no longer unread
+
+
+def chat_key(chat: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Stable identity of a chat dictionary."""
+    return (chat.get("group"), chat.get("name"))
+
+
+def _unread_count(chat: Dict[str, Any]) -> int:
+    """Parse the unread count of a chat dictionary (0 if unknown)."""
+    try:
+        return int(str(chat.get("unread_count") or "0").strip())
+    except ValueError:
+        return 0
+
+
+class ChatListModel:
+    """
+    Tracks unread chats between sweeps and reports what changed.
+
+    Each diff is a dictionary with:
+        - ``type``: the main change (one of the ``CHAT_*`` constants)
+        - ``changes``: every change detected for the chat
+        - ``chat``: the current chat dictionary
+        - ``previous``: the previous chat dictionary (None for new chats)
+
+    Example:
+        >>> model = ChatListModel()
+        >>> model.update([{"name": "Ana", "last_message": "Hola"}])[0]["type"]
+        'unread'
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty model."""
+        self._chats: Dict[Tuple, Dict[str, Any]] = {}
+        self._positions: Dict[Tuple, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._chats)
+
+    @property
+    def chats(self) -> List[Dict[str, Any]]:
+        """Current unread chats, in sidebar order."""
+        return sorted(self._chats.values(), key=lambda c: self._positions[chat_key(c)])
+
+    def reset(self) -> None:
+        """Forget every tracked chat."""
+        self._chats.clear()
+        self._positions.clear()
+
+    def update(
+        self, chats: List[Dict[str, Any]], covered: Optional[Collection[Tuple]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Replace the model with a new sweep and return the differences.
+
+        A previously unread chat missing from ``chats`` is only reported as
+        read if the sweep covered it; chats the sweep did not reach (e.g. a
+        crawl cut short by its row or time limit) are kept as they were.
+
+        Args:
+            chats: Unread chats from the latest sweep, in sidebar order
+            covered: Keys (``chat_key``) of every chat the sweep saw, read or
+                unread; None if it saw the whole list
+
+        Returns:
+            List of diffs (empty if nothing changed)
+        """
+        diffs: List[Dict[str, Any]] = []
+        chats_now: Dict[Tuple, Dict[str, Any]] = {}
+        positions_now: Dict[Tuple, int] = {}
+        for position, chat in enumerate(chats):
+            key = chat_key(chat)
+            if key not in chats_now:
+                chats_now[key] = chat
+                positions_now[key] = position
+
+        # Rank chats present in both sweeps among themselves, so a chat is only
+        # "moved up" when it overtakes another one (not when a chat above it
+        # is read or a new chat appears).
+        common = [k for k in chats_now if k in self._chats]
+        old_rank = {k: r for r, k in enumerate(sorted(common, key=self._positions.get))}
+        new_rank = {k: r for r, k in enumerate(sorted(common, key=positions_now.get))}
+
+        for key, chat in chats_now.items():
+            previous = self._chats.get(key)
+            if previous is None:
+                changes = [CHAT_UNREAD]
+            else:
+                changes = []
+                if (chat.get("last_message"), chat.get("last_activity")) != (
+                    previous.get("last_message"),
+                    previous.get("last_activity"),
+                ):
+                    changes.append(CHAT_NEW_MESSAGE)
+                if _unread_count(chat) > _unread_count(previous):
+                    changes.append(CHAT_UNREAD_INCREASE)
+                if new_rank[key] < old_rank[key]:
+                    changes.append(CHAT_MOVED_UP)
+
+            if changes:
+                diffs.append(
+                    {
+                        "type": changes[0],
+                        "changes": changes,
+                        "chat": chat,
+                        "previous": previous,
+                    }
+                )
+
+        for key, previous in self._chats.items():
+            if key in chats_now:
+                continue
+            if covered is not None and key not in covered:
+                # Not reached by this sweep: still unread as far as we know
+                chats_now[key] = previous
+                positions_now[key] = len(chats) + self._positions[key]
+            else:
+                diffs.append(
+                    {
+                        "type": CHAT_READ,
+                        "changes": [CHAT_READ],
+                        "chat": previous,
+                        "previous": previous,
+                    }
+                )
+
+        self._chats = chats_now
+        self._positions = positions_now
+        return diffs
@@ -11,7 +11,8 @@ import logging
 import os
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +22,203 @@ from playwright.async_api import (
 )
 
 from .constants import locator as loc
-from .object.message import FileMessage, Message, VoiceMessage
+from .object.message import (
+    MESSAGE_LIST_JS,
+    MESSAGE_NODE_JS,
+    FileMessage,
+    Message,
+    VoiceMessage,
+    message_from_data,
+)
+from .chat_index import ChatIndex, normalize_chat_key
+from .chat_list import chat_key
+from .metrics import timed
 from .codec_detector import detect_codec
+from .open_guard import DEFINITE_OPEN_ERRORS, CircuitBreaker, NegativeCache
+from .outbox import Outbox
+from .receipts import RECEIPT_SENT, DeliveryReceipt, ReceiptTracker
+from .scheduler import PRIORITY_SCRAPE, PRIORITY_SEND, PRIORITY_SWEEP
+from .waits import timed_wait, wait_for_condition
 
 # Constants
 DEFAULT_DOWNLOADS_DIR = Path.home() / "Downloads" / "WhatsAppFiles"
 UNREAD_ARIA_PATTERN = r"(?:mensaje(?:s)?\s+no\s+le[ií]do[s]?|unread)"
 MIN_VISIBLE_CHATS_THRESHOLD = 2
 DEFAULT_WAIT_TIMEOUT = 30000
+DEFAULT_RECEIPT_TIMEOUT = DEFAULT_WAIT_TIMEOUT / 1000
+# Seconds a sender keeps the chat open waiting for the server tick
+SENT_TICK_TIMEOUT = 10.0
+DEFAULT_CRAWL_MAX_ROWS = 500
+DEFAULT_CRAWL_MAX_SECONDS = 5.0
+DEFAULT_UNREAD_STRATEGY = "filter"
+DEFAULT_HISTORY_BATCH_SIZE = 20
+DEFAULT_HISTORY_PAGE_TIMEOUT = 5.0
+DEFAULT_SWEEP_DEADLINE = 30.0
+# Bounds of the condition waits that replaced fixed sleeps (ms)
+MESSAGES_RENDERED_TIMEOUT = 5000
+COLLECT_LOAD_OLDER_TIMEOUT = 1500
+CHAT_CLOSE_TIMEOUT = 2000
+
+# Finds the element that actually scrolls the virtualized chat grid.
+CHAT_LIST_SCROLLER_JS = """
+(el) => {
+    let cur = el;
+    while (cur && cur !== document.body) {
+        const s = getComputedStyle(cur);
+        if ((s.overflowY === 'auto' || s.overflowY === 'scroll') &&
+            cur.clientHeight < cur.scrollHeight) return cur;
+        cur = cur.parentElement;
+    }
+    return document.querySelector('#pane-side');
+}
+"""
+
+# Scrolls one viewport down and waits two frames for the grid to re-render.
+# Returns False once the bottom of the list has been reached.
+CHAT_LIST_PAGE_DOWN_JS = """
+async (el) => {
+    const before = el.scrollTop;
+    el.scrollTop = before + el.clientHeight;
+    await new Promise((r) => requestAnimationFrame(() => requestAnimationFrame(r)));
+    return el.scrollTop > before;
+}
+"""
+
+# Extracts every chat-list row as plain JSON in one evaluate_all: the row
+# layout (2 cells for direct chats, 3 for groups) and the unread checks.
+CHAT_ROWS_JS = """
+(rows, sel) => {
+    const xpathAll = (xpath, ctx) => {
+        const snap = document.evaluate(
+            xpath, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        const out = [];
+        for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+        return out;
+    };
+    const text = (el) => ((el && el.textContent) || '').replace(/\\n/g, '');
+    const titleOf = (el) => {
+        const span = el ? xpathAll(sel.span_title, el)[0] : null;
+        return span ? span.getAttribute('title') || '' : '';
+    };
+    const unreadRx = new RegExp(sel.unread_aria, 'i');
+
+    return rows.map((row) => {
+        const components = xpathAll(sel.components, row);
+        const layout = components.length;
+        const unreadEl = xpathAll(sel.unread_count, row)[0];
+        const titleSpan = xpathAll(sel.span_title, row)[0];
+        let isBold = false;
+        if (titleSpan) {
+            const w = getComputedStyle(titleSpan).fontWeight;
+            const n = parseInt(w, 10);
+            isBold = isNaN(n) ? /bold/i.test(w) : n >= 600;
+        }
+        const out = {
+            layout,
+            group: null,
+            title: '',
+            last_activity: '',
+            preview: '',
+            unread_count: unreadEl ? (unreadEl.innerText || '').trim() || '0' : '0',
+            mic: layout > 1 && !!components[1].querySelector('span[data-icon="mic"]'),
+            has_unread_aria: Array.from(row.querySelectorAll('[aria-label]')).some(
+                (el) => unreadRx.test(el.getAttribute('aria-label') || '')
+            ),
+            has_unread_badge: xpathAll(sel.unread_badge, row).length > 0,
+            has_unread_text: xpathAll(sel.unread_badge_text, row).length > 0,
+            is_bold: isBold,
+        };
+        if (layout === 3) {
+            out.group = titleOf(components[0]);
+            out.title = titleOf(components[1]);
+            out.preview = text(components[2]);
+        } else if (layout === 2) {
+            out.title = titleOf(components[0]);
+            out.preview = text(components[1].children[0]);
+        }
+        if (layout === 2 || layout === 3) {
+            out.last_activity = (components[0].children[1] || {}).textContent || '';
+        }
+        return out;
+    });
+}
+"""
+
+# Title of the conversation open in the main pane (None if no chat is open).
+CURRENT_CHAT_JS = """
+() => {
+    const header = document.querySelector('#main header');
+    if (!header) return null;
+    const span = header.querySelector('span[title]') || header.querySelector('span[dir="auto"]');
+    return span ? (span.getAttribute('title') || span.textContent || '').trim() : null;
+}
+"""
+
+# Open chat title plus every rendered message, in a single round trip.
+COLLECT_MESSAGES_JS = "(sel) => ({ chat: (%s)(), messages: (%s)(sel) })" % (
+    CURRENT_CHAT_JS.strip(),
+    MESSAGE_LIST_JS,
+)
+
+# The last ``size`` rendered messages strictly older than ``before`` (a
+# data-id; newest messages when null). Returns null if the anchor is gone.
+MESSAGES_BEFORE_JS = """
+({ sel, before, size }) => {
+    const els = Array.from(document.querySelectorAll(sel));
+    let end = els.length;
+    if (before) {
+        end = els.findIndex((el) => el.getAttribute('data-id') === before);
+        if (end < 0) return null;
+    }
+    return els.slice(Math.max(0, end - size), end).map(%s);
+}
+""" % MESSAGE_NODE_JS.strip()
+
+# True once the open chat has rendered at least one message container
+MESSAGES_RENDERED_JS = "(sel) => document.querySelectorAll(sel).length > 0"
+
+# Waits for the open chat to be closed (no conversation header)
+CHAT_CLOSED_JS = "() => !document.querySelector('#main header')"
+
+# Scrolls the message pane to the top so WhatsApp loads older messages and
+# waits until a new first message is rendered. Returns false on timeout
+# (start of the history reached or nothing loaded).
+MESSAGE_PANE_LOAD_OLDER_JS = """
+async ({ sel, timeoutMs }) => {
+    const firstId = () => {
+        const el = document.querySelector(sel);
+        return el ? el.getAttribute('data-id') : null;
+    };
+    const first = document.querySelector(sel);
+    if (!first) return false;
+    let scroller = first.parentElement;
+    while (scroller && scroller !== document.body) {
+        const s = getComputedStyle(scroller);
+        if ((s.overflowY === 'auto' || s.overflowY === 'scroll') &&
+            scroller.scrollHeight > scroller.clientHeight) break;
+        scroller = scroller.parentElement;
+    }
+    if (!scroller || scroller === document.body) return false;
+    const before = firstId();
+    scroller.scrollTop = 0;
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+        await new Promise((r) => setTimeout(r, 100));
+        if (firstId() !== before) return true;
+    }
+    return false;
+}
+"""
+
+CHAT_ROWS_ARGS = {
+    "components": loc.SEARCH_ITEM_COMPONENTS,
+    "span_title": loc.SPAN_TITLE,
+    "unread_count": loc.SEARCH_ITEM_UNREAD_MESSAGES,
+    "unread_badge": loc.UNREAD_BADGE,
+    "unread_badge_text": loc.UNREAD_BADGE_TEXT,
+    "unread_aria": UNREAD_ARIA_PATTERN,
+}
 
 
 class ChatManager:
@@ -59,210 +249,390 @@ class ChatManager:
         self.client = client
         self._page = client._page
         self.wa_elements = client.wa_elements
-
-    async def _check_unread_chats(self, debug: bool = True) -> List[Dict[str, Any]]:
+        self.crawl_max_rows = DEFAULT_CRAWL_MAX_ROWS
+        self.crawl_max_seconds = DEFAULT_CRAWL_MAX_SECONDS
+        self.unread_strategy = DEFAULT_UNREAD_STRATEGY
+        self.last_sweep_ok = True
+        self.sweep_deadline = DEFAULT_SWEEP_DEADLINE
+        # Title of the open conversation, as last confirmed from its header
+        self.current_chat: Optional[str] = None
+        # (group, name) -> (last_activity, last_message) seen by the last crawl
+        self._sweep_snapshot: Dict[tuple, tuple] = {}
+        # Unread rows of the last crawl, carried forward when a crawl stops above them
+        self._unread_rows: Dict[tuple, Dict[str, Any]] = {}
+        # False if the last crawl hit a row/time limit before the end of the list
+        self.last_crawl_complete = True
+        # Keys of the chats the last sweep saw (None: it covered the whole list)
+        self.last_sweep_covered: Optional[set] = None
+        # Chats being paged through by iter_messages: the sweep leaves them open
+        self._pinned_chats: List[str] = []
+        # chat title -> msg_id of the last message returned by collect_messages
+        self._watermarks: Dict[str, str] = {}
+        self.outbox = Outbox(self._send_batch)
+        self.receipts = ReceiptTracker(client)
+        # How each chat was last reached (row/search/url), shared with the client
+        self.chat_index = getattr(client, "chat_index", None) or ChatIndex()
+        # Targets that failed to open: skipped until their TTL/cooldown passes
+        self.negative_cache = NegativeCache()
+        self.breaker = CircuitBreaker()
+
+    async def _extract_chat_rows(self) -> List[Dict[str, Any]]:
         """
-        Detect all unread chats in the sidebar.
+        Extract every rendered chat-list row in a single round trip.
 
-        This method scans the chat list to identify unread messages using multiple
-        heuristics including aria-labels, badges, and font weight detection.
+        Runs one ``evaluate_all`` over ``CHAT_LIST_ROWS`` and returns plain
+        JSON per row: titles, last activity, preview, unread count, mic flag
+        and the unread heuristics (see ``CHAT_ROWS_JS``).
 
-        Args:
-            debug: If True, prints debug information during execution
+        Returns:
+            List of raw row dictionaries, in sidebar order
+        """
+        rows = self._page.locator(f"xpath={loc.CHAT_LIST_ROWS}")
+        rows = await rows.evaluate_all(CHAT_ROWS_JS, CHAT_ROWS_ARGS)
+        titles = [
+            row.get("group") if row.get("layout") == 3 else row.get("title")
+            for row in rows
+            if row.get("layout") in (2, 3)
+        ]
+        # Rendered rows can be clicked directly the next time they are opened
+        self.chat_index.observe_rows(titles)
+        for title in titles:
+            if title:
+                self.negative_cache.discard(normalize_chat_key(title))
+        return rows
+
+    async def _get_chat_list_scroller(self):
+        """
+        Get the handle of the element that scrolls the virtualized chat list.
 
         Returns:
-            List of dictionaries containing unread chat information
+            JSHandle of the scrolling container (falls back to ``#pane-side``)
+        """
+        grid_h = await self._page.locator(loc.CHAT_LIST_GRID).element_handle()
+        if not grid_h:
+            return await self._page.locator("#pane-side").element_handle()
+        try:
+            return await grid_h.evaluate_handle(CHAT_LIST_SCROLLER_JS)
+        finally:
+            await grid_h.dispose()
 
-        Note:
-            The method uses multiple detection strategies:
-            1. aria-label matching for 'unread' or 'mensaje(s) no leído'
-            2. Explicit unread badge detection
-            3. Bold font weight detection on chat titles
+    @staticmethod
+    def _row_key(row: Dict[str, Any]) -> tuple:
+        """Stable identity of a raw chat-list row."""
+        return (row.get("group"), row.get("title"))
+
+    async def _crawl_chat_list(
+        self,
+        max_rows: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+        first_page: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        unread_chats: List[Dict[str, Any]] = []
-        async with self.client._page_lock:
-            await self.close()  # Ensure no chat is currently open
+        Crawl the virtualized chat list in viewport-sized pages.
 
-            def log(msg: str) -> None:
-                """Log debug messages if debug mode is enabled."""
-                if debug:
-                    print(msg)
+        Rows are deduplicated by ``(group, title)``. The sidebar is ordered by
+        recency, so the crawl stops as soon as a page contains only read rows
+        whose last activity and preview are unchanged since the previous
+        crawl: nothing below them can be newer. Unread rows that an earlier
+        crawl found below that point are carried forward (appended), so they
+        are not lost. The first crawl covers the whole list (up to the
+        limits); ``last_crawl_complete`` is False when a limit cut it short.
+        The list is scrolled back to the top afterwards.
+
+        Args:
+            max_rows: Maximum number of distinct rows to collect
+            max_seconds: Maximum time to spend crawling
+            first_page: Rows already extracted at the current scroll position
 
-            async def _wait_for_grid() -> None:
-                """Wait for the chat grid to be present and hydrated."""
+        Returns:
+            List of raw row dictionaries, in sidebar order
+        """
+        max_rows = self.crawl_max_rows if max_rows is None else max_rows
+        max_seconds = self.crawl_max_seconds if max_seconds is None else max_seconds
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + max_seconds
+
+        collected: Dict[tuple, Dict[str, Any]] = {}
+        scroller = None
+        scrolled = False
+        page_unchanged = False
+        complete = True
+        try:
+            rows = first_page
+            while True:
+                if rows is None:
+                    rows = await self._extract_chat_rows()
+                page_unchanged = True
+                for row in rows:
+                    key = self._row_key(row)
+                    if key in collected:
+                        continue
+                    collected[key] = row
+                    previous = self._sweep_snapshot.get(key)
+                    current = (row.get("last_activity"), row.get("preview"))
+                    if self._row_is_unread(row) or previous != current:
+                        page_unchanged = False
+
+                if page_unchanged:
+                    break
+                if len(collected) >= max_rows or loop.time() >= deadline:
+                    complete = False
+                    break
+
+                if scroller is None:
+                    scroller = await self._get_chat_list_scroller()
+                    if not scroller:
+                        break
+                if not await scroller.evaluate(CHAT_LIST_PAGE_DOWN_JS):
+                    break
+                scrolled = True
+                rows = None
+        finally:
+            if scroller is not None:
                 try:
-                    await self._page.locator(loc.CHAT_LIST_GRID).wait_for(timeout=15000)
+                    if scrolled:
+                        await scroller.evaluate("(el) => { el.scrollTop = 0; }")
+                    await scroller.dispose()
                 except Exception:
-                    await self._page.wait_for_timeout(1000)
-
-            async def _get_scroller_handle():
-                """
-                Get the ElementHandle of the actual scrolling container.
-
-                Returns:
-                    ElementHandle for the virtualizable scrolling container
-                """
-                grid = self._page.locator(loc.CHAT_LIST_GRID)
-                grid_h = await grid.element_handle()
-
-                if not grid_h:
-                    return await self._page.locator("#pane-side").element_handle()
-
-                return await grid_h.evaluate_handle(
-                    """(el) => {
-                        let cur = el;
-                        while (cur && cur !== document.body) {
-                            const s = getComputedStyle(cur);
-                            if ((s.overflowY === 'auto' || s.overflowY === 'scroll') &&
-                                cur.clientHeight < cur.scrollHeight) return cur;
-                            cur = cur.parentElement;
-                        }
-                        return document.querySelector('#pane-side');
-                    }"""
-                )
+                    pass
+
+        for key, row in collected.items():
+            self._sweep_snapshot[key] = (row.get("last_activity"), row.get("preview"))
+        rows = list(collected.values())[:max_rows]
+        if page_unchanged:
+            # Nothing below the stop point changed: its unread rows still are
+            rows += [row for key, row in self._unread_rows.items() if key not in collected]
+        self._unread_rows = {self._row_key(row): row for row in rows if self._row_is_unread(row)}
+        self.last_crawl_complete = complete
+        return rows
+
+    @staticmethod
+    def _row_to_chat(row: Dict[str, Any], result_type: str = "CHATS") -> Optional[Dict[str, Any]]:
+        """
+        Convert a raw row from ``_extract_chat_rows`` into a chat dictionary.
 
-            async def _is_row_unread(row_loc) -> bool:
-                """
-                Determine if a chat row represents an unread conversation.
+        Args:
+            row: Raw row dictionary
+            result_type: Type of result (default: "CHATS")
 
-                Uses multiple detection strategies:
-                1. aria-label with 'unread' or 'mensaje(s) no leído'
-                2. Explicit unread badge
-                3. Bold font weight on title (>= 600)
+        Returns:
+            Chat dictionary, or None for unparseable/transient rows
+        """
+        if not row or row.get("layout") not in (2, 3):
+            return None
 
-                Args:
-                    row_loc: Locator for the chat row
+        info_text = row.get("preview") or ""
+        # Skip invalid states
+        if any(x in info_text for x in ["loading", "status-", "typing"]):
+            return None
 
-                Returns:
-                    True if the chat is unread, False otherwise
-                """
-                try:
-                    # Strategy 1: Check aria-label for unread indicators
-                    has_aria = await row_loc.locator("[aria-label]").evaluate_all(
-                        "(els, rx) => els.some(el => (el.getAttribute('aria-label')||'').match(new RegExp(rx,'i')))",
-                        UNREAD_ARIA_PATTERN,
-                    )
-                    if has_aria:
-                        return True
-
-                    # Strategy 2: Check for explicit unread badge
-                    try:
-                        if await row_loc.locator(f"xpath={loc.UNREAD_BADGE}").count() > 0:
-                            return True
-                    except Exception:
-                        pass
-
-                    # Strategy 3: Check for bold font weight on title
-                    title = row_loc.locator(f"xpath={loc.SPAN_TITLE}")
-                    if await title.count() == 0:
-                        return False
-
-                    is_bold = await title.evaluate(
-                        """(el) => {
-                            const w = getComputedStyle(el).fontWeight;
-                            const n = parseInt(w, 10);
-                            return isNaN(n) ? /bold/i.test(w) : n >= 600;
-                        }"""
-                    )
-                    # Strategy 4: Check for inline "X mensaje(s) no leido(s)" text in title
-                    try:
-                        if await row_loc.locator(f"xpath={loc.UNREAD_BADGE_TEXT}").count() > 0:
-                            return True
-                    except Exception:
-                        pass
-
-                    return bool(is_bold)
+        return {
+            "type": result_type,
+            "group": row.get("group") if row["layout"] == 3 else None,
+            "name": row.get("title") or "",
+            "last_activity": row.get("last_activity") or "",
+            "last_message": info_text,
+            "last_message_type": "audio" if row.get("mic") else "text",
+            "unread_count": row.get("unread_count") or "0",
+        }
+
+    @staticmethod
+    def _row_is_unread(row: Dict[str, Any]) -> bool:
+        """
+        Decide whether a raw row is unread from its in-page heuristics.
 
-                except Exception:
-                    return False
+        Args:
+            row: Raw row dictionary from ``_extract_chat_rows``
 
-            async def _parse_row(row_loc):
-                """
-                Parse a chat row into structured data.
+        Returns:
+            True if any unread heuristic matched
+        """
+        return bool(
+            row.get("has_unread_aria")
+            or row.get("has_unread_badge")
+            or row.get("has_unread_text")
+            or row.get("is_bold")
+        )
+
+    def _record_coverage(self, rows: List[Dict[str, Any]], complete: bool) -> None:
+        """
+        Remember which chats a sweep covered, for ``last_sweep_covered``.
 
-                Args:
-                    row_loc: Locator for the chat row
+        Args:
+            rows: Every raw row the sweep saw, read or unread
+            complete: True if the sweep reached the end of the list
+        """
+        if complete:
+            self.last_sweep_covered = None
+            return
+        chats = (self._row_to_chat(row) for row in rows)
+        self.last_sweep_covered = {chat_key(chat) for chat in chats if chat}
+
+    async def _unread_rows_by_filter(self, full_crawl: bool, log) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read unread rows through WhatsApp's built-in "Unread" filter tab.
 
-                Returns:
-                    Dictionary with chat information or None if parsing fails
-                """
-                handle = await row_loc.element_handle()
-                if not handle:
-                    return None
-                return await self._parse_search_result(handle, "CHATS")
+        Switches the sidebar to the Unread filter, reads only those rows and
+        restores the previously active filter, so the rest of the client
+        (row opens, the chat index) keeps seeing the full list and chats
+        opened since the last sweep leave the Unread list.
+
+        Args:
+            full_crawl: If True, page through the filtered list
+            log: Debug logger
+
+        Returns:
+            Raw unread rows, or None if the Unread filter is not available
+        """
+        previous = await self.wa_elements.get_active_chat_filter()
+        if previous is None:
+            log("DEBUG: Chat filter tabs not found")
+            return None
+
+        if previous != "unread" and not await self.wa_elements.click_chat_filter("unread"):
+            log("DEBUG: Could not switch to 'Unread' filter")
+            return None
+
+        try:
+            rows = await self._extract_chat_rows()
+            if full_crawl and rows:
+                rows = await self._crawl_chat_list(first_page=rows)
+            self._record_coverage(rows, not rows or (full_crawl and self.last_crawl_complete))
+            log(f"DEBUG: Rows in 'Unread' filter: {len(rows)}")
+            return rows
+        finally:
+            if previous != "unread" and not await self.wa_elements.click_chat_filter(previous):
+                log(f"DEBUG: Could not restore '{previous}' filter")
+
+    async def _unread_rows_by_scan(self, full_crawl: bool, log) -> List[Dict[str, Any]]:
+        """
+        Find unread rows by running the unread heuristics over the chat list.
+
+        Args:
+            full_crawl: If True, page through the virtualized list
+            log: Debug logger
+
+        Returns:
+            Raw rows flagged as unread by any heuristic
+        """
+        try:
+            await self._page.locator(loc.CHAT_LIST_GRID).wait_for(timeout=15000)
+        except Exception:
+            await self._page.wait_for_timeout(1000)
 
+        rows = await self._extract_chat_rows()
+        log(f"DEBUG: Initially visible rows: {len(rows)}")
+
+        if len(rows) <= MIN_VISIBLE_CHATS_THRESHOLD:
             try:
-                # Step 0: Wait for UI to be ready
-                await _wait_for_grid()
+                await self._page.locator(loc.ALL_CHATS_BUTTON).click()
+                log("DEBUG: Few chats visible, clicking 'All' button")
+                log("DEBUG: Taking screenshot of low chat count state")
+                await self._page.screenshot(path="pocos_chats_visibles.png")
+                rows = await self._extract_chat_rows()
+            except Exception:
+                log("DEBUG: Could not switch to 'All' chats")
+
+        if full_crawl:
+            rows = await self._crawl_chat_list(first_page=rows)
+            log(f"DEBUG: Rows after crawl: {len(rows)}")
+        self._record_coverage(rows, full_crawl and self.last_crawl_complete)
+
+        return [row for row in rows if self._row_is_unread(row)]
+
+    @timed("check_unread_chats")
+    async def _check_unread_chats(
+        self,
+        debug: bool = True,
+        full_crawl: bool = True,
+        strategy: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Detect all unread chats in the sidebar.
 
-                # Step 1: Debug initial state
-                try:
-                    total_rows_now = await self._page.locator(f"xpath={loc.CHAT_LIST_ROWS}").count()
-                    log(f"DEBUG: Initially visible rows: {total_rows_now}")
+        With the ``"filter"`` strategy the sidebar is switched to WhatsApp's
+        "Unread" filter tab, so only unread chats are read, and the previous
+        filter is restored afterwards. With ``"scan"`` (also the fallback
+        when the tab is missing) every row is checked with multiple
+        heuristics including aria-labels, badges, and font weight detection.
+        Rows are extracted in a single in-page evaluation per page of the
+        list.
 
-                    if total_rows_now <= MIN_VISIBLE_CHATS_THRESHOLD:
-                        await self._page.locator(loc.ALL_CHATS_BUTTON).click()
-                        log("DEBUG: Few chats visible, clicking 'All' button")
-                        log("DEBUG: Taking screenshot of low chat count state")
-                        await self._page.screenshot(path="pocos_chats_visibles.png")
+        Args:
+            debug: If True, logs debug information at DEBUG level
+            full_crawl: If True, scroll through the virtualized list (see
+                ``_crawl_chat_list``); otherwise only inspect rendered rows
+            strategy: "filter" or "scan" (default: ``self.unread_strategy``)
 
-                except Exception:
-                    log("DEBUG: Could not count initial rows")
-
-                # Step 2: Get correct scroller for virtualized list
-                scroller_h = await _get_scroller_handle()
-
-                # Step 3: Sweep visible rows
-                async def sweep(tag: str) -> None:
-                    """
-                    Scan visible chat rows for unread messages.
-
-                    Args:
-                        tag: Label for this sweep operation (for debugging)
-                    """
-                    nonlocal unread_chats
-                    rows = self._page.locator(f"xpath={loc.CHAT_LIST_ROWS}")
-                    count = await rows.count()
-                    log(f"DEBUG: {tag}: Currently visible rows: {count}")
-
-                    for i in range(count):
-                        row = rows.nth(i)
-                        try:
-                            if await _is_row_unread(row):
-                                chat = await _parse_row(row)
-                                if chat:
-                                    unread_chats.append(chat)
-                                    log(f"✓ Unread ({tag}): {chat.get('name', 'No name')}")
-                        except Exception as e:
-                            log(f"DEBUG: Error evaluating row {i} ({tag}): {e}")
-
-                # Step 4: Initial sweep
-                await sweep("initial")
-
-                # Step 5: Deduplication
-                def _get_chat_key(ch: Dict[str, Any]) -> tuple:
-                    """Generate a unique key for a chat to enable deduplication."""
-                    return ch.get("id") or (
-                        ch.get("name"),
-                        ch.get("last_message"),
-                        ch.get("last_activity"),
-                    )
-
-                seen = set()
-                dedup = []
-                for ch in unread_chats:
-                    k = _get_chat_key(ch)
-                    if k in seen:
-                        continue
-                    seen.add(k)
-                    dedup.append(ch)
-                unread_chats = dedup
+        Returns:
+            List of dictionaries containing unread chat information
 
-            except Exception as e:
-                await self.client.emit("on_warning", f"Error detecting unread chats: {e}")
-                log(f"DEBUG: General error: {e}")
+        Note:
+            The scan strategy uses multiple detection strategies:
+            1. aria-label matching for 'unread' or 'mensaje(s) no leído'
+            2. Explicit unread badge detection
+            3. Bold font weight detection on chat titles
+            4. Inline "X unread message(s)" text in the title cell
+        """
+        strategy = strategy or self.unread_strategy
+        try:
+            async with self.client.scheduler.slot(
+                PRIORITY_SWEEP, "unread_sweep", deadline=self.sweep_deadline
+            ):
+                return await self._sweep_unread_chats(debug, full_crawl, strategy)
+        except asyncio.TimeoutError:
+            # The page stayed busy; report a failed sweep instead of "no chats"
+            self.last_sweep_ok = False
+            return []
+
+    async def _sweep_unread_chats(
+        self, debug: bool, full_crawl: bool, strategy: str
+    ) -> List[Dict[str, Any]]:
+        """Body of ``_check_unread_chats``, run while holding the page."""
+        unread_chats: List[Dict[str, Any]] = []
+        # Ensure no chat is currently open, unless it is being watched or
+        # paged through by iter_messages
+        watcher = getattr(self.client, "chat_watcher", None)
+        if not (watcher and watcher.chat):
+            lingering = await self.current_chat_title()
+            if lingering and not any(self._same_chat(lingering, c) for c in self._pinned_chats):
+                await self._flush_lingering_chat(lingering)
+                await self.close(force=True)
+
+        def log(msg: str) -> None:
+            """Log debug messages if debug mode is enabled."""
+            if debug:
+                logger.debug(msg)
+
+        self.last_sweep_ok = False
+        try:
+            rows = None
+            if strategy == "filter":
+                rows = await self._unread_rows_by_filter(full_crawl, log)
+            if rows is None:
+                rows = await self._unread_rows_by_scan(full_crawl, log)
+
+            # Keep parseable rows, deduplicated
+            seen = set()
+            for row in rows:
+                chat = self._row_to_chat(row)
+                if not chat:
+                    continue
+                key = (chat["group"], chat["name"], chat["last_message"], chat["last_activity"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                unread_chats.append(chat)
+                log(f"✓ Unread: {chat.get('name', 'No name')}")
+            self.last_sweep_ok = True
 
-        # Step 6: Final summary
+        except Exception as e:
+            await self.client.emit("on_warning", f"Error detecting unread chats: {e}")
+            log(f"DEBUG: General error: {e}")
+
+        self.chat_index.save()
+
+        # Final summary
         log("\nDEBUG: ===== SUMMARY =====")
         log(f"Total unread chats found: {len(unread_chats)}")
         for i, chat in enumerate(unread_chats, 1):
@@ -270,111 +640,76 @@ class ChatManager:
 
         return unread_chats
 
-    async def _parse_search_result(self, element, result_type: str = "CHATS") -> Optional[Dict[str, Any]]:
+    async def _flush_lingering_chat(self, title: str) -> None:
         """
-        Parse a search result element into structured data.
-
-        Args:
-            element: ElementHandle of the search result row
-            result_type: Type of result (default: "CHATS")
+        Hand the new messages of a chat left open to the message pipeline.
 
-        Returns:
-            Dictionary containing parsed chat information or None if parsing fails
+        A chat left open after an operation reads its incoming messages, so
+        they would never show up as unread. Only chats the pipeline already
+        tracks (with a pipeline watermark) are collected.
 
-        Note:
-            Handles two main layouts:
-            - 3 components: Group chats (group name, title, last message)
-            - 2 components: Direct chats (title, last message)
+        Args:
+            title: Title of the open chat
         """
+        pipeline = getattr(self.client, "message_pipeline", None)
+        if not pipeline or not pipeline.enabled or title not in pipeline.watermarks:
+            return
         try:
-            components = await element.query_selector_all(
-                "xpath=.//div[@role='gridcell' and @aria-colindex='2']/parent::div/div"
+            pipeline.offer(
+                await self.collect_messages(incremental=True, chat=title, watermarks=pipeline.watermarks)
             )
-            count = len(components)
-
-            # Extract unread count
-            unread_el = await element.query_selector(f"xpath={loc.SEARCH_ITEM_UNREAD_MESSAGES}")
-            unread_count = await unread_el.inner_text() if unread_el else "0"
-
-            # Check for audio message
-            mic_span = await components[1].query_selector('xpath=.//span[@data-icon="mic"]')
-
-            if count == 3:
-                # Group chat layout
-                span_title_0 = await components[0].query_selector(f"xpath={loc.SPAN_TITLE}")
-                group_title = await span_title_0.get_attribute("title") if span_title_0 else ""
-
-                datetime_children = await components[0].query_selector_all("xpath=./*")
-                datetime_text = await datetime_children[1].text_content() if len(datetime_children) > 1 else ""
-
-                span_title_1 = await components[1].query_selector(f"xpath={loc.SPAN_TITLE}")
-                title = await span_title_1.get_attribute("title") if span_title_1 else ""
-
-                info_text = (await components[2].text_content()) or ""
-                info_text = info_text.replace("\n", "")
-
-                # Skip invalid states
-                if any(x in info_text for x in ["loading", "status-", "typing"]):
-                    return None
-
-                return {
-                    "type": result_type,
-                    "group": group_title,
-                    "name": title,
-                    "last_activity": datetime_text,
-                    "last_message": info_text,
-                    "last_message_type": "audio" if mic_span else "text",
-                    "unread_count": unread_count,
-                    "element": element,
-                }
-
-            elif count == 2:
-                # Direct chat layout
-                span_title_0 = await components[0].query_selector(f"xpath={loc.SPAN_TITLE}")
-                title = await span_title_0.get_attribute("title") if span_title_0 else ""
-
-                datetime_children = await components[0].query_selector_all("xpath=./*")
-                datetime_text = await datetime_children[1].text_content() if len(datetime_children) > 1 else ""
-
-                info_children = await components[1].query_selector_all("xpath=./*")
-                info_text = (await info_children[0].text_content() if len(info_children) > 0 else "") or ""
-                info_text = info_text.replace("\n", "")
-
-                # Skip invalid states
-                if any(x in info_text for x in ["loading", "status-", "typing"]):
-                    return None
-
-                return {
-                    "type": result_type,
-                    "name": title,
-                    "last_activity": datetime_text,
-                    "last_message": info_text,
-                    "last_message_type": "audio" if mic_span else "text",
-                    "unread_count": unread_count,
-                    "element": element,
-                    "group": None,
-                }
+        except Exception as e:
+            logger.debug("Could not collect lingering chat %s: %s", title, e)
 
-            return None
+    async def current_chat_title(self) -> Optional[str]:
+        """
+        Read the title of the open conversation from its header.
+
+        Also refreshes ``self.current_chat``.
 
+        Returns:
+            The open chat's title, or None if no chat is open
+        """
+        try:
+            title = await self._page.evaluate(CURRENT_CHAT_JS)
         except Exception as e:
-            print(f"Error parsing result: {e}")
-            return None
+            logger.debug("current_chat_title: %s", e)
+            title = None
+        self.current_chat = title if isinstance(title, str) and title else None
+        return self.current_chat
+
+    @staticmethod
+    def _same_chat(title: Optional[str], chat_name: str) -> bool:
+        """True if a header title refers to ``chat_name``."""
+        if not title or not chat_name:
+            return False
+        return title.strip().casefold() == chat_name.strip().casefold()
 
-    async def close(self) -> None:
+    async def close(self, force: bool = False) -> None:
         """
         Close the current chat or view by pressing Escape.
 
-        This method safely closes any open chat window by simulating
-        the Escape key press.
+        Nothing is pressed when the header shows that no chat is open,
+        unless ``force`` is set.
+
+        Args:
+            force: Press Escape even if no chat is open
         """
         if self._page:
+            if not force and await self.current_chat_title() is None:
+                return
             try:
                 await self._page.keyboard.press("Escape")
-                await asyncio.sleep(0.5)  # Allow UI to react
+                # Allow UI to react: wait for the conversation header to go away
+                await wait_for_condition(
+                    self._page, CHAT_CLOSED_JS, timeout=CHAT_CLOSE_TIMEOUT,
+                    name="close.header_gone", replaces=0.5,
+                )
+                self.current_chat = None
             except Exception as e:
                 await self.client.emit("on_warning", f"Error trying to close chat with Escape: {e}")
 
+    @timed("open")
     async def open(
         self,
         chat_name: str,
@@ -384,6 +719,14 @@ class ChatManager:
         """
         Open a chat by name.
 
+        If the header shows that the chat is already open it is reused, with
+        no search, click or wait. Otherwise the route recorded in the chat
+        index (sidebar row, search or URL) is tried first.
+
+        Targets that recently failed with no search results or an invalid
+        number (``negative_cache``), or that keep failing (``breaker``),
+        return False without touching the page.
+
         Args:
             chat_name: Name of the chat to open
             timeout: Maximum time to wait in milliseconds
@@ -392,7 +735,52 @@ class ChatManager:
         Returns:
             True if chat was opened successfully, False otherwise
         """
-        return await self.wa_elements.open(chat_name, timeout, open_via_url=open_via_url)
+        if not open_via_url and self._same_chat(await self.current_chat_title(), chat_name):
+            self._mark_read(chat_name)
+            return True
+
+        target = normalize_chat_key(chat_name)
+        reason = self.negative_cache.get(target)
+        if reason is not None:
+            logger.debug("open: %s skipped (%s)", chat_name, reason)
+            return False
+        if not self.breaker.allow(target):
+            logger.debug("open: %s skipped (circuit open)", chat_name)
+            return False
+
+        try:
+            entry = self.chat_index.get(chat_name)
+            opened = await self.wa_elements.open(
+                chat_name,
+                timeout,
+                open_via_url=open_via_url,
+                route=entry["route"] if entry else None,
+                title=entry["title"] if entry else None,
+            )
+            if opened:
+                title = await self.current_chat_title()
+                self.chat_index.record(chat_name, self.wa_elements.last_open_route, title)
+                self.breaker.record_success(target)
+                self._mark_read(chat_name, title)
+            else:
+                self.current_chat = None
+                # The known route no longer works: rediscover it next time
+                self.chat_index.forget(chat_name)
+                self.breaker.record_failure(target)
+                error = getattr(self.wa_elements, "last_open_error", None)
+                if error in DEFINITE_OPEN_ERRORS:
+                    self.negative_cache.add(target, error)
+        finally:
+            # A half-open trial that raised or was cancelled must not stay in flight
+            self.breaker.release(target)
+        self.chat_index.save()
+        return opened
+
+    def _mark_read(self, *names: Optional[str]) -> None:
+        """Stop carrying forward the unread row of a chat that was just opened."""
+        for key in list(self._unread_rows):
+            if any(self._same_chat(part, name) for part in key if part for name in names if name):
+                del self._unread_rows[key]
 
     async def search_conversations(self, query: str, close: bool = True) -> List[Dict[str, Any]]:
         """
@@ -413,77 +801,235 @@ class ChatManager:
             await self.client.emit("on_error", f"Search error: {e}")
             return []
 
-    async def collect_messages(self) -> List[Union[Message, FileMessage, VoiceMessage]]:
+    @timed("collect_messages")
+    async def collect_messages(
+        self,
+        incremental: bool = False,
+        chat: Optional[str] = None,
+        watermarks: Optional[Dict[str, str]] = None,
+    ) -> List[Union[Message, FileMessage, VoiceMessage]]:
         """
         Collect all currently visible messages in the active chat.
 
         Scans all visible message containers and returns a list of Message,
         FileMessage, or VoiceMessage instances.
 
+        In incremental mode the last returned ``msg_id`` is remembered per
+        chat and only newer messages are returned; full collects do not
+        move it. The scroll to the top of the history is skipped. If the
+        watermark is no longer rendered, every rendered message is returned.
+
+        Args:
+            incremental: If True, return only messages after the watermark
+            chat: Key for the watermark (defaults to the open chat's title)
+            watermarks: Watermarks to read and advance (default: the ones
+                shared by user calls; the message pipeline keeps its own)
+
         Returns:
             List of Message, FileMessage, or VoiceMessage instances
         """
-        results: List[Union[Message, FileMessage, VoiceMessage]] = []
+        # Wait for message containers to appear in the DOM
+        if not await wait_for_condition(
+            self._page,
+            MESSAGES_RENDERED_JS,
+            loc.MESSAGE_CONTAINER,
+            timeout=MESSAGES_RENDERED_TIMEOUT,
+            name="collect_messages.rendered",
+        ):
+            logger.warning("collect_messages: no message containers found after 5s")
 
         # ── Scroll up to trigger WhatsApp's virtual list to load older messages ──
-        try:
-            await self._page.evaluate("""
-                () => {
-                    const scroller = document.querySelector('div[role="application"]')?.parentElement
-                        || document.querySelector('[data-virtualized="false"]')?.closest('[style*="overflow"]')
-                        || document.querySelector('div[tabindex="-1"]');
-                    if (scroller && scroller.scrollTop !== undefined) {
-                        scroller.scrollTop = 0;
-                    }
-                }
-            """)
-            await asyncio.sleep(1.5)
-        except Exception:
-            pass
+        if not incremental:
+            try:
+                await timed_wait(
+                    self._page.evaluate(
+                        MESSAGE_PANE_LOAD_OLDER_JS,
+                        {"sel": loc.MESSAGE_CONTAINER, "timeoutMs": COLLECT_LOAD_OLDER_TIMEOUT},
+                    ),
+                    "collect_messages.load_older",
+                    replaces=1.5,
+                )
+            except Exception:
+                pass
+
+        # Extract every container in a single round trip, without handles
+        pane = await self._page.evaluate(COLLECT_MESSAGES_JS, loc.MESSAGE_CONTAINER)
+        rows = (pane or {}).get("messages") or []
+        logger.debug("collect_messages: %d containers found", len(rows))
+
+        results = self._messages_from_rows(rows)
+
+        key = chat or (pane or {}).get("chat") or ""
+        for msg in results:
+            msg.chat = key
+        if not incremental:
+            # A full collect leaves the watermark alone: the next incremental
+            # call still returns what no incremental call returned yet
+            return results
+
+        if watermarks is None:
+            watermarks = self._watermarks
+        ids = [m.msg_id for m in results]
+        last_id = next((i for i in reversed(ids) if i), None)
+        watermark = watermarks.get(key)
+        if last_id:
+            watermarks[key] = last_id
+
+        if watermark in ids:
+            results = results[ids.index(watermark) + 1 :]
 
-        # Wait for message containers to appear in the DOM
-        for _ in range(10):
-            count = await self._page.evaluate(
-                """() => document.querySelectorAll('div[data-testid^="conv-msg-"]').length"""
-            )
-            if count > 0:
-                break
-            await asyncio.sleep(0.5)
-        else:
-            logger.warning("collect_messages: no message containers found after 5s")
+        return results
+
+    def _messages_from_rows(
+        self, rows: List[Dict[str, Any]]
+    ) -> List[Union[Message, FileMessage, VoiceMessage]]:
+        """
+        Build message objects from extracted rows, carrying the sender over
+        to consecutive messages without a sender header.
 
-        msg_elements = await self._page.query_selector_all('div[data-testid^="conv-msg-"]')
-        logger.debug("collect_messages: %d containers found", len(msg_elements))
+        Args:
+            rows: Data returned by ``MESSAGE_NODE_JS`` for each container
 
+        Returns:
+            List of Message, FileMessage, or VoiceMessage instances
+        """
+        results: List[Union[Message, FileMessage, VoiceMessage]] = []
         last_sender = ""
-        for i, elem in enumerate(msg_elements):
-            voice_msg = await VoiceMessage.from_element(elem, self._page)
-            if voice_msg:
-                if not voice_msg.sender:
-                    voice_msg.sender = last_sender
-                if voice_msg.sender:
-                    last_sender = voice_msg.sender
-                results.append(voice_msg)
+        for data in rows:
+            msg = message_from_data(data, self._page)
+            if not msg:
                 continue
+            if not msg.sender:
+                msg.sender = last_sender
+            if msg.sender:
+                last_sender = msg.sender
+            results.append(msg)
+        return results
 
-            file_msg = await FileMessage.from_element(elem, self._page)
-            if file_msg:
-                if not file_msg.sender:
-                    file_msg.sender = last_sender
-                if file_msg.sender:
-                    last_sender = file_msg.sender
-                results.append(file_msg)
-                continue
+    async def iter_messages(
+        self,
+        chat: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        batch_size: int = DEFAULT_HISTORY_BATCH_SIZE,
+        page_timeout: float = DEFAULT_HISTORY_PAGE_TIMEOUT,
+    ) -> AsyncIterator[Union[Message, FileMessage, VoiceMessage]]:
+        """
+        Page backwards through a chat's history, newest message first.
 
-            simple_msg = await Message.from_element(elem, self._page)
-            if simple_msg:
-                if not simple_msg.sender:
-                    simple_msg.sender = last_sender
-                if simple_msg.sender:
-                    last_sender = simple_msg.sender
-                results.append(simple_msg)
+        Messages are extracted ``batch_size`` at a time, anchored on the
+        oldest message already yielded. When no older message is rendered,
+        the message pane is scrolled up and the iterator waits for WhatsApp
+        to load the previous page.
 
-        return results
+        The page is only held while a batch is extracted. Between batches the
+        chat stays pinned, so the unread sweep does not close it; if another
+        operation switched chats anyway, it is reopened and scrolled up until
+        the anchor is rendered again.
+
+        Args:
+            chat: Chat to open first (uses the open chat if None)
+            since: Stop at the first message older than this time
+            limit: Maximum number of messages to yield
+            batch_size: Maximum messages extracted per round trip
+            page_timeout: Seconds to wait for an older page to load
+
+        Yields:
+            Message, FileMessage, or VoiceMessage instances, newest first
+        """
+        if limit is not None and limit <= 0:
+            return
+        if chat is None:
+            chat = await self.current_chat_title()
+
+        yielded = 0
+        oldest_id: Optional[str] = None
+        if chat:
+            self._pinned_chats.append(chat)
+        try:
+            while True:
+                async with self.client.scheduler.slot(PRIORITY_SCRAPE, "iter_messages"):
+                    batch = await self._history_batch(chat, oldest_id, batch_size, page_timeout)
+                if not batch:
+                    return
+
+                oldest_id = batch[0].msg_id
+                for msg in reversed(batch):
+                    msg.chat = chat or ""
+                    if since is not None and msg.timestamp and msg.timestamp < since:
+                        return
+                    yield msg
+                    yielded += 1
+                    if limit is not None and yielded >= limit:
+                        return
+        finally:
+            if chat:
+                self._pinned_chats.remove(chat)
+
+    async def _history_batch(
+        self, chat: Optional[str], before: Optional[str], size: int, page_timeout: float
+    ) -> List[Union[Message, FileMessage, VoiceMessage]]:
+        """
+        Extract the messages just older than an anchor, holding the page.
+
+        Args:
+            chat: Chat being iterated (reopened if it is no longer open)
+            before: ``data-id`` of the oldest message yielded so far
+            size: Maximum messages to extract
+            page_timeout: Seconds to wait for an older page to load
+
+        Returns:
+            Up to ``size`` messages, oldest first; empty at the start of the
+            history or if the chat could not be reopened
+        """
+        if chat and not await self.open(chat):
+            logger.warning("iter_messages: could not reopen %s", chat)
+            return []
+
+        while True:
+            rows = await self._page.evaluate(
+                MESSAGES_BEFORE_JS,
+                {"sel": loc.MESSAGE_CONTAINER, "before": before, "size": size},
+            )
+            batch = [m for m in self._messages_from_rows(rows or []) if m.msg_id]
+            if batch:
+                return batch
+            # Nothing older is rendered, or the anchor is not rendered
+            # anymore (the chat was reopened): load the previous page
+            loaded = await self._page.evaluate(
+                MESSAGE_PANE_LOAD_OLDER_JS,
+                {"sel": loc.MESSAGE_CONTAINER, "timeoutMs": int(page_timeout * 1000)},
+            )
+            if not loaded:
+                if rows is None:
+                    logger.warning("iter_messages: anchor %s is no longer rendered", before)
+                return []
+
+    def reset_open_failures(self, chat: Optional[str] = None) -> None:
+        """
+        Let failed chats be opened again right away.
+
+        Args:
+            chat: Chat whose failures to forget (default: all chats)
+        """
+        if chat is None:
+            self.negative_cache.clear()
+            self.breaker.reset()
+        else:
+            self.negative_cache.discard(normalize_chat_key(chat))
+            self.breaker.reset(normalize_chat_key(chat))
+
+    def reset_watermark(self, chat: Optional[str] = None) -> None:
+        """
+        Forget the incremental collect watermark.
+
+        Args:
+            chat: Chat whose watermark is dropped (all chats if None)
+        """
+        if chat is None:
+            self._watermarks.clear()
+        else:
+            self._watermarks.pop(chat, None)
 
     async def react_to_last_message(self, emoji: str) -> bool:
         """
@@ -508,6 +1054,7 @@ class ChatManager:
             await self.client.emit("on_error", f"Error reacting to last message: {e}")
             return False
 
+    @timed("download_all_files")
     async def download_all_files(
         self, carpeta: Optional[str] = None, detect_codecs: bool = True
     ) -> List[Dict[str, Any]]:
@@ -544,6 +1091,7 @@ class ChatManager:
 
         return saved_files
 
+    @timed("download_file_by_index")
     async def download_file_by_index(
         self, index: int, carpeta: Optional[str] = None, detect_codecs: bool = True
     ) -> Optional[Dict[str, Any]]:
@@ -581,62 +1129,251 @@ class ChatManager:
 
         return result
 
-    async def send_message(self, chat_query: str, message: str, open_via_url: bool = False) -> bool:
+    @timed("send_message")
+    async def send_message(
+        self,
+        chat_query: str,
+        message: str,
+        open_via_url: bool = False,
+        wait_for: Optional[str] = RECEIPT_SENT,
+        timeout: float = DEFAULT_RECEIPT_TIMEOUT,
+    ) -> bool:
         """
         Send a text message to a chat.
 
+        The message goes through the outbox, so concurrent sends to the same
+        chat share a single open of that chat. The chat stays open until the
+        message shows the server tick (at most ``SENT_TICK_TIMEOUT``); later
+        statuses are awaited without holding the page.
+
         Args:
             chat_query: Name or identifier of the chat
             message: Text message to send
             open_via_url: If True, opens the chat via URL before sending
+            wait_for: Receipt status to wait for ("sent", "delivered",
+                "read"), or None to return once the message is rendered
+            timeout: Maximum time to wait for the receipt in seconds
 
         Returns:
             True if message was sent successfully, False otherwise
         """
-        async with self.client._page_lock:
-            print("Sending message...")
-            if not await self.client.wait_until_logged_in():
-                return False
+        receipt = await self.send_message_tracked(chat_query, message, open_via_url)
+        return await self._await_receipt(receipt, wait_for, timeout)
+
+    async def send_message_tracked(
+        self, chat_query: str, message: str, open_via_url: bool = False
+    ) -> Optional[DeliveryReceipt]:
+        """
+        Send a text message and return its delivery receipt.
+
+        Args:
+            chat_query: Name or identifier of the chat
+            message: Text message to send
+            open_via_url: If True, opens the chat via URL before sending
+
+        Returns:
+            Receipt bound to the sent message, or None if it was not sent
+        """
+        return await self.outbox.send(chat_query, message, open_via_url)
+
+    async def send_messages(
+        self,
+        chat_query: str,
+        messages: List[str],
+        open_via_url: bool = False,
+        wait_for: Optional[str] = RECEIPT_SENT,
+        timeout: float = DEFAULT_RECEIPT_TIMEOUT,
+    ) -> List[bool]:
+        """
+        Send several text messages to a chat, opening it once.
+
+        Args:
+            chat_query: Name or identifier of the chat
+            messages: Text messages to send, in order
+            open_via_url: If True, opens the chat via URL before sending
+            wait_for: Receipt status to wait for, or None
+            timeout: Maximum time to wait for each receipt in seconds
+
+        Returns:
+            One result per message (True if sent successfully)
+        """
+        futures = [self.outbox.submit(chat_query, m, open_via_url) for m in messages]
+        receipts = await asyncio.gather(*futures)
+        return list(
+            await asyncio.gather(*(self._await_receipt(r, wait_for, timeout) for r in receipts))
+        )
+
+    @staticmethod
+    async def _await_receipt(
+        receipt: Optional[DeliveryReceipt], wait_for: Optional[str], timeout: float
+    ) -> bool:
+        """
+        Wait for a receipt status outside the page lock.
+
+        "delivered" and "read" are only seen while the chat is on screen (or
+        once it is opened again).
+        """
+        if receipt is None:
+            return False
+        if not wait_for:
+            return True
+        if not receipt.msg_id:
+            logger.warning("Message sent but its bubble was not found; it cannot be confirmed")
+            return True
+        if await receipt.wait(wait_for, timeout):
+            return True
+        logger.warning("Message sent but not %s within %ss", wait_for, timeout)
+        return False
+
+    async def _leave_chat(self) -> List[Message]:
+        """
+        Leave the chat opened by a page operation.
+
+        Goes back to the watched chat if there is one. Otherwise the chat is
+        left open, so a follow-up operation on it (e.g. a reply) can reuse
+        it; the next unread sweep closes it. Must be called with the page
+        lock held.
 
+        Returns:
+            Messages the watched chat received meanwhile (to be emitted once
+            the page lock is released)
+        """
+        watcher = getattr(self.client, "chat_watcher", None)
+        if watcher and watcher.chat:
+            return await watcher.reopen() or []
+        return []
+
+    async def _send_batch(
+        self, chat_query: str, messages: List[str], open_via_url: bool = False
+    ) -> List[bool]:
+        """
+        Open a chat once and send messages back to back.
+
+        Args:
+            chat_query: Name or identifier of the chat
+            messages: Text messages to send, in order
+            open_via_url: If True, opens the chat via URL before sending
+
+        Returns:
+            One result per message (True if sent and confirmed)
+        """
+        async with self.client.scheduler.slot(PRIORITY_SEND, "send_message"):
             try:
-                opened = await self.open(chat_query, open_via_url=open_via_url)
-                if not opened:
-                    await self.client.emit("on_error", f"Could not open chat: {chat_query}")
-                    return False
-                print(f"✓ Chat '{chat_query}' opened, sending message")
-
-                await self._page.wait_for_selector(loc.CHAT_INPUT_BOX, timeout=DEFAULT_WAIT_TIMEOUT)
-                input_box = await self._page.wait_for_selector(loc.CHAT_INPUT_BOX, timeout=DEFAULT_WAIT_TIMEOUT)
-
-                if not input_box:
-                    await self.client.emit(
-                        "on_error",
-                        "Could not find text input box for sending message",
-                    )
-                    return False
+                results = await self._type_messages(chat_query, messages, open_via_url)
+                await self._wait_sent_ticks(results)
+            finally:
+                missed = await self._leave_chat()
+
+        for msg in missed:
+            await self.client.emit("on_message", msg)
+        return results
+
+    async def _wait_sent_ticks(self, receipts: List[Optional[DeliveryReceipt]]) -> None:
+        """
+        Wait for the server tick of just-sent messages before leaving their chat.
 
+        A receipt only updates while its bubble is in the DOM, so the next
+        operation must not switch or reload the chat before the tick shows.
+        Must be called with the page lock held.
+        """
+        pending = [r for r in receipts if r and r.msg_id and not r.reached(RECEIPT_SENT)]
+        if pending:
+            await asyncio.gather(*(r.wait(RECEIPT_SENT, SENT_TICK_TIMEOUT) for r in pending))
+
+    @staticmethod
+    async def _input_has_text(input_box) -> bool:
+        """True if the compose box still holds text (the message was not taken)."""
+        try:
+            return bool((await input_box.inner_text()).strip())
+        except Exception:
+            return False
+
+    async def _type_messages(
+        self, chat_query: str, messages: List[str], open_via_url: bool
+    ) -> List[Optional[DeliveryReceipt]]:
+        """
+        Type and send messages in a chat. Must be called with the page lock held.
+
+        Each message is bound to the ``data-id`` of the bubble it renders and
+        tracked by ``self.receipts``. If the bubble is not found but the
+        compose box was emptied, the message was sent: it gets an unbound
+        receipt (empty ``msg_id``) instead of None.
+
+        Args:
+            chat_query: Name or identifier of the chat
+            messages: Text messages to send, in order
+            open_via_url: If True, opens the chat via URL before sending
+
+        Returns:
+            One receipt per message (None if it was not sent)
+        """
+        receipts: List[Optional[DeliveryReceipt]] = [None] * len(messages)
+        logger.info("Sending %d message(s) to %s", len(messages), chat_query)
+        if not await self.client.wait_until_logged_in():
+            return receipts
+
+        try:
+            opened = await self.open(chat_query, open_via_url=open_via_url)
+            if not opened:
+                await self.client.emit("on_error", f"Could not open chat: {chat_query}")
+                return receipts
+            logger.info("Chat '%s' opened, sending message", chat_query)
+
+            input_box = await self._page.wait_for_selector(loc.CHAT_INPUT_BOX, timeout=DEFAULT_WAIT_TIMEOUT)
+
+            if not input_box:
+                await self.client.emit(
+                    "on_error",
+                    "Could not find text input box for sending message",
+                )
+                return receipts
+
+            previous = await self.receipts.last_outgoing_id()
+            for i, message in enumerate(messages):
                 await input_box.click(force=True)
                 await input_box.fill(message)
                 await self._page.keyboard.press("Enter")
-                await asyncio.sleep(2)
+                msg_id = await self.receipts.wait_new_outgoing_id(previous, DEFAULT_RECEIPT_TIMEOUT)
+                if msg_id:
+                    receipts[i] = await self.receipts.track(msg_id, chat_query)
+                    previous = msg_id
+                    continue
+                if await self._input_has_text(input_box):
+                    await self.client.emit("on_error", f"Message to {chat_query} was not sent")
+                    break
+                # WhatsApp took the message but its bubble was not found: report it
+                # as sent (unconfirmed) so callers do not send it again
+                await self.client.emit(
+                    "on_warning", f"Message to {chat_query} was sent but could not be confirmed"
+                )
+                receipts[i] = DeliveryReceipt("", chat_query)
+                previous = await self.receipts.last_outgoing_id()
 
-                confirmed = await self.wait_for_whatsapp_ready(timeout=DEFAULT_WAIT_TIMEOUT)
-                if not confirmed:
-                    print("⚠ Message sent but not confirmed by server")
-                    return False
+            return receipts
 
-                return True
+        except Exception as e:
+            await self._page.screenshot(path="send_message_error.png")
+            await self.client.emit("on_error", f"Error sending message: {e}")
+            return receipts
 
-            except Exception as e:
-                await self._page.screenshot(path="send_message_error.png")
-                await self.client.emit("on_error", f"Error sending message: {e}")
-                return False
-            finally:
-                await self.close()
+    async def wait_for_whatsapp_ready(self, timeout=30000, msg_id: Optional[str] = None) -> bool:
+        """
+        Wait until a message shows a server tick.
 
-    async def wait_for_whatsapp_ready(self, timeout=30000) -> bool:
+        Args:
+            timeout: Maximum time to wait in milliseconds
+            msg_id: ``data-id`` of the message (default: the last container,
+                which an incoming message can replace)
+
+        Returns:
+            True if the message was confirmed in time
+        """
         try:
-            last_msg = self._page.locator(loc.MESSAGE_CONTAINER).last
+            if msg_id:
+                msg_id = msg_id.replace("\\", "\\\\").replace('"', '\\"')
+                last_msg = self._page.locator(f'{loc.MESSAGE_CONTAINER}[data-id="{msg_id}"]')
+            else:
+                last_msg = self._page.locator(loc.MESSAGE_CONTAINER).last
             await last_msg.locator(loc.MSG_STATUS_CONFIRMED).wait_for(state="visible", timeout=timeout)
             print("✅ Message confirmed by the server (Tick seen)")
             return True
@@ -645,6 +1382,7 @@ class ChatManager:
             return False
 
     # You continue with the message sending...
+    @timed("send_file")
     async def send_file(self, chat_name: str, path: str) -> bool:
         """
         Send a file attachment to a chat.
@@ -656,46 +1394,90 @@ class ChatManager:
         Returns:
             True if file was sent successfully, False otherwise
         """
-        async with self.client._page_lock:
-            try:
-                if not os.path.isfile(path):
-                    msg = f"File does not exist: {path}"
-                    await self.client.emit("on_error", msg)
-                    return False
-
-                if not await self.client.wait_until_logged_in():
-                    msg = "Could not log in"
-                    await self.client.emit("on_error", msg)
-                    return False
-
-                if not await self.open(chat_name):
-                    msg = f"Could not open chat: {chat_name}"
-                    await self.client.emit("on_error", msg)
-                    return False
-
-                await self._page.wait_for_selector(loc.CHAT_INPUT_BOX, timeout=DEFAULT_WAIT_TIMEOUT)
-
-                attach_btn = await self._page.wait_for_selector(loc.ATTACH_BUTTON, timeout=5000)
-                await attach_btn.click()
-
-                input_files = await self._page.query_selector_all(loc.FILE_INPUT)
-                if not input_files:
-                    msg = "Could not find input[type='file']"
-                    await self.client.emit("on_error", msg)
-                    return False
-
-                await input_files[0].set_input_files(path)
-                await asyncio.sleep(5)
-                send_btn = await self._page.locator(loc.SEND_BUTTON).last.wait_for(
-                    state="visible", timeout=DEFAULT_WAIT_TIMEOUT
-                )
-                await send_btn.click()
-                await asyncio.sleep(2)
-                await self.wait_for_whatsapp_ready(timeout=DEFAULT_WAIT_TIMEOUT)
-                return True
-            except Exception as e:
-                await self.client.emit("on_error", f"Error sending file: {e}")
-                return False
+        receipt = await self.send_file_tracked(chat_name, path)
+        return await self._await_receipt(receipt, RECEIPT_SENT, DEFAULT_RECEIPT_TIMEOUT)
+
+    async def send_file_tracked(
+        self, chat_name: str, path: str, open_via_url: bool = False
+    ) -> Optional[DeliveryReceipt]:
+        """
+        Send a file attachment and return its delivery receipt.
+
+        Args:
+            chat_name: Name (or number) of the chat to send the file to
+            path: Absolute path to the file to send
+            open_via_url: If True, opens the chat via URL before sending
+
+        Returns:
+            Receipt bound to the sent message, or None if it was not sent
+        """
+        async with self.client.scheduler.slot(PRIORITY_SEND, "send_file"):
+            receipt = await self._attach_and_send(chat_name, path, open_via_url)
+            await self._wait_sent_ticks([receipt])
+            return receipt
+
+    async def _attach_and_send(
+        self, chat_name: str, path: str, open_via_url: bool = False
+    ) -> Optional[DeliveryReceipt]:
+        """
+        Attach and send a file. Must be called with the page lock held.
+
+        Args:
+            chat_name: Name of the chat to send the file to
+            path: Absolute path to the file to send
+            open_via_url: If True, opens the chat via URL before sending
+
+        Returns:
+            Receipt bound to the sent message, or None if it was not sent
+        """
+        try:
+            if not os.path.isfile(path):
+                msg = f"File does not exist: {path}"
+                await self.client.emit("on_error", msg)
+                return None
+
+            if not await self.client.wait_until_logged_in():
+                msg = "Could not log in"
+                await self.client.emit("on_error", msg)
+                return None
+
+            if not await self.open(chat_name, open_via_url=open_via_url):
+                msg = f"Could not open chat: {chat_name}"
+                await self.client.emit("on_error", msg)
+                return None
+
+            await self._page.wait_for_selector(loc.CHAT_INPUT_BOX, timeout=DEFAULT_WAIT_TIMEOUT)
+            previous = await self.receipts.last_outgoing_id()
+
+            attach_btn = await self._page.wait_for_selector(loc.ATTACH_BUTTON, timeout=5000)
+            await attach_btn.click()
+
+            input_files = await self._page.query_selector_all(loc.FILE_INPUT)
+            if not input_files:
+                msg = "Could not find input[type='file']"
+                await self.client.emit("on_error", msg)
+                return None
+
+            await input_files[0].set_input_files(path)
+            # The send button of the media preview appears once the file is loaded
+            send_btn = self._page.locator(loc.SEND_BUTTON).last
+            if not await timed_wait(
+                send_btn.wait_for(state="visible", timeout=DEFAULT_WAIT_TIMEOUT),
+                "send_file.preview",
+                replaces=5.0,
+            ):
+                await self.client.emit("on_error", f"File preview for {chat_name} did not load")
+                return None
+            await send_btn.click()
+
+            msg_id = await self.receipts.wait_new_outgoing_id(previous, DEFAULT_RECEIPT_TIMEOUT)
+            if not msg_id:
+                await self.client.emit("on_error", f"File sent to {chat_name} was not rendered")
+                return None
+            return await self.receipts.track(msg_id, chat_name)
+        except Exception as e:
+            await self.client.emit("on_error", f"Error sending file: {e}")
+            return None
 
     async def new_group(self, group_name: str, members: List[str]) -> bool:
         """
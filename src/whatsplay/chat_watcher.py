@@ -0,0 +1,201 @@
+"""
+Live message stream for an open conversation.
+
+``ChatWatcher`` keeps one chat open and installs a MutationObserver on the
+page that pushes every newly rendered ``conv-msg-*`` node of that chat to
+Python through ``page.expose_binding``. Each new incoming message is
+emitted as ``on_message`` as soon as it is rendered, without reopening the
+chat or re-collecting its history.
+"""
+
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .chat_manager import CURRENT_CHAT_JS
+from .constants import locator as loc
+from .object.message import MESSAGE_NODE_JS, Message, message_from_data
+from .scheduler import PRIORITY_USER
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+# Constants
+WATCH_BINDING_NAME = "__whatsplayMessage"
+
+# Installs the page side of the watcher once. Nodes are only pushed while
+# the watcher is armed and the open chat (by header title) is the one it was
+# armed on; ``known`` holds the data-ids rendered when it was armed, so
+# re-rendered history is ignored.
+WATCHER_JS = """
+(() => {
+    if (window.__whatsplayWatch) return;
+    const sel = %(selector)s;
+    const node = %(node)s;
+    const currentChat = %(current_chat)s;
+    const watch = window.__whatsplayWatch = { chat: null, armed: false, known: new Set() };
+
+    watch.arm = () => {
+        watch.chat = currentChat();
+        watch.known = new Set(
+            Array.from(document.querySelectorAll(sel)).map((el) => el.getAttribute('data-id'))
+        );
+        watch.armed = true;
+    };
+    watch.disarm = () => {
+        watch.chat = null;
+        watch.armed = false;
+        watch.known.clear();
+    };
+
+    const push = (el) => {
+        const id = el.getAttribute('data-id');
+        if (!id || watch.known.has(id)) return;
+        watch.known.add(id);
+        try { window.%(binding)s(node(el)); } catch (e) {}
+    };
+
+    new MutationObserver((records) => {
+        if (!watch.armed || currentChat() !== watch.chat) return;
+        for (const record of records) {
+            for (const added of record.addedNodes) {
+                if (added.nodeType !== 1) continue;
+                if (added.matches(sel)) push(added);
+                else added.querySelectorAll(sel).forEach(push);
+            }
+        }
+    }).observe(document.body, { childList: true, subtree: true });
+})()
+"""
+
+
+class ChatWatcher:
+    """
+    Streams new messages of a watched chat as ``on_message`` events.
+
+    Only one chat can be open in WhatsApp Web, so one chat is watched at a
+    time; watching another chat replaces it. While a chat is watched the
+    unread sweep does not close it, and the message pipeline reopens it
+    after visiting other chats.
+
+    Attributes:
+        client: Client used to open chats and emit events
+        chat: Name of the watched chat (None if not watching)
+    """
+
+    def __init__(self, client: "Client") -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            client: Client used to open chats and emit events
+        """
+        self.client = client
+        self.chat: Optional[str] = None
+        self._binding_page = None
+        self._last_sender = ""
+
+    def _script(self) -> str:
+        """Build the page side of the watcher."""
+        return WATCHER_JS % {
+            "selector": json.dumps(loc.MESSAGE_CONTAINER),
+            "node": MESSAGE_NODE_JS.strip(),
+            "current_chat": CURRENT_CHAT_JS.strip(),
+            "binding": WATCH_BINDING_NAME,
+        }
+
+    async def _install(self) -> None:
+        """Expose the binding (once per page) and install the observer."""
+        page = self.client._page
+        if self._binding_page is not page:
+            await page.expose_binding(WATCH_BINDING_NAME, self._on_node)
+            self._binding_page = page
+        await page.evaluate(self._script())
+
+    async def watch(self, chat_name: str) -> bool:
+        """
+        Open a chat and start streaming its new messages.
+
+        Args:
+            chat_name: Chat to watch
+
+        Returns:
+            True if the chat was opened and is being watched
+        """
+        async with self.client.scheduler.slot(PRIORITY_USER, "watch"):
+            self.chat = chat_name
+            if await self.reopen(emit_missed=False) is not None:
+                return True
+            self.chat = None
+            return False
+
+    async def unwatch(self) -> None:
+        """Stop streaming and let the sweep close the chat again."""
+        self.chat = None
+        try:
+            await self.client._page.evaluate(
+                "() => window.__whatsplayWatch && window.__whatsplayWatch.disarm()"
+            )
+        except Exception as e:
+            logger.debug("unwatch: %s", e)
+
+    async def reopen(self, emit_missed: bool = True) -> Optional[List[Message]]:
+        """
+        Open the watched chat again and re-arm the observer.
+
+        Must be called with the page lock held, so missed messages are
+        returned for the caller to emit once the lock is released.
+
+        Args:
+            emit_missed: Return incoming messages newer than the chat's
+                watermark (otherwise they are only marked as seen)
+
+        Returns:
+            Missed messages, or None if the chat could not be opened
+        """
+        if not self.chat:
+            return None
+        chat_manager = self.client.chat_manager
+        if not await chat_manager.open(self.chat):
+            await self.client.emit("on_warning", f"Could not open watched chat {self.chat}")
+            return None
+
+        await self._install()
+        await self.client._page.evaluate("() => window.__whatsplayWatch.arm()")
+
+        # Catch up on anything rendered before the observer was armed
+        pipeline = self.client.message_pipeline
+        messages = await chat_manager.collect_messages(
+            incremental=True, chat=self.chat, watermarks=pipeline.watermarks
+        )
+        seen = pipeline.seen
+        missed = []
+        for msg in messages:
+            self._last_sender = msg.sender
+            if msg.msg_id and seen.add(msg.msg_id) and emit_missed and not msg.is_outgoing:
+                missed.append(msg)
+        return missed
+
+    async def _on_node(self, source: Any, data: Dict[str, Any]) -> None:
+        """
+        Binding callback for every new message node of the watched chat.
+
+        Args:
+            source: Binding source (frame/page info), unused
+            data: Message data produced by ``MESSAGE_NODE_JS``
+        """
+        if not self.chat or not data:
+            return
+        msg = message_from_data(data, self.client._page)
+        if not msg or not msg.msg_id:
+            return
+        msg.chat = self.chat
+        if not msg.sender:
+            msg.sender = self._last_sender
+        self._last_sender = msg.sender
+        self.client.message_pipeline.watermarks[self.chat] = msg.msg_id
+        if msg.is_outgoing or not self.client.message_pipeline.seen.add(msg.msg_id):
+            return
+        await self.client.emit("on_message", msg)
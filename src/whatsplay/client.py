@@ -9,14 +9,38 @@ import asyncio
 import signal
 import sys
 import time
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 from .base_client import BaseWhatsAppClient
-from .chat_manager import ChatManager
+from .broadcast import (
+    DEFAULT_BROADCAST_BURST,
+    DEFAULT_BROADCAST_RATE,
+    DEFAULT_PER_CHAT_RATE,
+    Broadcaster,
+)
+from .chat_index import CHAT_INDEX_FILENAME, ChatIndex
+from .chat_manager import DEFAULT_HISTORY_BATCH_SIZE, ChatManager
+from .chat_watcher import ChatWatcher
 from .constants.states import State
+from .dom_observer import DomObserver
+from .message_pipeline import MessagePipeline
+from .metrics import (
+    DEFAULT_METRICS_HOST,
+    DEFAULT_METRICS_PORT,
+    ERRORS_TOTAL,
+    RECONNECTS_TOTAL,
+    MetricsRegistry,
+    MetricsServer,
+    Sample,
+)
+from .receipts import RECEIPT_SENT, DeliveryReceipt
+from .roundtrips import RoundTripProxy, RoundTripStats
+from .scheduler import PageLock, PageScheduler
 from .object.message import FileMessage, Message
 from .state_manager import StateManager
+from .waits import WAIT_STATS
 from .wa_elements import WhatsAppElements
 
 # Constants
@@ -24,6 +48,9 @@ DEFAULT_POLL_FREQUENCY = 0.25
 DEFAULT_LOGIN_TIMEOUT = 60
 MAX_CONSECUTIVE_ERRORS = 5
 DEFAULT_UNREAD_MESSAGES_SLEEP = 1
+DEFAULT_IDLE_TIMEOUT = 5
+# Seconds stop() lets queued event listener calls finish before cancelling them
+DEFAULT_EVENT_DRAIN_TIMEOUT = 5
 
 
 class Client(BaseWhatsAppClient):
@@ -38,9 +65,19 @@ class Client(BaseWhatsAppClient):
         poll_freq: Frequency of state polling in seconds
         current_state: Current WhatsApp Web state
         unread_messages_sleep: Sleep time between unread message checks
+        event_driven: Wait on in-page change notifications instead of polling
+        idle_timeout: Maximum wait between ticks in event-driven mode
+        level_triggered_unread: Emit on_unread_chat with every unread chat on
+            every sweep instead of only when chats change
         wa_elements: WhatsApp Web elements helper
         chat_manager: Chat operations manager
         state_manager: State transition manager
+        message_pipeline: Emits on_message for new incoming messages
+        chat_watcher: Streams new messages of a watched chat
+        scheduler: Grants page access by priority (sends, scrapes, sweeps)
+        metrics: Latency histograms and counters of page operations
+        round_trips: Playwright calls per operation (None unless
+            ``trace_round_trips`` is set)
 
     Example:
         >>> client = Client(auth=LocalProfileAuth("./session"))
@@ -56,6 +93,9 @@ class Client(BaseWhatsAppClient):
         headless: bool = False,
         locale: str = "en-US",
         auth: Optional[Any] = None,
+        event_driven: bool = False,
+        chat_index_path: Optional[str] = None,
+        trace_round_trips: bool = False,
     ) -> None:
         """
         Initialize the WhatsApp Web client.
@@ -65,6 +105,13 @@ class Client(BaseWhatsAppClient):
             headless: Run browser in headless mode
             locale: Browser locale setting
             auth: Authentication provider instance
+            event_driven: If True, install a MutationObserver in the page and
+                run the main loop on its notifications instead of polling
+            chat_index_path: JSON file where the chat index is persisted
+                (default: ``chat_index.json`` in the auth profile or
+                ``user_data_dir``; in memory only if neither is set)
+            trace_round_trips: Count and time every Playwright call, by
+                operation, in ``round_trips`` (adds a little overhead)
         """
         super().__init__(user_data_dir=user_data_dir, headless=headless, auth=auth)
         self.locale = locale
@@ -74,14 +121,79 @@ class Client(BaseWhatsAppClient):
         self.qr_task: Optional[asyncio.Task] = None
         self.current_state: Optional[State] = None
         self.unread_messages_sleep = DEFAULT_UNREAD_MESSAGES_SLEEP
+        self.event_driven = event_driven
+        self.idle_timeout = DEFAULT_IDLE_TIMEOUT
+        self.dom_observer: Optional[DomObserver] = None
+        self._last_wake = 0.0
+        self.level_triggered_unread = False
         self._shutdown_event = asyncio.Event()
-        self._page_lock = asyncio.Lock()
+        self.scheduler = PageScheduler()
+        self.metrics = MetricsRegistry()
+        self.metrics.add_collector(self._metrics_gauges)
+        self.scheduler.metrics = self.metrics
+        self.metrics_server: Optional[MetricsServer] = None
+        self.round_trips: Optional[RoundTripStats] = RoundTripStats() if trace_round_trips else None
+        # Kept for user code: ``async with client._page_lock`` queues at user priority
+        self._page_lock = PageLock(self.scheduler)
         self._consecutive_errors = 0
         self.last_qr_shown: Optional[bytes] = None
         self.chat_manager: Optional[ChatManager] = None
         self.state_manager: Optional[StateManager] = None
+        self.message_pipeline = MessagePipeline(self)
+        self.chat_watcher = ChatWatcher(self)
+        self.broadcaster = Broadcaster(self)
+        self.chat_index = ChatIndex(chat_index_path or self._default_chat_index_path())
         self._setup_signal_handlers()
 
+    def _default_chat_index_path(self) -> Optional[str]:
+        """Place the chat index next to the browser profile, if there is one."""
+        directory = getattr(self.auth, "profile_path", None) or self.user_data_dir
+        return str(Path(directory) / CHAT_INDEX_FILENAME) if directory else None
+
+    def _metrics_gauges(self) -> List[Sample]:
+        """Current scheduler, condition wait, event queue and round trip figures."""
+        samples: List[Sample] = [
+            ("page_queue_depth", {}, len(self.scheduler)),
+            ("page_wait_timeouts", {}, self.scheduler.timeouts),
+        ]
+        for row in WAIT_STATS.report():
+            samples.append(("condition_wait_timeouts", {"wait": row["name"]}, row["timeouts"]))
+        for name, stats in self.event_stats().items():
+            samples.append(("event_pending", {"event": name}, stats["pending"]))
+            samples.append(("event_dropped", {"event": name}, stats["dropped"]))
+        for row in self.round_trips.report() if self.round_trips is not None else ():
+            samples.append(("page_round_trips", {"operation": row["operation"]}, row["calls"]))
+            samples.append(("page_round_trip_seconds", {"operation": row["operation"]}, row["seconds"]))
+        return samples
+
+    async def emit(self, event: str, *args: Any, **kwargs: Any) -> None:
+        """Emit an event, counting errors and reconnects in ``metrics``."""
+        if event == "on_error":
+            self.metrics.inc(ERRORS_TOTAL)
+        elif event == "on_reconnect":
+            self.metrics.inc(RECONNECTS_TOTAL)
+        await super().emit(event, *args, **kwargs)
+
+    async def serve_metrics(
+        self, host: str = DEFAULT_METRICS_HOST, port: int = DEFAULT_METRICS_PORT
+    ) -> MetricsServer:
+        """
+        Serve ``metrics`` in the Prometheus text format at ``/metrics``.
+
+        The server is stopped with the client.
+
+        Args:
+            host: Interface to bind (local only by default)
+            port: Port to bind (0 picks a free one, see ``server.port``)
+
+        Returns:
+            The running server
+        """
+        if self.metrics_server is None:
+            self.metrics_server = MetricsServer(self.metrics, host, port)
+            await self.metrics_server.start()
+        return self.metrics_server
+
     def _setup_signal_handlers(self) -> None:
         """
         Configure signal handlers for clean shutdown.
@@ -125,12 +237,17 @@ class Client(BaseWhatsAppClient):
         """Check if the client is currently running."""
         return getattr(self, "_is_running", False)
 
-    async def stop(self) -> None:
+    async def stop(self, drain_timeout: float = DEFAULT_EVENT_DRAIN_TIMEOUT) -> None:
         """
         Stop the client and clean up resources.
 
         This method ensures all resources are properly released including
-        browser instances, pages, and the Playwright instance.
+        browser instances, pages, and the Playwright instance. Listener calls
+        queued by concurrent events get ``drain_timeout`` seconds to finish
+        while the page is still open; the rest are cancelled.
+
+        Args:
+            drain_timeout: Seconds to wait for queued listener calls
         """
         if not getattr(self, "_is_running", False):
             return
@@ -138,6 +255,12 @@ class Client(BaseWhatsAppClient):
         self._is_running = False
 
         try:
+            await self.drain_events(drain_timeout)
+
+            # Stop sending before the page goes away
+            if self.chat_manager is not None:
+                await self.chat_manager.outbox.close()
+
             # Close page
             if hasattr(self, "_page") and self._page:
                 try:
@@ -171,6 +294,9 @@ class Client(BaseWhatsAppClient):
         except Exception as e:
             await self.emit("on_error", f"Error during cleanup: {e}")
         finally:
+            if self.metrics_server is not None:
+                await self.metrics_server.stop()
+                self.metrics_server = None
             await self.emit("on_stop")
             self._shutdown_event.set()
 
@@ -186,9 +312,13 @@ class Client(BaseWhatsAppClient):
         """
         try:
             await super().start()
+            if self.round_trips is not None:
+                self._page = RoundTripProxy(self._page, self.round_trips)
             self.wa_elements = WhatsAppElements(self._page)
             self.chat_manager = ChatManager(self)
             self.state_manager = StateManager(self)
+            if self.event_driven:
+                await self._install_dom_observer()
             self._is_running = True
             await self._main_loop()
 
@@ -235,7 +365,7 @@ class Client(BaseWhatsAppClient):
                 self.current_state = curr_state
 
                 if curr_state is None:
-                    await asyncio.sleep(self.poll_freq)
+                    await self._wait_next_tick()
                     continue
 
                 if curr_state != state:
@@ -248,7 +378,7 @@ class Client(BaseWhatsAppClient):
                     await self.state_manager._handle_same_state(curr_state)
 
                 await self.emit("on_tick")
-                await asyncio.sleep(self.poll_freq)
+                await self._wait_next_tick()
 
             except asyncio.CancelledError:
                 await self.emit("on_info", "Main loop cancelled")
@@ -273,6 +403,41 @@ class Client(BaseWhatsAppClient):
                         )
                         break
 
+    async def _install_dom_observer(self) -> None:
+        """
+        Install the in-page change observer for event-driven mode.
+
+        Falls back to polling if the binding cannot be installed.
+        """
+        self.dom_observer = DomObserver(self._page)
+        try:
+            await self.dom_observer.install()
+        except Exception as e:
+            self.dom_observer = None
+            await self.emit(
+                "on_warning", f"Could not install DOM observer, polling instead: {e}"
+            )
+
+    async def _wait_next_tick(self) -> None:
+        """
+        Wait until the next main loop iteration is due.
+
+        In event-driven mode this waits for a state or sidebar change pushed
+        by the page (bounded by ``idle_timeout``), but never runs ticks closer
+        than ``poll_freq`` apart so the client's own page operations cannot
+        drive a busy loop. Otherwise it sleeps ``poll_freq``.
+        """
+        if not (self.dom_observer and self.dom_observer.installed):
+            await asyncio.sleep(self.poll_freq)
+            return
+
+        loop = asyncio.get_event_loop()
+        await self.dom_observer.wait(self.idle_timeout)
+        since_last = loop.time() - self._last_wake
+        if since_last < self.poll_freq:
+            await asyncio.sleep(self.poll_freq - since_last)
+        self._last_wake = loop.time()
+
     async def wait_until_logged_in(self, timeout: int = DEFAULT_LOGIN_TIMEOUT) -> bool:
         """
         Wait until the client is logged in.
@@ -296,9 +461,14 @@ class Client(BaseWhatsAppClient):
     # Delegated methods to ChatManager
     # -------------------------------------------------------------------------
 
-    async def close(self) -> None:
-        """Close the currently open chat."""
-        return await self.chat_manager.close()
+    async def close(self, force: bool = False) -> None:
+        """
+        Close the currently open chat.
+
+        Args:
+            force: Press Escape even if no chat is open
+        """
+        return await self.chat_manager.close(force=force)
 
     async def open(
         self, chat_name: str, timeout: int = 10000, open_via_url: bool = False
@@ -333,14 +503,69 @@ class Client(BaseWhatsAppClient):
         """
         return await self.chat_manager.search_conversations(query, close)
 
-    async def collect_messages(self) -> List[Union[Message, FileMessage]]:
+    async def collect_messages(
+        self, incremental: bool = False, chat: Optional[str] = None
+    ) -> List[Union[Message, FileMessage]]:
         """
         Collect all visible messages in the current chat.
 
+        Args:
+            incremental: Only return messages newer than the last call for this chat
+            chat: Watermark key (defaults to the open chat's title)
+
         Returns:
             List of Message and FileMessage objects
         """
-        return await self.chat_manager.collect_messages()
+        return await self.chat_manager.collect_messages(incremental=incremental, chat=chat)
+
+    async def iter_messages(
+        self,
+        chat: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        batch_size: int = DEFAULT_HISTORY_BATCH_SIZE,
+    ) -> AsyncIterator[Union[Message, FileMessage]]:
+        """
+        Iterate over a chat's history, newest message first.
+
+        Older messages are loaded by scrolling the message pane as the
+        iteration goes, so deep history can be read with bounded memory.
+
+        Example:
+            >>> async for msg in client.iter_messages("Ana", limit=100):
+            ...     print(msg.sender, msg.text)
+
+        Args:
+            chat: Chat to open first (uses the open chat if None)
+            since: Stop at the first message older than this time
+            limit: Maximum number of messages to yield
+            batch_size: Messages extracted per round trip
+
+        Yields:
+            Message and FileMessage objects
+        """
+        async for msg in self.chat_manager.iter_messages(
+            chat, since=since, limit=limit, batch_size=batch_size
+        ):
+            yield msg
+
+    async def watch(self, chat_name: str) -> bool:
+        """
+        Keep a chat open and emit on_message for each new message as it arrives.
+
+        Only one chat is watched at a time; watching another chat replaces it.
+
+        Args:
+            chat_name: Chat to watch
+
+        Returns:
+            True if the chat was opened and is being watched
+        """
+        return await self.chat_watcher.watch(chat_name)
+
+    async def unwatch(self) -> None:
+        """Stop watching the current chat."""
+        await self.chat_watcher.unwatch()
 
     async def download_all_files(
         self, carpeta: Optional[str] = None, detect_codecs: bool = True
@@ -373,7 +598,11 @@ class Client(BaseWhatsAppClient):
         return await self.chat_manager.download_file_by_index(index, carpeta)
 
     async def send_message(
-        self, chat_query: str, message: str, open_via_url: bool = False
+        self,
+        chat_query: str,
+        message: str,
+        open_via_url: bool = False,
+        wait_for: Optional[str] = RECEIPT_SENT,
     ) -> bool:
         """
         Send a text message.
@@ -382,14 +611,80 @@ class Client(BaseWhatsAppClient):
             chat_query: Chat name or identifier
             message: Message text to send
             open_via_url: Open chat via URL before sending
+            wait_for: Receipt to wait for ("sent", "delivered", "read"), or
+                None to return as soon as the message is rendered
 
         Returns:
             True if message was sent successfully
         """
         return await self.chat_manager.send_message(
+            chat_query, message, open_via_url=open_via_url, wait_for=wait_for
+        )
+
+    async def send_message_tracked(
+        self, chat_query: str, message: str, open_via_url: bool = False
+    ) -> Optional[DeliveryReceipt]:
+        """
+        Send a text message and return its delivery receipt.
+
+        Example:
+            >>> receipt = await client.send_message_tracked("Ana", "Hola")
+            >>> await receipt.wait("read", timeout=60)
+
+        Args:
+            chat_query: Chat name or identifier
+            message: Message text to send
+            open_via_url: Open chat via URL before sending
+
+        Returns:
+            Receipt bound to the sent message, or None if it was not sent
+        """
+        return await self.chat_manager.send_message_tracked(
             chat_query, message, open_via_url=open_via_url
         )
 
+    async def send_messages(
+        self,
+        chat_query: str,
+        messages: List[str],
+        open_via_url: bool = False,
+        wait_for: Optional[str] = RECEIPT_SENT,
+    ) -> List[bool]:
+        """
+        Send several text messages to one chat, opening it only once.
+
+        Args:
+            chat_query: Chat name or identifier
+            messages: Message texts to send, in order
+            open_via_url: Open chat via URL before sending
+            wait_for: Receipt to wait for, or None
+
+        Returns:
+            One result per message
+        """
+        return await self.chat_manager.send_messages(
+            chat_query, messages, open_via_url=open_via_url, wait_for=wait_for
+        )
+
+    def queue_message(
+        self, chat_query: str, message: str, open_via_url: bool = False
+    ) -> "asyncio.Future[Optional[DeliveryReceipt]]":
+        """
+        Queue a text message in the outbox without waiting for it.
+
+        Messages queued for the same chat are sent together.
+
+        Args:
+            chat_query: Chat name or identifier
+            message: Message text to send
+            open_via_url: Open chat via URL before sending
+
+        Returns:
+            Future resolved with the message's DeliveryReceipt (None if it
+            was not sent)
+        """
+        return self.chat_manager.outbox.submit(chat_query, message, open_via_url)
+
     async def send_file(self, chat_name: str, path: str) -> bool:
         """
         Send a file attachment.
@@ -403,6 +698,59 @@ class Client(BaseWhatsAppClient):
         """
         return await self.chat_manager.send_file(chat_name, path)
 
+    async def broadcast(
+        self,
+        targets: List[str],
+        message: Optional[str] = None,
+        file: Optional[str] = None,
+        checkpoint: Optional[str] = None,
+        rate: Optional[float] = DEFAULT_BROADCAST_RATE,
+        per_chat_rate: Optional[float] = DEFAULT_PER_CHAT_RATE,
+        burst: int = DEFAULT_BROADCAST_BURST,
+        wait_for: Optional[str] = RECEIPT_SENT,
+        retry_failed: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Send a message and/or file to many chats.
+
+        Phone numbers are opened via URL. Each recipient's message is
+        confirmed by its server tick before the next chat is opened, and
+        progress is written to ``checkpoint`` so an interrupted broadcast can
+        be resumed by calling it again with the same arguments.
+
+        Example:
+            >>> results = await client.broadcast(
+            ...     ["5491122334455", "Ana"], message="Hola!", checkpoint="promo.jsonl"
+            ... )
+
+        Args:
+            targets: Chat names or phone numbers
+            message: Text to send
+            file: Path of a file to send (sent before the text)
+            checkpoint: Progress file used to resume
+            rate: Sends per second across all recipients (None: unlimited)
+            per_chat_rate: Sends per second to the same chat (None: unlimited)
+            burst: Sends allowed back to back before ``rate`` applies
+            wait_for: Receipt status that counts as sent, or None
+            retry_failed: Resend recipients that failed or were interrupted
+                in a previous run
+
+        Returns:
+            Target -> ``"sent"``, ``"unconfirmed"`` (sent, but ``wait_for``
+            not seen in time; never resent) or ``"failed"``
+        """
+        return await self.broadcaster.run(
+            targets,
+            message=message,
+            file=file,
+            checkpoint=checkpoint,
+            rate=rate,
+            per_chat_rate=per_chat_rate,
+            burst=burst,
+            wait_for=wait_for,
+            retry_failed=retry_failed,
+        )
+
     async def react_to_last_message(self, emoji: str) -> bool:
         """
         React to the last visible message in the current chat.
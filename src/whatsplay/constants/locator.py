@@ -83,6 +83,8 @@ SEARCH_ITEM = "//div[@role='row']"
 SEARCH_ITEM_COMPONENTS = ".//div[@role='gridcell' and @aria-colindex='2']/parent::div/div"
 # Contador 'unread' dentro del ítem
 SEARCH_ITEM_UNREAD_MESSAGES = ".//span[contains(@aria-label, 'unread') or contains(@aria-label, 'mensaje no leído') or contains(@aria-label, 'mensajes no leídos')]"
+# Estado vacío del buscador: no hay chats, contactos ni mensajes
+SEARCH_NO_RESULTS = "//div[@id='pane-side']//span[contains(., 'No chats, contacts or messages found') or contains(., 'No se encontró ningún chat, contacto ni mensaje')]"
 
 # ==============================
 # Chat interface elements
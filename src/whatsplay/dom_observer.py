@@ -0,0 +1,168 @@
+"""
+In-page change notifications for WhatsApp Web.
+
+This module installs a MutationObserver inside WhatsApp Web that pushes
+state transitions and sidebar changes back to Python through
+``page.expose_binding``, so the client can wait on changes instead of
+polling the page on a fixed interval.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from playwright.async_api import Page
+
+from .wa_elements import STATE_PROBE_JS, STATE_PROBE_SELECTORS
+
+logger = logging.getLogger(__name__)
+
+# Constants
+BINDING_NAME = "__whatsplayNotify"
+DEFAULT_DEBOUNCE_MS = 100
+
+OBSERVER_JS = """
+(() => {
+    if (window.__whatsplayObserver) return;
+    window.__whatsplayObserver = true;
+
+    const probe = %(probe)s;
+    const sel = %(selectors)s;
+    const debounceMs = %(debounce)d;
+    let lastState;
+    let lastSidebar = null;
+    let timer = null;
+
+    const notify = (payload) => {
+        try { window.%(binding)s(payload); } catch (e) {}
+    };
+
+    // Signature of the rendered sidebar rows: ignores hover/focus noise and
+    // only changes when titles, previews, times or badges change.
+    const sidebarSignature = () => {
+        const pane = document.querySelector('#pane-side');
+        if (!pane) return null;
+        return Array.from(pane.querySelectorAll('[role="row"]'))
+            .map((r) => r.textContent || '')
+            .join('\\u0001');
+    };
+
+    const flush = () => {
+        timer = null;
+        const result = probe(sel);
+        if (result.state !== lastState) {
+            lastState = result.state;
+            notify(Object.assign({ kind: 'state' }, result));
+        }
+        const sig = sidebarSignature();
+        if (sig !== null && sig !== lastSidebar) {
+            lastSidebar = sig;
+            notify({ kind: 'sidebar' });
+        }
+    };
+
+    const schedule = () => {
+        if (timer === null) timer = setTimeout(flush, debounceMs);
+    };
+
+    const start = () => {
+        new MutationObserver(schedule).observe(document.documentElement, {
+            childList: true,
+            subtree: true,
+            characterData: true,
+            attributes: true,
+            attributeFilter: ['aria-label', 'title', 'data-icon'],
+        });
+        schedule();
+    };
+
+    if (document.documentElement) start();
+    else document.addEventListener('DOMContentLoaded', start);
+})()
+"""
+
+
+class DomObserver:
+    """
+    Receives change notifications pushed from WhatsApp Web.
+
+    The observer script is registered as an init script so it survives
+    navigations (e.g. ``open_via_url``), and is also evaluated once on the
+    current document.
+
+    Attributes:
+        page: Playwright page being observed
+        installed: True once the binding and observer script are in place
+        last_state: Last state name pushed by the page (None if unknown)
+        sidebar_changes: Number of sidebar change notifications received
+    """
+
+    def __init__(self, page: Page, debounce_ms: int = DEFAULT_DEBOUNCE_MS) -> None:
+        """
+        Initialize the observer.
+
+        Args:
+            page: Playwright page to observe
+            debounce_ms: In-page debounce applied to DOM mutations
+        """
+        self.page = page
+        self.debounce_ms = debounce_ms
+        self.installed = False
+        self.last_state: Optional[str] = None
+        self.last_probe: Optional[Dict[str, Any]] = None
+        self.sidebar_changes = 0
+        self._signal = asyncio.Event()
+
+    def _script(self) -> str:
+        """Build the observer script with the state probe inlined."""
+        return OBSERVER_JS % {
+            "probe": STATE_PROBE_JS.strip(),
+            "selectors": json.dumps(STATE_PROBE_SELECTORS),
+            "debounce": self.debounce_ms,
+            "binding": BINDING_NAME,
+        }
+
+    async def install(self) -> None:
+        """Expose the notification binding and start the in-page observer."""
+        if self.installed:
+            return
+        script = self._script()
+        await self.page.expose_binding(BINDING_NAME, self._on_notify)
+        await self.page.add_init_script(script)
+        await self.page.evaluate(script)
+        self.installed = True
+
+    def _on_notify(self, source: Any, payload: Dict[str, Any]) -> None:
+        """
+        Binding callback invoked from the page.
+
+        Args:
+            source: Binding source (frame/page info), unused
+            payload: Notification sent by the observer script
+        """
+        kind = (payload or {}).get("kind")
+        if kind == "state":
+            self.last_state = payload.get("state")
+            self.last_probe = payload
+        elif kind == "sidebar":
+            self.sidebar_changes += 1
+        logger.debug("dom notification: %s", kind)
+        self._signal.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait for the next change notification.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if a notification arrived, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._signal.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._signal.clear()
+        return True
@@ -2,17 +2,64 @@
 Event handling system implementation
 """
 
-from typing import Any, Callable, List, Dict, Optional, Tuple
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Dict, Optional, Set, Tuple
 from ..filters import Filter
+from ..filters.filters import FilterCache
+
+logger = logging.getLogger(__name__)
+
+# Dispatch modes
+DISPATCH_SEQUENTIAL = "sequential"
+DISPATCH_CONCURRENT = "concurrent"
+
+# What a concurrent event does when its backlog is full
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE)
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_BACKLOG = 100
+
+# A listener call: (listener, args, kwargs)
+Job = Tuple[Callable, tuple, dict]
 
 
 class Event:
     """
     Represents a single event type that can have multiple listeners
+
+    By default listeners are awaited one after another inside ``emit``. In
+    concurrent mode ``emit`` only queues one call per listener and returns;
+    the calls run as tasks, at most ``max_concurrency`` at a time, with at
+    most ``max_backlog`` calls waiting. When the backlog is full, ``overflow``
+    decides: ``"block"`` makes ``emit`` wait for room, ``"drop_oldest"``
+    discards the oldest waiting call, and ``"coalesce"`` discards the waiting
+    calls of the same listener (superseded by the new emission).
+
+    Attributes:
+        mode: ``"sequential"`` or ``"concurrent"``
+        stats: Listener -> name, calls, errors, total/max/last seconds (keyed
+            by the listener itself, so listeners sharing a name stay apart)
+        dropped: Calls discarded by ``drop_oldest``/``coalesce``
     """
 
     def __init__(self) -> None:
         self.__listeners: List[Tuple[Callable, Optional[Filter]]] = []
+        self.mode = DISPATCH_SEQUENTIAL
+        self.max_concurrency = DEFAULT_MAX_CONCURRENCY
+        self.max_backlog = DEFAULT_MAX_BACKLOG
+        self.overflow = OVERFLOW_BLOCK
+        self.stats: Dict[Callable, Dict[str, Any]] = {}
+        self.dropped = 0
+        self._backlog: Deque[Job] = deque()
+        self._running: Set[asyncio.Task] = set()
+        self._space: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
 
     def register_listener(
         self, func: Callable, filter_obj: Optional[Filter] = None
@@ -25,20 +72,164 @@ class Event:
         """Add a listener if it's not already registered"""
         self.__listeners.append((func, filter_obj))
 
-    async def emit(self, *args: Any, **kwargs: Any) -> None:
-        """Emit event to all listeners"""
+    def __len__(self) -> int:
+        """Number of registered listeners"""
+        return len(self.__listeners)
+
+    def configure(
+        self,
+        mode: str = DISPATCH_CONCURRENT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_backlog: int = DEFAULT_MAX_BACKLOG,
+        overflow: str = OVERFLOW_BLOCK,
+    ) -> None:
+        """
+        Choose how listeners are dispatched.
+
+        Args:
+            mode: ``"sequential"`` (await listeners in ``emit``) or ``"concurrent"``
+            max_concurrency: Listener calls running at the same time
+            max_backlog: Listener calls waiting to run
+            overflow: ``"block"``, ``"drop_oldest"`` or ``"coalesce"``
+
+        Raises:
+            ValueError: On an unknown mode or policy, or non-positive limits
+        """
+        if mode not in (DISPATCH_SEQUENTIAL, DISPATCH_CONCURRENT):
+            raise ValueError(f"Unknown dispatch mode: {mode}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if max_concurrency < 1 or max_backlog < 1:
+            raise ValueError("max_concurrency and max_backlog must be at least 1")
+        self.mode = mode
+        self.max_concurrency = max_concurrency
+        self.max_backlog = max_backlog
+        self.overflow = overflow
+
+    @property
+    def pending(self) -> int:
+        """Listener calls queued or running (concurrent mode)."""
+        return len(self._backlog) + len(self._running)
+
+    def _jobs(self, args: tuple, kwargs: dict) -> List[Job]:
+        """
+        Apply each listener's filter and return the calls to make.
+
+        Filters apply to the first argument: a list (e.g. chats) is narrowed
+        to the passing items, a single item (e.g. a Message) passes or not.
+        Results are cached for the whole emission, so sub-filters shared by
+        several listeners are evaluated once per item.
+        """
+        jobs = []
+        cache: FilterCache = {}
         for listener, filter_obj in self.__listeners:
             if not filter_obj:
-                await listener(*args, **kwargs)
+                jobs.append((listener, args, kwargs))
                 continue
 
-            # We assume the filter is for the first argument, which is a list of chats
-            if not args or not isinstance(args[0], list):
+            if not args:
                 continue
 
-            filtered_args = [arg for arg in args[0] if filter_obj.test(arg)]
+            if not isinstance(args[0], list):
+                if filter_obj.evaluate(args[0], cache):
+                    jobs.append((listener, args, kwargs))
+                continue
+
+            filtered_args = [arg for arg in args[0] if filter_obj.evaluate(arg, cache)]
             if filtered_args:
-                await listener(filtered_args, *args[1:], **kwargs)
+                jobs.append((listener, (filtered_args, *args[1:]), kwargs))
+        return jobs
+
+    async def _call(self, job: Job) -> None:
+        """Run one listener call, recording its duration."""
+        listener, args, kwargs = job
+        stats = self.stats.get(listener)
+        if stats is None:
+            name = getattr(listener, "__qualname__", repr(listener))
+            stats = {"name": name, "calls": 0, "errors": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+            self.stats[listener] = stats
+        start = time.monotonic()
+        try:
+            await listener(*args, **kwargs)
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            stats["calls"] += 1
+            stats["total"] += elapsed
+            stats["last"] = elapsed
+            stats["max"] = max(stats["max"], elapsed)
+
+    async def emit(self, *args: Any, **kwargs: Any) -> None:
+        """Emit event to all listeners"""
+        jobs = self._jobs(args, kwargs)
+        if self.mode == DISPATCH_SEQUENTIAL:
+            for job in jobs:
+                await self._call(job)
+            return
+
+        for job in jobs:
+            await self._enqueue(job)
+        self._pump()
+
+    async def _enqueue(self, job: Job) -> None:
+        """Add a call to the backlog, applying the overflow policy."""
+        if self._space is None:
+            self._space = asyncio.Event()
+        while len(self._backlog) >= self.max_backlog:
+            if self.overflow == OVERFLOW_BLOCK:
+                self._pump()
+                if len(self._backlog) < self.max_backlog:
+                    break
+                self._space.clear()
+                await self._space.wait()
+                continue
+            if self.overflow == OVERFLOW_COALESCE:
+                kept = deque(j for j in self._backlog if j[0] is not job[0])
+                if len(kept) < len(self._backlog):
+                    self.dropped += len(self._backlog) - len(kept)
+                    self._backlog = kept
+                    continue
+            self._backlog.popleft()
+            self.dropped += 1
+        self._backlog.append(job)
+
+    def _pump(self) -> None:
+        """Start queued calls while there is room."""
+        while self._backlog and len(self._running) < self.max_concurrency:
+            task = asyncio.ensure_future(self._run(self._backlog.popleft()))
+            self._running.add(task)
+            task.add_done_callback(self._finished)
+        if self._space is not None and len(self._backlog) < self.max_backlog:
+            self._space.set()
+
+    async def _run(self, job: Job) -> None:
+        try:
+            await self._call(job)
+        except Exception:
+            logger.exception("Error in %s listener", getattr(job[0], "__qualname__", job[0]))
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self._pump()
+        if not self._backlog and not self._running and self._idle is not None:
+            self._idle.set()
+
+    async def drain(self) -> None:
+        """Wait until every queued and running listener call has finished."""
+        while self._backlog or self._running:
+            if self._idle is None:
+                self._idle = asyncio.Event()
+            self._idle.clear()
+            self._pump()
+            await self._idle.wait()
+
+    def cancel_pending(self) -> None:
+        """Drop queued calls and cancel the running ones."""
+        self._backlog.clear()
+        for task in list(self._running):
+            task.cancel()
 
 
 class EventHandler:
@@ -63,6 +254,70 @@ class EventHandler:
 
         return decorator
 
+    def has_listeners(self, event: str) -> bool:
+        """Return True if at least one listener is registered for the event"""
+        return len(self._events.get(event) or ()) > 0
+
+    def configure_event(
+        self,
+        name: str,
+        mode: str = DISPATCH_CONCURRENT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_backlog: int = DEFAULT_MAX_BACKLOG,
+        overflow: str = OVERFLOW_BLOCK,
+    ) -> None:
+        """
+        Choose how an event's listeners are dispatched.
+
+        Example:
+            >>> client.configure_event("on_unread_chat", max_concurrency=2, overflow="coalesce")
+
+        Args:
+            name: Event name
+            mode: ``"sequential"`` or ``"concurrent"`` (listeners run as tasks)
+            max_concurrency: Listener calls running at the same time
+            max_backlog: Listener calls waiting to run
+            overflow: ``"block"``, ``"drop_oldest"`` or ``"coalesce"``
+        """
+        if name not in self._events:
+            self._events[name] = Event()
+        self._events[name].configure(mode, max_concurrency, max_backlog, overflow)
+
+    def event_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-listener timing of every event.
+
+        Returns:
+            Event name -> {"pending", "dropped", "listeners": [stats]}, where
+            each listener's stats carry its ``name``
+        """
+        return {
+            name: {
+                "pending": event.pending,
+                "dropped": event.dropped,
+                "listeners": [dict(v) for v in event.stats.values()],
+            }
+            for name, event in self._events.items()
+            if event.stats or event.pending or event.dropped
+        }
+
+    async def drain_events(self, timeout: Optional[float] = None) -> None:
+        """
+        Let queued listener calls finish, then cancel whatever is left.
+
+        Args:
+            timeout: Seconds to wait for every event's backlog (None waits forever)
+        """
+        events = list(self._events.values())
+        try:
+            await asyncio.wait_for(asyncio.gather(*(e.drain() for e in events)), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Listener calls still running after %ss, cancelling them", timeout)
+        running = [task for event in events for task in event._running]
+        for event in events:
+            event.cancel_pending()
+        await asyncio.gather(*running, return_exceptions=True)
+
     async def emit(self, event: str, *args: Any, **kwargs: Any) -> None:
         """Emit an event to all registered listeners"""
         if event in self._events:
@@ -11,6 +11,7 @@ EVENT_LIST = [
     "on_loading",  # Cargando datos/interfaz
     "on_logged_in",  # Login exitoso
     "on_unread_chat",  # Chat no leído detectado
+    "on_chat_update",  # Cambios en la lista de chats no leídos
     "on_message",  # Nuevo mensaje recibido
     "on_state_change",  # Cambio de estado del cliente
     "on_error",  # Error detectado
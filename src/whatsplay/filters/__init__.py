@@ -1,4 +1,21 @@
 from .message_filter import MessageFilter
-from .filters import Filter, CustomFilter
+from .filters import Filter, CustomFilter, AndFilter, OrFilter, NotFilter
+from .field_filters import ChatFilter, OutgoingFilter, SenderFilter, TextFilter, TypeFilter
+from .keyword_router import CommandRouter, KeywordFilter, KeywordMatcher
 
-__all__ = ["MessageFilter", "Filter", "CustomFilter"]
\ No newline at end of file
+__all__ = [
+    "MessageFilter",
+    "Filter",
+    "CustomFilter",
+    "AndFilter",
+    "OrFilter",
+    "NotFilter",
+    "SenderFilter",
+    "ChatFilter",
+    "TypeFilter",
+    "TextFilter",
+    "OutgoingFilter",
+    "KeywordMatcher",
+    "KeywordFilter",
+    "CommandRouter",
+]
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Built-in filters on message and chat fields.
+
+They accept both ``Message`` objects (``on_message``) and the chat
+dictionaries of ``on_unread_chat``. Compose them with ``&``, ``|`` and ``~``:
+
+    >>> from whatsplay.filters import ChatFilter, TextFilter, OutgoingFilter
+    >>> @client.event("on_message", ChatFilter("Soporte") & TextFilter(r"\\bayuda\\b") & ~OutgoingFilter())
+    ... async def on_help(message):
+    ...     ...
+"""
+
+import re
+from typing import Any, Hashable, Optional
+
+from .filters import Filter
+
+# Message classes -> type names used by TypeFilter
+MESSAGE_TYPE_NAMES = {"Message": "text", "FileMessage": "file", "VoiceMessage": "voice"}
+
+
+def _get(value: Any, name: str) -> Any:
+    """Read a field from a dict or an object."""
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+def _fold(text: Optional[str]) -> str:
+    return (text or "").strip().casefold()
+
+
+def field_sender(value: Any) -> str:
+    """Sender of a message, or the row title of a chat."""
+    return _get(value, "sender") if not isinstance(value, dict) else value.get("name") or ""
+
+
+def field_chat(value: Any) -> str:
+    """Chat of a message, or the group (else name) of a chat."""
+    if isinstance(value, dict):
+        return value.get("group") or value.get("name") or ""
+    return _get(value, "chat") or ""
+
+
+def field_text(value: Any) -> str:
+    """Text of a message, or the last message preview of a chat."""
+    if isinstance(value, dict):
+        return value.get("last_message") or ""
+    return _get(value, "text") or ""
+
+
+def field_type(value: Any) -> str:
+    """``text``/``file``/``voice`` for messages, ``last_message_type`` for chats."""
+    if isinstance(value, dict):
+        return value.get("last_message_type") or "text"
+    for cls in type(value).__mro__:
+        if cls.__name__ in MESSAGE_TYPE_NAMES:
+            return MESSAGE_TYPE_NAMES[cls.__name__]
+    return ""
+
+
+class _ValuesFilter(Filter):
+    """Passes when a field equals (case-insensitively) one of the values."""
+
+    _name = ""
+
+    def __init__(self, *values: str):
+        self.values = frozenset(_fold(v) for v in values)
+
+    @property
+    def key(self) -> Hashable:
+        return (self._name, self.values)
+
+    def _field(self, value: Any) -> str:
+        raise NotImplementedError
+
+    def test(self, value: Any) -> bool:
+        return _fold(self._field(value)) in self.values
+
+
+class SenderFilter(_ValuesFilter):
+    """Messages from any of the given senders."""
+
+    _name = "sender"
+
+    def _field(self, value: Any) -> str:
+        return field_sender(value)
+
+
+class ChatFilter(_ValuesFilter):
+    """Messages or chats from any of the given chats (groups by group name)."""
+
+    _name = "chat"
+
+    def _field(self, value: Any) -> str:
+        return field_chat(value)
+
+
+class TypeFilter(_ValuesFilter):
+    """Messages of the given types: ``"text"``, ``"file"``, ``"voice"`` (``"audio"`` for chats)."""
+
+    _name = "type"
+
+    def _field(self, value: Any) -> str:
+        return field_type(value)
+
+
+class TextFilter(Filter):
+    """Messages whose text matches a regular expression (``re.search``)."""
+
+    def __init__(self, pattern: str, flags: int = re.IGNORECASE):
+        self.pattern = re.compile(pattern, flags)
+
+    @property
+    def key(self) -> Hashable:
+        return ("text", self.pattern.pattern, self.pattern.flags)
+
+    def test(self, value: Any) -> bool:
+        return self.pattern.search(field_text(value)) is not None
+
+
+class OutgoingFilter(Filter):
+    """Messages sent by us (``outgoing=True``) or received (``outgoing=False``)."""
+
+    def __init__(self, outgoing: bool = True):
+        self.outgoing = outgoing
+
+    @property
+    def key(self) -> Hashable:
+        return ("outgoing", self.outgoing)
+
+    def test(self, value: Any) -> bool:
+        return bool(_get(value, "is_outgoing")) is self.outgoing
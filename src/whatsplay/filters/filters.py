@@ -1,8 +1,16 @@
 """
 Base classes for creating custom filters.
+
+Filters compose with ``&``, ``|`` and ``~``. Every filter has a structural
+``key``; while an event is emitted, results are memoized per ``(key, item)``
+in a cache shared by all listeners, so a sub-filter used by many handlers
+is evaluated once per item per emission.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Callable
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# (filter key, id(item)) -> result, for one emission
+FilterCache = Dict[Tuple[Hashable, int], bool]
 
 
 class Filter(ABC):
@@ -18,9 +26,52 @@ class Filter(ABC):
         """
         raise NotImplementedError
 
+    @property
+    def key(self) -> Hashable:
+        """
+        Structural identity of the filter.
+
+        Filters with equal keys give equal results, so their results are
+        shared within an emission. Override it in filters built from plain
+        values; the default (the instance itself) never shares.
+        """
+        return ("instance", id(self))
+
+    def evaluate(self, value: Any, cache: Optional[FilterCache] = None) -> bool:
+        """
+        Test a value, reusing results already computed in this emission.
+
+        Args:
+            value: Item to test
+            cache: Per-emission result cache (None disables memoization)
+
+        Returns:
+            True if the value passes the filter
+        """
+        if cache is None:
+            return self._evaluate(value, None)
+        slot = (self.key, id(value))
+        result = cache.get(slot)
+        if result is None:
+            result = cache[slot] = bool(self._evaluate(value, cache))
+        return result
+
+    def _evaluate(self, value: Any, cache: Optional[FilterCache]) -> bool:
+        """Compute the result; combinators pass the cache to their children."""
+        return self.test(value)
+
     def __call__(self, value: Any) -> bool:
         return self.test(value)
 
+    def __and__(self, other: "Filter") -> "Filter":
+        return AndFilter(self, other)
+
+    def __or__(self, other: "Filter") -> "Filter":
+        return OrFilter(self, other)
+
+    def __invert__(self) -> "Filter":
+        return NotFilter(self)
+
 
 class CustomFilter(Filter):
     """
@@ -30,5 +81,73 @@ class CustomFilter(Filter):
     def __init__(self, func: Callable[[Any], bool]):
         self.func = func
 
+    @property
+    def key(self) -> Hashable:
+        # The same function gives the same result
+        return ("custom", id(self.func))
+
     def test(self, value: Any) -> bool:
         return self.func(value)
+
+
+class _CompoundFilter(Filter):
+    """Base of ``AndFilter``/``OrFilter``: flattens and deduplicates children."""
+
+    _name = ""
+
+    def __init__(self, *filters: Filter):
+        children = []
+        seen = set()
+        for f in filters:
+            # (a & b) & c -> and(a, b, c)
+            for child in (f.filters if type(f) is type(self) else (f,)):
+                if child.key not in seen:
+                    seen.add(child.key)
+                    children.append(child)
+        self.filters = tuple(children)
+        self._key = (self._name, frozenset(seen))
+
+    @property
+    def key(self) -> Hashable:
+        return self._key
+
+    def test(self, value: Any) -> bool:
+        return self._evaluate(value, None)
+
+
+class AndFilter(_CompoundFilter):
+    """Passes when every child filter passes (short-circuits)."""
+
+    _name = "and"
+
+    def _evaluate(self, value: Any, cache: Optional[FilterCache]) -> bool:
+        return all(f.evaluate(value, cache) for f in self.filters)
+
+
+class OrFilter(_CompoundFilter):
+    """Passes when any child filter passes (short-circuits)."""
+
+    _name = "or"
+
+    def _evaluate(self, value: Any, cache: Optional[FilterCache]) -> bool:
+        return any(f.evaluate(value, cache) for f in self.filters)
+
+
+class NotFilter(Filter):
+    """Passes when the wrapped filter does not."""
+
+    def __init__(self, inner: Filter):
+        self.inner = inner
+
+    @property
+    def key(self) -> Hashable:
+        return ("not", self.inner.key)
+
+    def test(self, value: Any) -> bool:
+        return not self.inner.test(value)
+
+    def _evaluate(self, value: Any, cache: Optional[FilterCache]) -> bool:
+        return not self.inner.evaluate(value, cache)
+
+    def __invert__(self) -> Filter:
+        return self.inner
@@ -0,0 +1,316 @@
+"""
+Keyword and command routing for incoming messages.
+
+``KeywordMatcher`` compiles any number of trigger phrases into one
+Aho–Corasick automaton, so a message text is matched against all of them in
+a single pass, whatever the number of rules. ``KeywordFilter`` plugs a
+matcher into ``client.event(..., filter_obj=...)``, and ``CommandRouter``
+dispatches ``/commands`` and keyword triggers to their handlers:
+
+    >>> router = CommandRouter()
+    >>> @router.command("precio")
+    ... async def price(message, args): ...
+    >>> @router.keyword("horario", "a qué hora abren")
+    ... async def hours(message, keyword): ...
+    >>> router.attach(client)
+"""
+
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from .field_filters import field_text
+from .filters import CustomFilter, Filter
+
+# (start, end, keyword, value)
+Match = Tuple[int, int, str, Any]
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern matcher (Aho–Corasick automaton).
+
+    Attributes:
+        case_sensitive: Match case exactly
+        whole_words: Only match keywords delimited by non-alphanumeric characters
+    """
+
+    def __init__(self, keywords: Iterable[str] = (), case_sensitive: bool = False, whole_words: bool = True) -> None:
+        """
+        Initialize the matcher.
+
+        Args:
+            keywords: Initial keywords
+            case_sensitive: Match case exactly
+            whole_words: Only match whole words/phrases
+        """
+        self.case_sensitive = case_sensitive
+        self.whole_words = whole_words
+        # Node i: transitions, failure link, keywords ending exactly there
+        # [(keyword, value, length)] and outputs (those plus the ones reached
+        # through failure links, recomputed by ``_build``)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._own: List[List[Tuple[str, Any, int]]] = [[]]
+        self._out: List[List[Tuple[str, Any, int]]] = [[]]
+        self._built = True
+        self._count = 0
+        for keyword in keywords:
+            self.add(keyword)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _norm(self, text: str) -> str:
+        return text if self.case_sensitive else text.casefold()
+
+    def _fold(self, text: str) -> Tuple[str, Sequence[int]]:
+        """
+        Normalize a text keeping, for each normalized character, the index
+        of the original character it came from (``casefold`` can expand
+        one character into several, e.g. "ß" -> "ss").
+        """
+        if self.case_sensitive:
+            return text, range(len(text))
+        chars: List[str] = []
+        origin: List[int] = []
+        for i, char in enumerate(text):
+            folded = char.casefold()
+            chars.append(folded)
+            origin.extend([i] * len(folded))
+        return "".join(chars), origin
+
+    def add(self, keyword: str, value: Any = None) -> None:
+        """
+        Add a keyword.
+
+        Args:
+            keyword: Word or phrase to match
+            value: Payload returned with its matches (default: the keyword)
+        """
+        keyword = keyword.strip()
+        if not keyword:
+            return
+        norm = self._norm(keyword)
+        node = 0
+        for char in norm:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+                self._out.append([])
+            node = nxt
+        self._own[node].append((keyword, keyword if value is None else value, len(norm)))
+        self._count += 1
+        self._built = False
+
+    def _build(self) -> None:
+        """Compute failure links and outputs breadth-first."""
+        self._out = [list(own) for own in self._own]
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0) if node else 0
+                # Keywords ending at the failure state end here too
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+
+    def _is_boundary(self, text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not before.isalnum() and not after.isalnum()
+
+    def find_all(self, text: str) -> List[Match]:
+        """
+        Find every keyword occurrence in one pass over the text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            ``(start, end, keyword, value)`` tuples, ordered by end position
+            (offsets refer to ``text``)
+        """
+        if not self._built:
+            self._build()
+        text = text or ""
+        norm, origin = self._fold(text)
+        matches: List[Match] = []
+        node = 0
+        for i, char in enumerate(norm):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for keyword, value, length in self._out[node]:
+                start, end = origin[i + 1 - length], origin[i] + 1
+                if not self.whole_words or self._is_boundary(text, start, end):
+                    matches.append((start, end, keyword, value))
+        return matches
+
+    def search(self, text: str) -> Optional[Match]:
+        """Return the first match ending earliest in the text, or None."""
+        matches = self.find_all(text)
+        return matches[0] if matches else None
+
+    def matches(self, text: str) -> bool:
+        """True if any keyword occurs in the text."""
+        return self.search(text) is not None
+
+
+class KeywordFilter(Filter):
+    """
+    Passes messages (or chats) whose text contains any of the keywords.
+
+    Example:
+        >>> @client.event("on_message", KeywordFilter("precio", "cuánto sale"))
+        ... async def on_price(message): ...
+    """
+
+    def __init__(self, *keywords: str, case_sensitive: bool = False, whole_words: bool = True):
+        self.matcher = KeywordMatcher(keywords, case_sensitive, whole_words)
+        self._key = (
+            "keywords",
+            frozenset(k if case_sensitive else k.casefold() for k in keywords),
+            case_sensitive,
+            whole_words,
+        )
+
+    @property
+    def key(self) -> Hashable:
+        return self._key
+
+    def test(self, value: Any) -> bool:
+        return self.matcher.matches(field_text(value))
+
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+class CommandRouter:
+    """
+    Routes messages to command and keyword handlers.
+
+    A command is the first word of the text, after ``prefix`` (``/precio
+    pizza`` calls the ``precio`` handler with ``"pizza"``). Keyword handlers
+    are called with the first keyword of theirs found in the text; all
+    keyword triggers share one ``KeywordMatcher``. Each handler runs at most
+    once per message.
+
+    Attributes:
+        prefix: Command prefix
+        matcher: Automaton with every keyword trigger
+    """
+
+    def __init__(self, prefix: str = "/", case_sensitive: bool = False) -> None:
+        """
+        Initialize the router.
+
+        Args:
+            prefix: Command prefix
+            case_sensitive: Match commands and keywords case-sensitively
+        """
+        self.prefix = prefix
+        self.case_sensitive = case_sensitive
+        self.matcher = KeywordMatcher(case_sensitive=case_sensitive)
+        self._commands: Dict[str, Handler] = {}
+
+    def _norm(self, text: str) -> str:
+        return text if self.case_sensitive else text.casefold()
+
+    def command(self, *names: str) -> Callable[[Handler], Handler]:
+        """Register a handler ``(message, args)`` for one or more commands."""
+
+        def decorator(func: Handler) -> Handler:
+            for name in names:
+                self._commands[self._norm(name.lstrip(self.prefix))] = func
+            return func
+
+        return decorator
+
+    def keyword(self, *keywords: str) -> Callable[[Handler], Handler]:
+        """Register a handler ``(message, keyword)`` for one or more keywords."""
+
+        def decorator(func: Handler) -> Handler:
+            for keyword in keywords:
+                self.matcher.add(keyword, func)
+            return func
+
+        return decorator
+
+    def parse_command(self, text: str) -> Optional[Tuple[str, str]]:
+        """
+        Split a command message into ``(command, args)``.
+
+        Returns:
+            The registered command and the rest of the text, or None
+        """
+        text = (text or "").lstrip()
+        if not self.prefix or not text.startswith(self.prefix):
+            return None
+        name, _, args = text[len(self.prefix):].partition(" ")
+        name = self._norm(name)
+        return (name, args.strip()) if name in self._commands else None
+
+    def routes(self, text: str) -> List[Tuple[Handler, Tuple[Any, ...]]]:
+        """
+        Resolve the handlers a text triggers, in one pass over it.
+
+        Args:
+            text: Message text
+
+        Returns:
+            ``(handler, extra_args)`` pairs; a command excludes keyword handlers
+        """
+        parsed = self.parse_command(text)
+        if parsed:
+            name, args = parsed
+            return [(self._commands[name], (args,))]
+        routes = []
+        seen = set()
+        for _, _, keyword, handler in self.matcher.find_all(text):
+            if id(handler) not in seen:
+                seen.add(id(handler))
+                routes.append((handler, (keyword,)))
+        return routes
+
+    async def dispatch(self, message: Any) -> int:
+        """
+        Call the handlers a message triggers.
+
+        Args:
+            message: Incoming message
+
+        Returns:
+            Number of handlers called
+        """
+        routes = self.routes(field_text(message))
+        for handler, extra in routes:
+            await handler(message, *extra)
+        return len(routes)
+
+    @property
+    def filter(self) -> Filter:
+        """Filter passing only messages that trigger some handler."""
+        return CustomFilter(lambda message: bool(self.routes(field_text(message))))
+
+    def attach(self, client: Any, event: str = "on_message", filter_obj: Optional[Filter] = None) -> None:
+        """
+        Dispatch an event's messages through the router.
+
+        Args:
+            client: Client (or any ``EventHandler``)
+            event: Event carrying messages
+            filter_obj: Extra filter applied before routing (e.g. ``~OutgoingFilter()``)
+        """
+
+        async def _route(message: Any) -> None:
+            await self.dispatch(message)
+
+        client.event(event, filter_obj)(_route)
@@ -0,0 +1,197 @@
+"""
+Inbound message pipeline.
+
+Turns unread chat-list diffs into ``on_message`` events: every chat that
+gained unread messages is opened, only its new messages are extracted
+(incremental ``collect_messages`` against the pipeline's own watermarks, so
+collects made by event handlers do not hide them), and each incoming
+message is emitted once, deduplicated by ``msg_id``.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from .chat_list import CHAT_READ, _unread_count
+from .scheduler import PRIORITY_SCRAPE
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_SEEN_CACHE_SIZE = 5000
+
+
+class SeenCache:
+    """
+    Bounded set of message ids, evicting the oldest ids first.
+
+    Attributes:
+        maxsize: Maximum number of ids remembered
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_SEEN_CACHE_SIZE) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of ids remembered
+        """
+        self.maxsize = maxsize
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, msg_id: str) -> bool:
+        return msg_id in self._ids
+
+    def add(self, msg_id: str) -> bool:
+        """
+        Remember a message id.
+
+        Args:
+            msg_id: Message id to remember
+
+        Returns:
+            True if the id was new, False if it was already seen
+        """
+        if msg_id in self._ids:
+            self._ids.move_to_end(msg_id)
+            return False
+        self._ids[msg_id] = None
+        while len(self._ids) > self.maxsize:
+            self._ids.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        """Forget every id."""
+        self._ids.clear()
+
+
+class MessagePipeline:
+    """
+    Emits ``on_message`` for every new incoming message.
+
+    It is fed the chat-list diffs of each sweep and only runs while the
+    client has ``on_message`` listeners.
+
+    Attributes:
+        client: Client used to open chats and emit events
+        seen: Ids of messages already emitted
+        watermarks: Chat -> ``msg_id`` of the last message the pipeline
+            (or the chat watcher) collected, separate from the watermarks of
+            user ``collect_messages`` calls
+    """
+
+    def __init__(self, client: "Client", seen_size: int = DEFAULT_SEEN_CACHE_SIZE) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            client: Client used to open chats and emit events
+            seen_size: Maximum number of message ids remembered
+        """
+        self.client = client
+        self.seen = SeenCache(seen_size)
+        self.watermarks: Dict[str, str] = {}
+        self._pending: List[Any] = []
+
+    @property
+    def enabled(self) -> bool:
+        """True while someone listens to ``on_message``."""
+        return self.client.has_listeners("on_message")
+
+    def _watched_chat(self):
+        """Chat streamed by the client's ChatWatcher, if any."""
+        watcher = getattr(self.client, "chat_watcher", None)
+        return watcher.chat if watcher else None
+
+    @staticmethod
+    def _chat_name(chat: Dict[str, Any]) -> str:
+        """Name used to open a chat from the sidebar."""
+        return chat.get("group") or chat.get("name") or ""
+
+    def offer(self, messages: List[Any]) -> None:
+        """
+        Queue messages collected elsewhere, to be emitted on the next ``process``.
+
+        Args:
+            messages: Collected messages (outgoing and seen ones are dropped)
+        """
+        self._pending.extend(
+            m for m in messages
+            if not m.is_outgoing and m.msg_id and self.seen.add(m.msg_id)
+        )
+
+    async def process(self, diffs: List[Dict[str, Any]]) -> None:
+        """
+        Fetch and emit the new messages of every chat in the diffs.
+
+        Args:
+            diffs: Diffs returned by ``ChatListModel.update``
+        """
+        if not self.enabled:
+            self._pending.clear()
+            return
+
+        pending, self._pending = self._pending, []
+        for msg in pending:
+            await self.client.emit("on_message", msg)
+
+        for diff in diffs:
+            if diff["type"] == CHAT_READ:
+                continue
+            name = self._chat_name(diff["chat"])
+            if not name or name == self._watched_chat():
+                continue
+            try:
+                messages = await self._fetch(name, diff["chat"])
+            except Exception as e:
+                await self.client.emit("on_error", f"Error fetching messages from {name}: {e}")
+                continue
+            for msg in messages:
+                await self.client.emit("on_message", msg)
+
+    async def _fetch(self, name: str, chat: Dict[str, Any]) -> List[Any]:
+        """
+        Open a chat and return its new, unseen incoming messages.
+
+        The first time a chat is seen, only its last ``unread_count``
+        messages are considered new.
+
+        Args:
+            name: Chat to open
+            chat: Chat dictionary from the sweep
+
+        Returns:
+            Messages to emit, oldest first (followed by any the watched
+            chat missed meanwhile)
+        """
+        chat_manager = self.client.chat_manager
+        first_time = name not in self.watermarks
+
+        missed: List[Any] = []
+        async with self.client.scheduler.slot(PRIORITY_SCRAPE, "on_message"):
+            if not await chat_manager.open(name):
+                logger.debug("message pipeline: could not open %s", name)
+                return []
+            try:
+                messages = await chat_manager.collect_messages(
+                    incremental=True, chat=name, watermarks=self.watermarks
+                )
+            finally:
+                # Go back to the watched chat (otherwise the sweep closes it)
+                missed = await chat_manager._leave_chat()
+
+        if first_time:
+            messages = messages[-max(_unread_count(chat), 1):]
+
+        fresh = [
+            m for m in messages
+            if not m.is_outgoing and m.msg_id and self.seen.add(m.msg_id)
+        ]
+        # Messages the watched chat received while it was not open
+        return fresh + missed
@@ -0,0 +1,403 @@
+"""
+Latency histograms and counters for client operations.
+
+``MetricsRegistry`` records how long each page operation takes (opening a
+chat, sending, collecting, sweeping, reading the state, downloading), how
+long it waited for the page, and how many errors and reconnects happened.
+Read it from Python with ``snapshot()``/``quantile()``, or serve it in the
+Prometheus text format with ``MetricsServer``:
+
+    >>> server = await client.serve_metrics(port=9464)
+    >>> # curl http://127.0.0.1:9464/metrics
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "whatsplay_"
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 9464
+METRICS_PATH = "/metrics"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Metric names
+OPERATION_SECONDS = "operation_duration_seconds"
+OPERATIONS_TOTAL = "operations_total"
+PAGE_WAIT_SECONDS = "page_wait_seconds"
+ERRORS_TOTAL = "errors_total"
+RECONNECTS_TOTAL = "reconnects_total"
+
+# Outcomes of a timed operation
+OUTCOME_OK = "ok"
+OUTCOME_FAILED = "failed"
+OUTCOME_ERROR = "error"
+
+METRIC_HELP = {
+    OPERATION_SECONDS: "Duration of client operations",
+    OPERATIONS_TOTAL: "Client operations by outcome",
+    PAGE_WAIT_SECONDS: "Time operations waited for the page, by priority",
+    ERRORS_TOTAL: "on_error events emitted",
+    RECONNECTS_TOTAL: "Browser reconnections",
+}
+
+# Outermost timed operation running in the current task
+_OPERATION: ContextVar[Optional[str]] = ContextVar("whatsplay_operation", default=None)
+
+# Sorted (label, value) pairs
+Labels = Tuple[Tuple[str, str], ...]
+# (name, labels, value) gauge samples produced by a collector
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def current_operation() -> Optional[str]:
+    """Name of the timed operation the current task is running, if any."""
+    return _OPERATION.get()
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = (
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """
+    Distribution of observed durations.
+
+    Attributes:
+        buckets: Bucket upper bounds, in seconds
+        counts: Observations per bucket (not cumulative)
+        count: Total observations
+        sum: Sum of observations
+        max: Largest observation
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by interpolating inside its bucket.
+
+        Args:
+            q: Quantile between 0 and 1 (0.95 for p95)
+
+        Returns:
+            Estimated value in seconds (0.0 without observations)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.max
+            if n and seen + n >= rank:
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+            lower = upper
+        return self.max
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """``(upper bound, observations <= bound)`` pairs, ending with +Inf."""
+        pairs = []
+        total = 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            total += n
+            pairs.append((bound, total))
+        return pairs
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms, keyed by name and labels.
+
+    Example:
+        >>> with client.metrics.time("operation_duration_seconds", operation="custom"):
+        ...     await do_something()
+        >>> client.metrics.quantile("operation_duration_seconds", 0.95, operation="send_message")
+
+    Attributes:
+        buckets: Bucket bounds of new histograms
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize an empty registry.
+
+        Args:
+            buckets: Bucket upper bounds of new histograms, in seconds
+        """
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Add ``value`` to a counter."""
+        series = self._counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """Record a duration in a histogram."""
+        series = self._histograms.setdefault(name, {})
+        key = _labels(labels)
+        if key not in series:
+            series[key] = Histogram(self.buckets)
+        series[key].observe(seconds)
+
+    @contextmanager
+    def time(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the duration of a ``with`` block (also when it raises)."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - start, **labels)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        return self._counters.get(name, {}).get(_labels(labels), 0.0)
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        """Histogram of a name and labels, or None if nothing was observed."""
+        return self._histograms.get(name, {}).get(_labels(labels))
+
+    def quantile(self, name: str, q: float, **labels: Any) -> float:
+        """Estimated quantile of a histogram, in seconds (0.0 if empty)."""
+        histogram = self.histogram(name, **labels)
+        return histogram.quantile(q) if histogram else 0.0
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """
+        Add a source of gauges read at export time.
+
+        Args:
+            collector: Callable returning ``(name, labels, value)`` samples
+        """
+        self._collectors.append(collector)
+
+    def _collect(self) -> Dict[str, Dict[Labels, float]]:
+        gauges: Dict[str, Dict[Labels, float]] = {}
+        for collector in self._collectors:
+            try:
+                for name, labels, value in collector():
+                    gauges.setdefault(name, {})[_labels(labels)] = value
+            except Exception as e:
+                logger.warning("metrics: collector failed: %s", e)
+        return gauges
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current values of every metric.
+
+        Returns:
+            ``{"counters", "histograms", "gauges"}``; each maps a name to a
+            list of series with their ``labels``. Histogram series carry
+            count, sum, avg, max, p50, p95 and p99 in seconds.
+        """
+        return {
+            "counters": {
+                name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                for name, series in self._counters.items()
+            },
+            "histograms": {
+                name: [
+                    {
+                        "labels": dict(k),
+                        "count": h.count,
+                        "sum": h.sum,
+                        "avg": h.sum / h.count if h.count else 0.0,
+                        "max": h.max,
+                        "p50": h.quantile(0.5),
+                        "p95": h.quantile(0.95),
+                        "p99": h.quantile(0.99),
+                    }
+                    for k, h in series.items()
+                ]
+                for name, series in self._histograms.items()
+            },
+            "gauges": {
+                name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                for name, series in self._collect().items()
+            },
+        }
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str) -> str:
+            full = METRIC_PREFIX + name
+            if name in METRIC_HELP:
+                lines.append(f"# HELP {full} {METRIC_HELP[name]}")
+            lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        for name, series in sorted(self._counters.items()):
+            full = header(name, "counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{full}{_format_labels(labels)} {_format_value(value)}")
+
+        for name, series in sorted(self._histograms.items()):
+            full = header(name, "histogram")
+            for labels, h in sorted(series.items()):
+                for bound, total in h.cumulative():
+                    bucket_labels = labels + (("le", _format_value(bound)),)
+                    lines.append(f"{full}_bucket{_format_labels(bucket_labels)} {total}")
+                lines.append(f"{full}_sum{_format_labels(labels)} {_format_value(h.sum)}")
+                lines.append(f"{full}_count{_format_labels(labels)} {h.count}")
+
+        for name, series in sorted(self._collect().items()):
+            full = header(name, "gauge")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{full}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Forget every counter and histogram (collectors are kept)."""
+        self._counters.clear()
+        self._histograms.clear()
+
+
+def timed(operation: str) -> Callable:
+    """
+    Time an async method of a manager that holds ``self.client``.
+
+    Records the call in ``operation_duration_seconds`` and counts it in
+    ``operations_total`` as ``ok``, ``failed`` (returned False or None) or
+    ``error`` (raised), unless the client has no ``metrics``. While it runs,
+    ``current_operation()`` returns the name of the outermost timed call
+    (``send_message`` rather than the ``open`` it performs).
+
+    Args:
+        operation: Value of the ``operation`` label
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            token = _OPERATION.set(operation) if _OPERATION.get() is None else None
+            metrics = getattr(getattr(self, "client", None), "metrics", None)
+            outcome = OUTCOME_ERROR
+            start = time.monotonic()
+            try:
+                result = await func(self, *args, **kwargs)
+                outcome = OUTCOME_FAILED if result is False or result is None else OUTCOME_OK
+                return result
+            finally:
+                if token is not None:
+                    _OPERATION.reset(token)
+                if isinstance(metrics, MetricsRegistry):
+                    metrics.observe(OPERATION_SECONDS, time.monotonic() - start, operation=operation)
+                    metrics.inc(OPERATIONS_TOTAL, operation=operation, outcome=outcome)
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsServer:
+    """
+    Minimal HTTP server exposing a registry at ``/metrics``.
+
+    Attributes:
+        registry: Registry to export
+        host: Interface to bind
+        port: Port to bind (the bound port once started, if 0 was given)
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        host: str = DEFAULT_METRICS_HOST,
+        port: int = DEFAULT_METRICS_PORT,
+    ) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{METRICS_PATH}"
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("metrics: serving on %s", self.url)
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readline()
+            # Skip the headers
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request.decode("latin-1").split()
+            path = parts[1].split("?")[0] if len(parts) > 1 else ""
+            if parts and parts[0] == "GET" and path in (METRICS_PATH, "/"):
+                status, body = "200 OK", self.registry.render_prometheus().encode("utf-8")
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {PROMETHEUS_CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug("metrics: request failed: %s", e)
+        finally:
+            writer.close()
@@ -5,25 +5,102 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
 from playwright.async_api import Page, ElementHandle, Download
-import asyncio
 
 logger = logging.getLogger(__name__)
 
 from ..codec_detector import detect_codec
+from ..constants import locator as loc
+from ..waits import timed_wait
+
+# Bounds of the UI waits used by message actions (ms)
+REACTION_BAR_TIMEOUT = 2000
+VOICE_DOWNLOAD_ICON_TIMEOUT = 5000
+CONTEXT_MENU_TIMEOUT = 2000
 
 
 def parse_timestamp(raw: str) -> Optional[datetime]:
-    """Extract ``[HH:MM(:SS)?]`` from a ``data-pre-plain-text`` attribute value.
+    """Extract ``[HH:MM(:SS)?(, D/M/YYYY)?]`` from a ``data-pre-plain-text`` value.
 
-    Returns a ``datetime`` with today's date and the parsed time,
-    or ``None`` if the format does not match.
+    WhatsApp writes the date after the time (day first, or month first in
+    US locales, detected when the day cannot be a month). Without a date,
+    or with an invalid one, today's date is used.
+    Returns ``None`` if the format does not match.
     """
-    m = re.match(r"\[(\d{1,2}:\d{2}(?::\d{2})?)\]", raw)
+    m = re.match(
+        r"\[(\d{1,2}:\d{2}(?::\d{2})?)(?:,\s*(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4}))?\]", raw
+    )
     if not m:
         return None
     hh, mm = m.group(1).split(":")[:2]
     now = datetime.now()
-    return now.replace(hour=int(hh), minute=int(mm), second=0, microsecond=0)
+    stamp = now.replace(hour=int(hh), minute=int(mm), second=0, microsecond=0)
+    if m.group(2):
+        day, month, year = (int(g) for g in m.group(2, 3, 4))
+        if month > 12:
+            day, month = month, day
+        try:
+            stamp = stamp.replace(year=year + 2000 if year < 100 else year, month=month, day=day)
+        except ValueError:
+            pass
+    return stamp
+
+
+# Extracts everything Message/FileMessage/VoiceMessage.from_element read from
+# a ``conv-msg-*`` container, as plain JSON, in a single in-page call.
+MESSAGE_NODE_JS = """
+(el) => {
+    const pre = el.querySelector('[data-pre-plain-text]');
+    let senderLabel = '';
+    for (const span of el.querySelectorAll('span[aria-label]')) {
+        const label = span.getAttribute('aria-label') || '';
+        if (label.endsWith(':')) { senderLabel = label; break; }
+    }
+    const selectable = el.querySelector('[data-testid="selectable-text"]');
+
+    let fileTitle = '';
+    const icon = el.querySelector('span[data-icon="audio-download"]');
+    for (let cur = icon; cur; cur = cur.parentElement) {
+        if (cur.title && cur.title.startsWith('Download')) { fileTitle = cur.title; break; }
+    }
+
+    const hasVoiceIcon = Array.from(el.querySelectorAll('svg')).some((svg) => {
+        const title = svg.querySelector('title');
+        return !!title && title.textContent.includes('ic-keyboard-voice');
+    });
+
+    let duration = null;
+    const audio = el.querySelector('audio');
+    if (audio && typeof audio.duration === 'number' && !isNaN(audio.duration) && audio.duration >= 0) {
+        duration = audio.duration;
+    } else {
+        const slider = el.querySelector('[role="slider"][aria-valuetext]');
+        const parts = slider ? (slider.getAttribute('aria-valuetext') || '').split('/') : [];
+        if (parts.length >= 2) {
+            const m = parts[parts.length - 1].trim().match(/^(\\d{1,2}):(\\d{2})$/);
+            if (m) duration = parseInt(m[1], 10) * 60 + parseInt(m[2], 10);
+        }
+    }
+
+    return {
+        id: el.getAttribute('data-id') || '',
+        testid: el.getAttribute('data-testid') || '',
+        pre_plain_text: pre ? pre.getAttribute('data-pre-plain-text') || '' : '',
+        sender_label: senderLabel,
+        text: selectable ? selectable.innerText || '' : '',
+        has_download_icon: !!icon,
+        file_title: fileTitle,
+        is_quoted: !!el.querySelector('[aria-label="Mensaje citado"]'),
+        has_voice_button: !!el.querySelector('button[aria-label*="voz"], button[aria-label*="voice" i]'),
+        has_voice_container: !!el.querySelector('span[aria-label*="voz"], span[aria-label*="voice" i]'),
+        has_voice_icon: hasVoiceIcon,
+        duration,
+    };
+}
+"""
+
+MESSAGE_LIST_JS = (
+    "(sel) => Array.from(document.querySelectorAll(sel)).map(%s)" % MESSAGE_NODE_JS.strip()
+)
 
 
 def _format_duration(seconds: object) -> str:
@@ -42,6 +119,35 @@ def _format_duration(seconds: object) -> str:
     return f"{minutes:02d}:{secs:02d}"
 
 
+def _parse_sender(raw_pre: str, raw_label: str = "") -> str:
+    """Sender from ``data-pre-plain-text`` or, as fallback, the sender aria-label."""
+    sender = ""
+    if raw_pre and "] " in raw_pre:
+        sender = raw_pre.split("] ", 1)[1].rstrip(": ").strip()
+    if not sender and raw_label:
+        sender = raw_label.rstrip(":").strip()
+    return sender
+
+
+def _parse_text(raw_inner: str, sender: str) -> str:
+    """Message text from ``selectable-text``, dropping a leading sender line."""
+    if not raw_inner:
+        return ""
+    lineas = raw_inner.split("\n")
+    if len(lineas) > 1 and (lineas[0].strip().startswith(sender) or ":" in lineas[0]):
+        return "\n".join(lineas[1:]).strip()
+    return raw_inner.strip()
+
+
+def _parse_filename(raw_title: str) -> str:
+    """Filename from a ``Download "name"`` title attribute."""
+    if raw_title and '"' in raw_title:
+        parts = raw_title.split('"')
+        if len(parts) >= 2:
+            return parts[1].strip()
+    return ""
+
+
 class Message:
     """
     Represents a WhatsApp message.
@@ -49,23 +155,33 @@ class Message:
     This object encapsulates all data related to a single message in a chat,
     including its content, sender, timestamp, and interactivity methods.
 
+    Messages are detached from the DOM: they do not hold ElementHandles.
+    Actions such as ``react`` or ``download`` look the container up again by
+    ``msg_id`` (the ``data-id`` attribute) when they are called.
+
+    Constructor arguments after ``text`` are keyword-only. The old
+    ``container`` argument was removed, so calls written for the old
+    signature fail with a TypeError instead of silently shifting values.
+
     Attributes:
         page (Page): The Playwright Page object.
         sender (str): The name or phone number of the sender.
         timestamp (datetime): The time the message was received.
         text (str): The text content of the message.
-        container (ElementHandle): The DOM element containing the message.
         is_outgoing (bool): True if the message was sent by the user, False otherwise.
         msg_id (str): The unique identifier of the message.
+        chat (str): The chat the message was collected from ("" if unknown).
     """
 
+    __slots__ = ("page", "sender", "timestamp", "text", "is_outgoing", "msg_id", "chat")
+
     def __init__(
         self,
         page: Page,
         sender: str,
         timestamp: datetime,
         text: str,
-        container: ElementHandle,
+        *,
         is_outgoing: bool = False,
         msg_id: str = "",
     ):
@@ -73,9 +189,32 @@ class Message:
         self.sender = sender
         self.timestamp = timestamp
         self.text = text
-        self.container = container
         self.is_outgoing = is_outgoing
         self.msg_id = msg_id
+        self.chat = ""
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(msg_id={self.msg_id!r}, sender={self.sender!r}, "
+            f"text={self.text[:30]!r})"
+        )
+
+    async def get_container(self) -> Optional[ElementHandle]:
+        """
+        Look up this message's container in the page by ``msg_id``.
+
+        The caller owns the returned handle and should ``dispose()`` it.
+
+        Returns:
+            The container ElementHandle, or None if the message has no id or
+            is not rendered.
+        """
+        if not self.msg_id:
+            return None
+        msg_id = self.msg_id.replace("\\", "\\\\").replace('"', '\\"')
+        return await self.page.query_selector(
+            f'{loc.MESSAGE_CONTAINER}[data-id="{msg_id}"]'
+        )
 
     @classmethod
     async def from_element(cls, elem: ElementHandle, page: Page) -> Optional["Message"]:
@@ -103,8 +242,7 @@ class Message:
                 raw = await pre_plain.get_attribute("data-pre-plain-text")
                 if raw:
                     # Sender (después del "] ")
-                    if "] " in raw:
-                        sender = raw.split("] ", 1)[1].rstrip(": ").strip()
+                    sender = _parse_sender(raw)
                     # Timestamp (desde el bracket)
                     parsed_ts = parse_timestamp(raw)
                     if parsed_ts:
@@ -117,7 +255,7 @@ class Message:
                 if remitente_span:
                     raw_label = await remitente_span.get_attribute("aria-label")
                     if raw_label:
-                        sender = raw_label.rstrip(":").strip()
+                        sender = _parse_sender("", raw_label)
 
             # Direction (in/out): WhatsApp Web ya no usa conv-msg-right/left.
             # "Tú" es el sender de mensajes salientes en español.
@@ -130,21 +268,13 @@ class Message:
             )
             if selectable:
                 raw_inner = await selectable.inner_text()
-                if raw_inner:
-                    lineas = raw_inner.split("\n")
-                    if len(lineas) > 1 and (
-                        lineas[0].strip().startswith(sender) or ":" in lineas[0]
-                    ):
-                        texto = "\n".join(lineas[1:]).strip()
-                    else:
-                        texto = raw_inner.strip()
+                texto = _parse_text(raw_inner, sender)
 
             return cls(
                 page=page,
                 sender=sender,
                 timestamp=timestamp,
                 text=texto,
-                container=elem,
                 is_outgoing=is_outgoing,
                 msg_id=msg_id,
             )
@@ -152,6 +282,34 @@ class Message:
             logger.debug("Message.from_element EXCEPTION for %s: %s: %s", testid, type(ex).__name__, ex)
             return None
 
+    @classmethod
+    def _fields_from_data(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Base message fields from a ``MESSAGE_NODE_JS`` result."""
+        raw_pre = data.get("pre_plain_text") or ""
+        sender = _parse_sender(raw_pre, data.get("sender_label") or "")
+        testid = data.get("testid") or ""
+        return {
+            "sender": sender,
+            "timestamp": parse_timestamp(raw_pre) or datetime.now(),
+            "text": _parse_text(data.get("text") or "", sender),
+            "is_outgoing": (sender == "Tú") or (not sender and testid.startswith("conv-msg-AC")),
+            "msg_id": data.get("id") or "",
+        }
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], page: Page) -> "Message":
+        """
+        Create a Message from the JSON returned by ``MESSAGE_NODE_JS``.
+
+        Args:
+            data: Extracted message data.
+            page: The Playwright page.
+
+        Returns:
+            A new Message instance.
+        """
+        return cls(page=page, **cls._fields_from_data(data))
+
     async def react(self, emoji: str):
         """
         Reacts to this message with the given emoji.
@@ -163,19 +321,22 @@ class Message:
             emoji (str): The emoji character to react with (e.g., "👍", "❤️").
         """
 
+        container = None
         try:
-            # 1. Hover over the message to make the action bar appear.
-            await self.container.hover()
+            container = await self.get_container()
+            if not container:
+                return None
 
-            # Take screenshot after hover
-            # await self.container.screenshot(path="after_hover.png")
-            # print("self.container: ", self.container)
-            await asyncio.sleep(0.5)
-            # input("presiona enter para continuar")
+            # 1. Hover over the message to make the action bar appear.
+            await container.hover()
 
             # 2. Find reaction button
             reaction_bar = self.page.locator('[aria-label="Reaccionar"]')
-            if not reaction_bar:
+            if not await timed_wait(
+                reaction_bar.first.wait_for(state="visible", timeout=REACTION_BAR_TIMEOUT),
+                "react.action_bar",
+                replaces=0.5,
+            ):
                 # print("Error: No se encontró el botón '[aria-label="Reaccionar"]'.")
                 return None
             await reaction_bar.click()
@@ -201,6 +362,9 @@ class Message:
 
         except Exception as e:
             print(f"An error occurred while reacting to message {self.msg_id}: {e}")
+        finally:
+            if container:
+                await container.dispose()
 
 
 class FileMessage(Message):
@@ -212,22 +376,23 @@ class FileMessage(Message):
 
     Attributes:
         filename (str): The name of the file (e.g., "document.pdf").
-        download_icon (ElementHandle): The DOM element for the download button.
     """
 
+    __slots__ = ("filename",)
+
     def __init__(
         self,
         page: Page,
         sender: str,
         timestamp: datetime,
         text: str,
-        container: ElementHandle,
+        *,
         filename: str,
-        download_icon: ElementHandle,
+        is_outgoing: bool = False,
+        msg_id: str = "",
     ):
-        super().__init__(page, sender, timestamp, text, container)
+        super().__init__(page, sender, timestamp, text, is_outgoing=is_outgoing, msg_id=msg_id)
         self.filename = filename
-        self.download_icon = download_icon
 
     @classmethod
     async def from_element(
@@ -272,10 +437,7 @@ class FileMessage(Message):
                 title_elem: ElementHandle = title_handle.as_element()
                 if title_elem:
                     raw_title = await title_elem.get_attribute("title")
-                    if raw_title and '"' in raw_title:
-                        parts = raw_title.split('"')
-                        if len(parts) >= 2:
-                            filename = parts[1].strip()
+                    filename = _parse_filename(raw_title or "")
 
             if not filename:
                 return None
@@ -290,14 +452,43 @@ class FileMessage(Message):
                 sender=base_msg.sender,
                 timestamp=base_msg.timestamp,
                 text=base_msg.text,
-                container=elem,
                 filename=filename,
-                download_icon=icon,
+                is_outgoing=base_msg.is_outgoing,
+                msg_id=base_msg.msg_id,
             )
 
         except Exception:
             return None
 
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], page: Page) -> Optional["FileMessage"]:
+        """
+        Create a FileMessage from the JSON returned by ``MESSAGE_NODE_JS``.
+
+        Args:
+            data: Extracted message data.
+            page: The Playwright page.
+
+        Returns:
+            A new FileMessage instance or None if not a valid file message.
+        """
+        if not data.get("has_download_icon"):
+            return None
+        filename = _parse_filename(data.get("file_title") or "")
+        if not filename:
+            return None
+
+        fields = cls._fields_from_data(data)
+        return cls(
+            page=page,
+            sender=fields["sender"],
+            timestamp=fields["timestamp"],
+            text=fields["text"],
+            filename=filename,
+            is_outgoing=fields["is_outgoing"],
+            msg_id=fields["msg_id"],
+        )
+
     async def download(self, page: Page, downloads_dir: Path) -> Optional[Path]:
         """
         Download the attached file.
@@ -311,13 +502,20 @@ class FileMessage(Message):
         Returns:
             The Path to the saved file, or None if the download failed.
         """
+        container = None
         try:
             # 1) Create directory
             downloads_dir.mkdir(parents=True, exist_ok=True)
 
             # 2) Wait for download
+            container = await self.get_container()
+            if not container:
+                return None
+            icon = await container.query_selector('span[data-icon="audio-download"]')
+            if not icon:
+                return None
             async with page.expect_download() as evento:
-                await self.download_icon.click()
+                await icon.click()
             descarga: Download = await evento.value
 
             # 3) Get filename and path
@@ -330,6 +528,9 @@ class FileMessage(Message):
 
         except Exception:
             return None
+        finally:
+            if container:
+                await container.dispose()
 
     def get_codec_info(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """
@@ -352,16 +553,20 @@ class VoiceMessage(Message):
     to trigger the download capability.
     """
 
+    __slots__ = ("duration",)
+
     def __init__(
         self,
         page: Page,
         sender: str,
         timestamp: datetime,
         text: str,
-        container: ElementHandle,
+        *,
         duration: str = "",
+        is_outgoing: bool = False,
+        msg_id: str = "",
     ):
-        super().__init__(page, sender, timestamp, text, container)
+        super().__init__(page, sender, timestamp, text, is_outgoing=is_outgoing, msg_id=msg_id)
         self.duration = duration
 
     @classmethod
@@ -453,13 +658,47 @@ class VoiceMessage(Message):
                 sender=base_msg.sender,
                 timestamp=base_msg.timestamp,
                 text=base_msg.text,
-                container=elem,
                 duration=duration,
+                is_outgoing=base_msg.is_outgoing,
+                msg_id=base_msg.msg_id,
             )
 
         except Exception:
             return None
 
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], page: Page) -> Optional["VoiceMessage"]:
+        """
+        Create a VoiceMessage from the JSON returned by ``MESSAGE_NODE_JS``.
+
+        Args:
+            data: Extracted message data.
+            page: The Playwright page.
+
+        Returns:
+            A new VoiceMessage instance or None if not a voice message.
+        """
+        if data.get("is_quoted"):
+            return None
+        if not (
+            data.get("has_voice_button")
+            or data.get("has_voice_container")
+            or data.get("has_voice_icon")
+        ):
+            return None
+
+        fields = cls._fields_from_data(data)
+        duration = data.get("duration")
+        return cls(
+            page=page,
+            sender=fields["sender"],
+            timestamp=fields["timestamp"],
+            text=fields["text"],
+            duration=_format_duration(duration) if duration is not None else "",
+            is_outgoing=fields["is_outgoing"],
+            msg_id=fields["msg_id"],
+        )
+
     async def download_via_play(
         self, page: Page, downloads_dir: Path
     ) -> Optional[Path]:
@@ -475,21 +714,29 @@ class VoiceMessage(Message):
         Returns:
             The Path to the saved file, or None if download failed.
         """
+        container = None
         try:
             downloads_dir.mkdir(parents=True, exist_ok=True)
 
-            play_button = await self.container.query_selector(
+            container = await self.get_container()
+            if not container:
+                return None
+
+            play_button = await container.query_selector(
                 'button[aria-label="Reproducir mensaje de voz"]'
             )
             if not play_button:
                 return None
 
             await play_button.click()
-            await asyncio.sleep(1)
 
-            download_icon = await self.container.query_selector(
-                'span[data-icon="audio-download"]'
-            )
+            # The download icon appears once playback has loaded the audio
+            try:
+                download_icon = await container.wait_for_selector(
+                    'span[data-icon="audio-download"]', timeout=VOICE_DOWNLOAD_ICON_TIMEOUT
+                )
+            except Exception:
+                download_icon = None
             if not download_icon:
                 return None
 
@@ -508,6 +755,9 @@ class VoiceMessage(Message):
 
         except Exception:
             return None
+        finally:
+            if container:
+                await container.dispose()
 
     async def download_via_context_menu(
         self, page: Page, downloads_dir: Path
@@ -524,11 +774,15 @@ class VoiceMessage(Message):
         Returns:
             The Path to the saved file, or None if download failed.
         """
+        container = None
         try:
             downloads_dir.mkdir(parents=True, exist_ok=True)
 
-            await self.container.scroll_into_view_if_needed()
-            await asyncio.sleep(0.3)
+            container = await self.get_container()
+            if not container:
+                return None
+
+            await container.scroll_into_view_if_needed()
 
             async with page.expect_download() as download_info:
                 target_found = await page.evaluate(
@@ -549,7 +803,7 @@ class VoiceMessage(Message):
                         target.dispatchEvent(event);
                         return true;
                     }""",
-                    self.container,
+                    container,
                 )
                 if not target_found:
                     logger.warning(
@@ -558,7 +812,11 @@ class VoiceMessage(Message):
                         self.msg_id,
                     )
 
-                await asyncio.sleep(0.5)
+                await timed_wait(
+                    page.wait_for_selector('[role="menu"]', timeout=CONTEXT_MENU_TIMEOUT),
+                    "voice.context_menu",
+                    replaces=0.5,
+                )
 
                 await page.evaluate(
                     """
@@ -588,6 +846,9 @@ class VoiceMessage(Message):
 
         except Exception:
             return None
+        finally:
+            if container:
+                await container.dispose()
 
     async def download_via_blob(
         self, page: Page, downloads_dir: Path
@@ -604,10 +865,15 @@ class VoiceMessage(Message):
         Returns:
             The Path to the saved file, or None if download failed.
         """
+        container = None
         try:
             downloads_dir.mkdir(parents=True, exist_ok=True)
 
-            audio_data = await self.container.evaluate(
+            container = await self.get_container()
+            if not container:
+                return None
+
+            audio_data = await container.evaluate(
                 """
                 () => {
                     const audio = this.querySelector('audio') || this.querySelector('video');
@@ -637,6 +903,9 @@ class VoiceMessage(Message):
 
         except Exception:
             return None
+        finally:
+            if container:
+                await container.dispose()
 
     async def _download_blob_audio(
         self, page: Page, blob_url: str, destino: Path
@@ -706,3 +975,26 @@ class VoiceMessage(Message):
     def get_codec_info(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """Get codec information from downloaded audio file."""
         return detect_codec(file_path)
+
+
+def message_from_data(data: Dict[str, Any], page: Page) -> Optional[Message]:
+    """
+    Build the right message type from the JSON returned by ``MESSAGE_NODE_JS``.
+
+    Voice messages take precedence over file messages, which take precedence
+    over plain messages, like in ``ChatManager.collect_messages``.
+
+    Args:
+        data: Extracted message data.
+        page: The Playwright page.
+
+    Returns:
+        A VoiceMessage, FileMessage or Message instance, or None if ``data`` is empty.
+    """
+    if not data:
+        return None
+    return (
+        VoiceMessage.from_data(data, page)
+        or FileMessage.from_data(data, page)
+        or Message.from_data(data, page)
+    )
@@ -0,0 +1,214 @@
+"""
+Fast failure for chats that cannot be opened.
+
+``NegativeCache`` remembers targets that definitely failed (a name with no
+search results, a number WhatsApp reports as invalid) for a TTL, and
+``CircuitBreaker`` stops retrying targets that keep failing for any reason
+until a cooldown passes. ``ChatManager.open`` checks both before touching
+the page, so known-bad targets fail immediately instead of paying the open
+timeout again.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+# Why the last open() failed (``WhatsAppElements.last_open_error``)
+OPEN_ERROR_NOT_FOUND = "not_found"
+OPEN_ERROR_INVALID_NUMBER = "invalid_number"
+OPEN_ERROR_TIMEOUT = "timeout"
+OPEN_ERROR_EXCEPTION = "error"
+# Failures that will not fix themselves by retrying soon
+DEFINITE_OPEN_ERRORS = (OPEN_ERROR_NOT_FOUND, OPEN_ERROR_INVALID_NUMBER)
+
+DEFAULT_NEGATIVE_TTL = 600.0
+DEFAULT_NEGATIVE_CACHE_SIZE = 1000
+DEFAULT_BREAKER_THRESHOLD = 3
+DEFAULT_BREAKER_COOLDOWN = 60.0
+DEFAULT_BREAKER_SIZE = 1000
+
+# Circuit states
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+Clock = Callable[[], float]
+
+
+class NegativeCache:
+    """
+    Bounded map of failed targets to their failure reason, with a TTL.
+
+    Attributes:
+        ttl: Seconds a failure is remembered
+        maxsize: Maximum number of targets remembered
+        hits: Lookups answered from the cache
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_NEGATIVE_TTL,
+        maxsize: int = DEFAULT_NEGATIVE_CACHE_SIZE,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a failure is remembered
+            maxsize: Maximum number of targets remembered
+            clock: Monotonic time source
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, target: str, reason: str) -> None:
+        """
+        Remember that a target failed.
+
+        Args:
+            target: Normalized target key
+            reason: Failure reason (one of ``DEFINITE_OPEN_ERRORS``)
+        """
+        self._entries.pop(target, None)
+        self._entries[target] = (reason, self._clock() + self.ttl)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, target: str) -> Optional[str]:
+        """
+        Return why a target failed, if the failure has not expired.
+
+        Args:
+            target: Normalized target key
+
+        Returns:
+            The failure reason, or None
+        """
+        entry = self._entries.get(target)
+        if entry is None:
+            return None
+        reason, expires = entry
+        if self._clock() >= expires:
+            del self._entries[target]
+            return None
+        self.hits += 1
+        return reason
+
+    def discard(self, target: str) -> None:
+        """Forget a target (e.g. it showed up in the chat list)."""
+        self._entries.pop(target, None)
+
+    def clear(self) -> None:
+        """Forget every target."""
+        self._entries.clear()
+
+
+class CircuitBreaker:
+    """
+    Per-target circuit breaker.
+
+    After ``threshold`` consecutive failures a target's circuit opens and
+    every attempt is rejected for ``cooldown`` seconds. Then a single trial
+    attempt is let through (half-open): success closes the circuit, failure
+    opens it again. At most ``maxsize`` failing targets are tracked; the
+    one that failed least recently is forgotten first.
+
+    Attributes:
+        threshold: Consecutive failures that open the circuit
+        cooldown: Seconds the circuit stays open
+        maxsize: Maximum number of failing targets tracked
+        rejected: Attempts rejected while open
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        cooldown: float = DEFAULT_BREAKER_COOLDOWN,
+        maxsize: int = DEFAULT_BREAKER_SIZE,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        """
+        Initialize the breaker.
+
+        Args:
+            threshold: Consecutive failures that open the circuit
+            cooldown: Seconds the circuit stays open
+            maxsize: Maximum number of failing targets tracked
+            clock: Monotonic time source
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.maxsize = maxsize
+        self._clock = clock
+        # target -> [consecutive failures, opened_at or None, trial in flight]
+        self._targets: "OrderedDict[str, list]" = OrderedDict()
+        self.rejected = 0
+
+    def state(self, target: str) -> str:
+        """Return the circuit state of a target."""
+        entry = self._targets.get(target)
+        if entry is None or entry[1] is None:
+            return BREAKER_CLOSED
+        if self._clock() - entry[1] < self.cooldown:
+            return BREAKER_OPEN
+        return BREAKER_HALF_OPEN
+
+    def allow(self, target: str) -> bool:
+        """
+        Decide whether an attempt on a target may run.
+
+        Args:
+            target: Normalized target key
+
+        Returns:
+            False while the circuit is open, or while a half-open trial runs
+        """
+        state = self.state(target)
+        if state == BREAKER_CLOSED:
+            return True
+        entry = self._targets[target]
+        if state == BREAKER_HALF_OPEN and not entry[2]:
+            entry[2] = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, target: str) -> None:
+        """Close the circuit of a target."""
+        self._targets.pop(target, None)
+
+    def release(self, target: str) -> None:
+        """
+        End a half-open trial without counting it.
+
+        Called once an attempt is over, whatever its outcome, so a trial that
+        raised or was cancelled does not block the target forever.
+        """
+        entry = self._targets.get(target)
+        if entry is not None:
+            entry[2] = False
+
+    def record_failure(self, target: str) -> None:
+        """Count a failure, opening the circuit at ``threshold``."""
+        entry = self._targets.pop(target, None) or [0, None, False]
+        self._targets[target] = entry
+        while len(self._targets) > self.maxsize:
+            self._targets.popitem(last=False)
+        entry[0] += 1
+        entry[2] = False
+        if entry[1] is not None or entry[0] >= self.threshold:
+            entry[1] = self._clock()
+
+    def reset(self, target: Optional[str] = None) -> None:
+        """Close the circuit of one target, or of every target."""
+        if target is None:
+            self._targets.clear()
+        else:
+            self._targets.pop(target, None)
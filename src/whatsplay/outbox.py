@@ -0,0 +1,134 @@
+"""
+Outbound message queue.
+
+Messages queued for the same chat are coalesced into one batch, so the chat
+is opened once and its messages are sent back to back. Every queued message
+gets its own future, resolved with the result of its send (for
+``ChatManager`` this is the message's delivery receipt, or None).
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (chat_query, messages, open_via_url) -> one result per message
+SendBatch = Callable[[str, List[str], bool], Awaitable[List[Any]]]
+
+
+class Outbox:
+    """
+    Per-chat send queue drained by a single background task.
+
+    Chats are served in the order they were first queued. Messages queued
+    for a chat while another chat is being sent are added to that chat's
+    pending batch.
+
+    Example:
+        >>> outbox = Outbox(chat_manager._send_batch)
+        >>> results = await asyncio.gather(
+        ...     outbox.send("Ana", "Hola"), outbox.send("Ana", "¿Cómo estás?")
+        ... )
+
+    Attributes:
+        batches_sent: Number of batches sent so far
+    """
+
+    def __init__(self, send_batch: SendBatch) -> None:
+        """
+        Initialize the outbox.
+
+        Args:
+            send_batch: Coroutine that sends a list of messages to one chat
+        """
+        self._send_batch = send_batch
+        self._pending: "OrderedDict[Tuple[str, bool], List[Tuple[str, asyncio.Future]]]" = (
+            OrderedDict()
+        )
+        self._task: Optional[asyncio.Task] = None
+        self.batches_sent = 0
+
+    def __len__(self) -> int:
+        """Number of messages waiting to be sent."""
+        return sum(len(items) for items in self._pending.values())
+
+    def submit(self, chat_query: str, message: str, open_via_url: bool = False) -> asyncio.Future:
+        """
+        Queue a message without waiting for it.
+
+        Args:
+            chat_query: Name or identifier of the chat
+            message: Text message to send
+            open_via_url: If True, opens the chat via URL before sending
+
+        Returns:
+            Future resolved with the message's send result (None on failure)
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault((chat_query, open_via_url), []).append((message, future))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+        return future
+
+    async def send(self, chat_query: str, message: str, open_via_url: bool = False) -> Any:
+        """
+        Queue a message and wait for its result.
+
+        Args:
+            chat_query: Name or identifier of the chat
+            message: Text message to send
+            open_via_url: If True, opens the chat via URL before sending
+
+        Returns:
+            The message's send result (None on failure)
+        """
+        return await self.submit(chat_query, message, open_via_url)
+
+    async def close(self) -> None:
+        """
+        Stop the drain task and wait for it to finish.
+
+        Messages still queued are dropped and their senders see the futures
+        cancelled.
+        """
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _drain(self) -> None:
+        """Send pending batches until the queue is empty."""
+        items: List[Tuple[str, asyncio.Future]] = []
+        try:
+            while self._pending:
+                (chat_query, open_via_url), items = self._pending.popitem(last=False)
+                # Skip messages whose caller gave up waiting
+                items = [(m, f) for m, f in items if not f.done()]
+                if not items:
+                    continue
+
+                try:
+                    results = await self._send_batch(chat_query, [m for m, _ in items], open_via_url)
+                except Exception as e:
+                    logger.error("Outbox: error sending to %s: %s", chat_query, e)
+                    results = []
+                self.batches_sent += 1
+
+                for i, (_, future) in enumerate(items):
+                    if not future.done():
+                        future.set_result(results[i] if i < len(results) else None)
+        except asyncio.CancelledError:
+            # Nothing else will drain the queue: release every waiting sender
+            for _, future in items:
+                future.cancel()
+            for pending in self._pending.values():
+                for _, future in pending:
+                    future.cancel()
+            self._pending.clear()
+            raise
@@ -0,0 +1,333 @@
+"""
+Delivery receipts for sent messages.
+
+A ``DeliveryReceipt`` is bound to the ``data-id`` of a sent message. A
+MutationObserver installed in the page watches the status icon of every
+tracked message (``MSG_STATUS_PENDING/SENT/DELIVERED/READ``) and pushes
+each transition to Python through ``page.expose_binding``.
+
+A status can only be read while the message's bubble is in the DOM, so
+senders wait for the server tick before leaving the chat; later statuses
+(delivered, read) arrive whenever the chat is on screen again. Tracked
+messages are registered again when the page is reloaded.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from .constants import locator as loc
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+# Receipt states, in order
+RECEIPT_PENDING = "pending"
+RECEIPT_SENT = "sent"
+RECEIPT_DELIVERED = "delivered"
+RECEIPT_READ = "read"
+RECEIPT_ORDER = (RECEIPT_PENDING, RECEIPT_SENT, RECEIPT_DELIVERED, RECEIPT_READ)
+
+RECEIPT_BINDING_NAME = "__whatsplayReceipt"
+MAX_TRACKED_RECEIPTS = 1000
+
+
+def _css(selector: str) -> str:
+    """Strip Playwright's ``css=`` engine prefix so the page can use it."""
+    return selector[len("css="):] if selector.startswith("css=") else selector
+
+
+RECEIPT_SELECTORS = {
+    RECEIPT_READ: _css(loc.MSG_STATUS_READ),
+    RECEIPT_DELIVERED: _css(loc.MSG_STATUS_DELIVERED),
+    RECEIPT_SENT: _css(loc.MSG_STATUS_SENT),
+    RECEIPT_PENDING: _css(loc.MSG_STATUS_PENDING),
+}
+
+# Only outgoing bubbles carry a status icon
+OUTGOING_STATUS_CSS = ", ".join([_css(loc.MSG_STATUS_PENDING), _css(loc.MSG_STATUS_CONFIRMED)])
+
+# data-id of the newest outgoing message (outgoing ids start with "true_").
+LAST_OUTGOING_ID_JS = """
+({ sel, status }) => {
+    const els = document.querySelectorAll(sel);
+    for (let i = els.length - 1; i >= 0; i--) {
+        const id = els[i].getAttribute('data-id') || '';
+        if (id.startsWith('true_') || els[i].querySelector(status)) return id;
+    }
+    return null;
+}
+"""
+
+# Resolves with the data-id of a new outgoing message once it is rendered.
+NEW_OUTGOING_ID_JS = """
+(args) => {
+    const id = (%s)(args);
+    return id && id !== args.previous ? id : null;
+}
+""" % LAST_OUTGOING_ID_JS.strip()
+
+# Installs the page side of the tracker once (returns true if it was not
+# installed, e.g. after a reload). ``track(id)`` returns the current status
+# and reports every later change through the binding.
+RECEIPT_OBSERVER_JS = """
+(() => {
+    if (window.__whatsplayReceipts) return false;
+    const sel = %(container)s;
+    const statuses = %(statuses)s;
+    const tracked = new Map();
+
+    const statusOf = (id) => {
+        const el = document.querySelector(sel + '[data-id="' + CSS.escape(id) + '"]');
+        if (!el) return null;
+        for (const [name, css] of statuses) {
+            if (el.querySelector(css)) return name;
+        }
+        return null;
+    };
+
+    const check = () => {
+        for (const [id, last] of tracked) {
+            const status = statusOf(id);
+            if (!status || status === last) continue;
+            tracked.set(id, status);
+            try { window.%(binding)s({ id, status }); } catch (e) {}
+            if (status === 'read') tracked.delete(id);
+        }
+    };
+
+    let timer = null;
+    new MutationObserver(() => {
+        if (tracked.size && timer === null) {
+            timer = setTimeout(() => { timer = null; check(); }, 50);
+        }
+    }).observe(document.body, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['aria-label', 'data-icon'],
+    });
+
+    window.__whatsplayReceipts = {
+        track: (id) => {
+            const status = statusOf(id);
+            tracked.set(id, status);
+            return status;
+        },
+        untrack: (id) => tracked.delete(id),
+    };
+    return true;
+})()
+"""
+
+
+class DeliveryReceipt:
+    """
+    Status of one sent message, bound to its ``data-id``.
+
+    Attributes:
+        msg_id: ``data-id`` of the sent message (empty if the message was sent
+            but its bubble could not be identified; such a receipt never updates)
+        chat: Chat the message was sent to
+        status: Latest known status (one of ``RECEIPT_ORDER``, or None)
+        timestamps: Monotonic time at which each status was first seen
+    """
+
+    def __init__(self, msg_id: str, chat: str = "") -> None:
+        """
+        Initialize the receipt.
+
+        Args:
+            msg_id: ``data-id`` of the sent message
+            chat: Chat the message was sent to
+        """
+        self.msg_id = msg_id
+        self.chat = chat
+        self.status: Optional[str] = None
+        self.created_at = time.monotonic()
+        self.timestamps: Dict[str, float] = {}
+        self._reached = {name: asyncio.Event() for name in RECEIPT_ORDER}
+
+    def __repr__(self) -> str:
+        return f"DeliveryReceipt(msg_id={self.msg_id!r}, status={self.status!r})"
+
+    def update(self, status: Optional[str]) -> None:
+        """
+        Record a status transition. Statuses never go backwards.
+
+        Args:
+            status: New status reported by the page
+        """
+        if status not in RECEIPT_ORDER:
+            return
+        rank = RECEIPT_ORDER.index(status)
+        if self.status is not None and rank <= RECEIPT_ORDER.index(self.status):
+            return
+        now = time.monotonic()
+        self.status = status
+        for name in RECEIPT_ORDER[: rank + 1]:
+            self.timestamps.setdefault(name, now)
+            self._reached[name].set()
+
+    def reached(self, status: str) -> bool:
+        """True once the message reached ``status`` (or a later one)."""
+        return self._reached[status].is_set()
+
+    def latency(self, status: str) -> Optional[float]:
+        """Seconds from send to ``status``, or None if not reached yet."""
+        if status not in self.timestamps:
+            return None
+        return self.timestamps[status] - self.created_at
+
+    async def wait(self, status: str = RECEIPT_SENT, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the message reaches a status.
+
+        Args:
+            status: Status to wait for (default: confirmed by the server)
+            timeout: Maximum time to wait in seconds (None waits forever)
+
+        Returns:
+            True if the status was reached, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._reached[status].wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class ReceiptTracker:
+    """
+    Resolves delivery receipts from status changes pushed by the page.
+
+    Attributes:
+        client: Client whose page is observed
+    """
+
+    def __init__(self, client: "Client") -> None:
+        """
+        Initialize the tracker.
+
+        Args:
+            client: Client whose page is observed
+        """
+        self.client = client
+        self._receipts: "OrderedDict[str, DeliveryReceipt]" = OrderedDict()
+        self._binding_page = None
+
+    def _script(self) -> str:
+        """Build the page side of the tracker."""
+        return RECEIPT_OBSERVER_JS % {
+            "container": json.dumps(loc.MESSAGE_CONTAINER),
+            "statuses": json.dumps([[name, css] for name, css in RECEIPT_SELECTORS.items()]),
+            "binding": RECEIPT_BINDING_NAME,
+        }
+
+    async def _install(self) -> None:
+        """
+        Expose the binding (once per page) and install the observer.
+
+        If the observer was gone (the page was reloaded), the messages still
+        being tracked are registered again so their receipts keep resolving.
+        """
+        page = self.client._page
+        if self._binding_page is not page:
+            await page.expose_binding(RECEIPT_BINDING_NAME, self._on_receipt)
+            self._binding_page = page
+        if not await page.evaluate(self._script()):
+            return
+        pending = [r for r in self._receipts.values() if r.status != RECEIPT_READ]
+        if not pending:
+            return
+        statuses = await page.evaluate(
+            "(ids) => ids.map((id) => window.__whatsplayReceipts.track(id))",
+            [r.msg_id for r in pending],
+        )
+        for receipt, status in zip(pending, statuses or []):
+            receipt.update(status)
+
+    async def last_outgoing_id(self) -> Optional[str]:
+        """Return the ``data-id`` of the newest outgoing message in the open chat."""
+        return await self.client._page.evaluate(
+            LAST_OUTGOING_ID_JS, {"sel": loc.MESSAGE_CONTAINER, "status": OUTGOING_STATUS_CSS}
+        )
+
+    async def wait_new_outgoing_id(self, previous: Optional[str], timeout: float) -> Optional[str]:
+        """
+        Wait until a new outgoing message is rendered after ``previous``.
+
+        Args:
+            previous: ``data-id`` of the newest outgoing message before sending
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            The new message's ``data-id``, or None on timeout
+        """
+        try:
+            handle = await self.client._page.wait_for_function(
+                NEW_OUTGOING_ID_JS,
+                arg={"sel": loc.MESSAGE_CONTAINER, "status": OUTGOING_STATUS_CSS, "previous": previous},
+                timeout=timeout * 1000,
+            )
+        except Exception as e:
+            logger.debug("No new outgoing message after %s: %s", previous, e)
+            return None
+        return await handle.json_value()
+
+    async def track(self, msg_id: str, chat: str = "") -> DeliveryReceipt:
+        """
+        Start tracking a sent message.
+
+        Args:
+            msg_id: ``data-id`` of the sent message
+            chat: Chat the message was sent to
+
+        Returns:
+            The receipt, already updated with the current status
+        """
+        await self._install()
+        receipt = self._receipts.get(msg_id)
+        if receipt is None:
+            receipt = DeliveryReceipt(msg_id, chat)
+            self._receipts[msg_id] = receipt
+            while len(self._receipts) > MAX_TRACKED_RECEIPTS:
+                old_id, _ = self._receipts.popitem(last=False)
+                await self._untrack(old_id)
+
+        status = await self.client._page.evaluate(
+            "(id) => window.__whatsplayReceipts.track(id)", msg_id
+        )
+        receipt.update(status)
+        return receipt
+
+    async def _untrack(self, msg_id: str) -> None:
+        """Stop observing a message in the page."""
+        try:
+            await self.client._page.evaluate(
+                "(id) => window.__whatsplayReceipts && window.__whatsplayReceipts.untrack(id)",
+                msg_id,
+            )
+        except Exception as e:
+            logger.debug("untrack %s: %s", msg_id, e)
+
+    def get(self, msg_id: str) -> Optional[DeliveryReceipt]:
+        """Return the receipt of a tracked message, if any."""
+        return self._receipts.get(msg_id)
+
+    def _on_receipt(self, source: Any, payload: Dict[str, Any]) -> None:
+        """
+        Binding callback for every status transition.
+
+        Args:
+            source: Binding source (frame/page info), unused
+            payload: ``{"id": data-id, "status": status}``
+        """
+        receipt = self._receipts.get((payload or {}).get("id"))
+        if receipt is None:
+            return
+        receipt.update(payload.get("status"))
+        if receipt.status == RECEIPT_READ:
+            self._receipts.pop(receipt.msg_id, None)
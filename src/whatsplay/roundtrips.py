@@ -0,0 +1,148 @@
+"""
+Accounting of Playwright round trips per client operation.
+
+Every awaited driver call (``evaluate``, ``query_selector``,
+``get_attribute``, ``wait_for_selector``, ``click``...) is a round trip to
+the browser, and round trips are what page operations spend most of their
+time on. ``RoundTripProxy`` wraps the ``Page`` (and the locators, element
+handles and keyboard obtained from it), times each awaited call and
+attributes it to the operation running at the time (``open``,
+``send_message``, ``check_unread_chats``...), as set by
+``metrics.timed``. Enable it with ``Client(trace_round_trips=True)``:
+
+    >>> print(client.round_trips.format_report())
+"""
+
+import inspect
+import time
+from typing import Any, Dict, List
+
+from .metrics import current_operation
+
+# Operation of calls made outside any timed operation
+OTHER_OPERATION = "other"
+
+# Playwright objects whose calls are accounted; anything else (context
+# managers such as ``expect_download``, downloads, plain values) is returned as is
+PROXIED_TYPES = frozenset(
+    {"Page", "Frame", "FrameLocator", "Locator", "ElementHandle", "JSHandle", "Keyboard", "Mouse"}
+)
+
+
+class RoundTripStats:
+    """
+    Driver calls by operation and method.
+
+    Attributes:
+        calls: operation -> method -> {"count", "total", "max"}
+    """
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    def record(self, operation: str, method: str, seconds: float) -> None:
+        """Record one awaited driver call."""
+        stats = self.calls.setdefault(operation, {}).setdefault(
+            method, {"count": 0, "total": 0.0, "max": 0.0}
+        )
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Summarize the calls of every operation.
+
+        Returns:
+            One dict per operation (most calls first) with its call count,
+            total seconds and calls per method
+        """
+        rows = []
+        for operation, methods in self.calls.items():
+            rows.append({
+                "operation": operation,
+                "calls": int(sum(s["count"] for s in methods.values())),
+                "seconds": sum(s["total"] for s in methods.values()),
+                "methods": {m: int(s["count"]) for m, s in sorted(methods.items())},
+            })
+        return sorted(rows, key=lambda r: -r["calls"])
+
+    def format_report(self) -> str:
+        """Render ``report()`` as a text table."""
+        lines = [f"{'operation':<24} {'calls':>6} {'secs':>8}  top methods"]
+        for r in self.report():
+            top = sorted(r["methods"].items(), key=lambda kv: -kv[1])[:4]
+            methods = ", ".join(f"{m}={n}" for m, n in top)
+            lines.append(f"{r['operation']:<24} {r['calls']:>6} {r['seconds']:>8.3f}  {methods}")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Forget every recorded call."""
+        self.calls.clear()
+
+
+def _unwrap(value: Any) -> Any:
+    """Hand the real Playwright objects back to the driver."""
+    if isinstance(value, RoundTripProxy):
+        return value._target
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return value
+
+
+def _wrap(value: Any, stats: RoundTripStats) -> Any:
+    if type(value).__name__ in PROXIED_TYPES:
+        return RoundTripProxy(value, stats)
+    if isinstance(value, list):
+        return [_wrap(v, stats) for v in value]
+    return value
+
+
+class RoundTripProxy:
+    """
+    Transparent wrapper that accounts the awaited calls of a Playwright object.
+
+    Attributes:
+        _target: Wrapped object
+        _stats: Where calls are recorded
+    """
+
+    __slots__ = ("_target", "_stats")
+
+    def __init__(self, target: Any, stats: RoundTripStats) -> None:
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_stats", stats)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            # Properties such as ``page.keyboard``
+            return _wrap(attr, self._stats)
+
+        stats = self._stats
+        method = f"{type(self._target).__name__}.{name}"
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            result = attr(*_unwrap(args), **_unwrap(kwargs))
+            if not inspect.isawaitable(result):
+                # ``locator()``, ``nth()``, ``expect_download()``: no round trip
+                return _wrap(result, stats)
+
+            async def timed_call() -> Any:
+                start = time.monotonic()
+                try:
+                    return _wrap(await result, stats)
+                finally:
+                    stats.record(current_operation() or OTHER_OPERATION, method, time.monotonic() - start)
+
+            return timed_call()
+
+        return call
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._target, name, value)
+
+    def __repr__(self) -> str:
+        return f"RoundTripProxy({self._target!r})"
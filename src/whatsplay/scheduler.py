@@ -0,0 +1,238 @@
+"""
+Prioritized access to the WhatsApp Web page.
+
+Only one operation can drive the page at a time. ``PageScheduler`` hands
+the page out by priority (sends before scrapes before background sweeps),
+ages waiting operations so low priorities are never starved, honours
+per-operation deadlines and cancellation, and reports queue depth and
+wait times.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .metrics import PAGE_WAIT_SECONDS, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# Priorities (lower runs first)
+PRIORITY_SEND = 0
+PRIORITY_USER = 10
+PRIORITY_SCRAPE = 10
+PRIORITY_SWEEP = 20
+
+# Priority points a waiting operation gains per second in the queue
+DEFAULT_AGING_RATE = 1.0
+
+
+class _Request:
+    """An operation waiting for the page."""
+
+    __slots__ = ("priority", "name", "seq", "enqueued", "future")
+
+    def __init__(self, priority: int, name: str, seq: int, future: asyncio.Future) -> None:
+        self.priority = priority
+        self.name = name
+        self.seq = seq
+        self.enqueued = time.monotonic()
+        self.future = future
+
+    def effective_priority(self, now: float, aging_rate: float) -> float:
+        """Priority after aging: the longer it waits, the sooner it runs."""
+        return self.priority - aging_rate * (now - self.enqueued)
+
+
+class PageScheduler:
+    """
+    Grants exclusive page access to one operation at a time, by priority.
+
+    Example:
+        >>> async with client.scheduler.slot(PRIORITY_SCRAPE, "collect", deadline=10):
+        ...     await client.open("Ana")
+        ...     messages = await client.collect_messages()
+
+    Attributes:
+        aging_rate: Priority points gained per second of waiting
+        current: Name of the operation holding the page (None if idle)
+        metrics: Registry where wait times are observed, if any
+    """
+
+    def __init__(self, aging_rate: float = DEFAULT_AGING_RATE) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            aging_rate: Priority points gained per second of waiting
+        """
+        self.aging_rate = aging_rate
+        self.current: Optional[str] = None
+        self._busy = False
+        self._queue: List[_Request] = []
+        self._seq = itertools.count()
+        self._granted_at = 0.0
+        self._stats: Dict[int, Dict[str, float]] = {}
+        self.timeouts = 0
+        self.cancellations = 0
+        # Set by the client to export wait times
+        self.metrics: Optional[MetricsRegistry] = None
+
+    def __len__(self) -> int:
+        """Number of operations waiting for the page."""
+        return len(self._queue)
+
+    def locked(self) -> bool:
+        """True while an operation holds the page."""
+        return self._busy
+
+    def _record_wait(self, priority: int, waited: float) -> None:
+        """Accumulate wait-time statistics for a priority."""
+        stats = self._stats.setdefault(priority, {"count": 0, "total_wait": 0.0, "max_wait": 0.0})
+        stats["count"] += 1
+        stats["total_wait"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+        if self.metrics is not None:
+            self.metrics.observe(PAGE_WAIT_SECONDS, waited, priority=priority)
+
+    def _grant_next(self) -> None:
+        """Hand the page to the best waiting operation, if any."""
+        now = time.monotonic()
+        while self._queue and not self._busy:
+            best = min(
+                self._queue,
+                key=lambda r: (r.effective_priority(now, self.aging_rate), r.seq),
+            )
+            self._queue.remove(best)
+            if best.future.done():  # cancelled while waiting
+                continue
+            self._busy = True
+            self.current = best.name
+            self._granted_at = now
+            self._record_wait(best.priority, now - best.enqueued)
+            best.future.set_result(None)
+
+    async def acquire(
+        self, priority: int = PRIORITY_USER, name: str = "", deadline: Optional[float] = None
+    ) -> None:
+        """
+        Wait for exclusive access to the page.
+
+        Args:
+            priority: Operation priority (lower runs first)
+            name: Operation name, for logs and stats
+            deadline: Maximum seconds to wait (None waits forever)
+
+        Raises:
+            asyncio.TimeoutError: If the deadline passes before the page is free
+        """
+        if not self._busy and not self._queue:
+            self._busy = True
+            self.current = name
+            self._granted_at = time.monotonic()
+            self._record_wait(priority, 0.0)
+            return
+
+        request = _Request(priority, name, next(self._seq), asyncio.get_running_loop().create_future())
+        self._queue.append(request)
+        try:
+            await asyncio.wait_for(asyncio.shield(request.future), deadline)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if request in self._queue:
+                self._queue.remove(request)
+                request.future.cancel()
+            elif request.future.done() and not request.future.cancelled():
+                # Granted at the same time: hand the page to the next one
+                self.release()
+            if isinstance(e, asyncio.TimeoutError):
+                self.timeouts += 1
+                logger.debug("scheduler: %s missed its %ss deadline", name, deadline)
+            else:
+                self.cancellations += 1
+            raise
+
+    def release(self) -> None:
+        """Give the page back and wake the next operation."""
+        if self._busy:
+            logger.debug(
+                "scheduler: %s held the page %.3fs",
+                self.current,
+                time.monotonic() - self._granted_at,
+            )
+        self._busy = False
+        self.current = None
+        self._grant_next()
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: int = PRIORITY_USER, name: str = "", deadline: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold the page for the duration of a ``async with`` block.
+
+        Args:
+            priority: Operation priority (lower runs first)
+            name: Operation name, for logs and stats
+            deadline: Maximum seconds to wait for the page
+        """
+        await self.acquire(priority, name, deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue statistics.
+
+        Returns:
+            Dictionary with the current queue depth, the running operation,
+            timeout/cancellation counts and wait times per priority
+        """
+        return {
+            "queue_depth": len(self._queue),
+            "running": self.current,
+            "timeouts": self.timeouts,
+            "cancellations": self.cancellations,
+            "priorities": {
+                priority: {
+                    "count": int(s["count"]),
+                    "avg_wait": s["total_wait"] / s["count"] if s["count"] else 0.0,
+                    "max_wait": s["max_wait"],
+                }
+                for priority, s in sorted(self._stats.items())
+            },
+        }
+
+
+class PageLock:
+    """
+    ``asyncio.Lock``-like view of the scheduler, kept for ``Client._page_lock``.
+
+    ``async with client._page_lock:`` waits for the page at the given
+    priority, so existing user code keeps working under the scheduler.
+    """
+
+    def __init__(self, scheduler: PageScheduler, priority: int = PRIORITY_USER, name: str = "user") -> None:
+        self.scheduler = scheduler
+        self.priority = priority
+        self.name = name
+
+    def locked(self) -> bool:
+        """True while any operation holds the page."""
+        return self.scheduler.locked()
+
+    async def acquire(self) -> bool:
+        await self.scheduler.acquire(self.priority, self.name)
+        return True
+
+    def release(self) -> None:
+        self.scheduler.release()
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.release()
@@ -7,7 +7,7 @@ including authentication, QR code display, loading, and logged-in states.
 
 import asyncio
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -16,8 +16,10 @@ from playwright.async_api import (
     TimeoutError as PlaywrightTimeoutError,
 )
 
+from .chat_list import CHAT_READ, ChatListModel
 from .constants import locator as loc
 from .constants.states import State
+from .metrics import timed
 from .utils import close_qr_window, show_qr_window, update_qr_code
 
 # Constants
@@ -39,6 +41,7 @@ class StateManager:
         wa_elements: WhatsApp Web elements helper
         last_qr_shown: Binary data of the last displayed QR code
         qr_server_started: Flag indicating if QR server is running
+        chat_list: Model of the unread chats seen by the last sweep
     """
 
     def __init__(self, client: "Client") -> None:
@@ -53,7 +56,9 @@ class StateManager:
         self.wa_elements = client.wa_elements
         self.last_qr_shown: Optional[bytes] = None
         self.qr_server_started: bool = False
+        self.chat_list = ChatListModel()
 
+    @timed("get_state")
     async def _get_state(self) -> Optional[State]:
         """
         Get the current state of WhatsApp Web.
@@ -148,6 +153,9 @@ class StateManager:
             close_qr_window()
             self.qr_server_started = False
 
+        # Report every unread chat again after (re)logging in
+        self.chat_list.reset()
+
         logger.debug("_handle_logged_in_state_change: emitting on_logged_in")
         await self.client.emit("on_logged_in")
         logger.debug("_handle_logged_in_state_change: on_logged_in done, calling _handle_logged_in_state")
@@ -202,28 +210,64 @@ class StateManager:
             return
 
         try:
-            # Check for continue button (privacy policy updates, etc.)
-            continue_button = await self._page.query_selector(
-                "button:has(div:has-text('Continue'))"
-            )
+            # Check for continue button (privacy policy updates, etc.).
+            # The state probe already reports whether it is present, so only
+            # query for it when the probe saw it (or no probe is available).
+            probe = self.wa_elements.last_probe
+            if probe is not None and not probe.get("continue_modal"):
+                continue_button = None
+            else:
+                continue_button = await self._page.query_selector(
+                    "button:has(div:has-text('Continue'))"
+                )
             if continue_button:
                 await continue_button.click()
                 await asyncio.sleep(DEFAULT_SLEEP_AFTER_CONTINUE)
                 return
 
-            # Skip unread check if another page operation is in progress
-            if self.client._page_lock.locked():
-                logger.debug("Skipping _check_unread_chats: page locked by another operation")
-                return
-
-            # Check for unread chats
+            # Check for unread chats. The sweep queues behind sends and
+            # scrapes at the lowest priority instead of being skipped.
             unread_chats = await self.client.chat_manager._check_unread_chats()
-            if unread_chats:
-                await self.client.emit("on_unread_chat", unread_chats)
+            await self._emit_unread_changes(unread_chats)
 
         except Exception as e:
             await self.client.emit("on_error", f"Error in logged-in state: {e}")
 
+    async def _emit_unread_changes(self, unread_chats: List[Dict[str, Any]]) -> None:
+        """
+        Update the chat-list model and emit unread events.
+
+        Emits ``on_chat_update`` with the diffs since the previous sweep.
+        ``on_unread_chat`` is edge-triggered by default: it only carries the
+        chats that became unread or received new messages. With
+        ``client.level_triggered_unread`` it is emitted with the full unread
+        list on every sweep, as before. The diffs are then handed to the
+        message pipeline, which emits ``on_message`` for new messages.
+
+        Args:
+            unread_chats: Unread chats returned by the latest sweep
+        """
+        # A failed sweep returns no chats; do not report them all as read
+        chat_manager = self.client.chat_manager
+        if not chat_manager.last_sweep_ok:
+            return
+
+        # Chats a partial sweep did not reach are not reported as read
+        diffs = self.chat_list.update(unread_chats, chat_manager.last_sweep_covered)
+        if diffs:
+            await self.client.emit("on_chat_update", diffs)
+
+        if self.client.level_triggered_unread:
+            if unread_chats:
+                await self.client.emit("on_unread_chat", unread_chats)
+        else:
+            changed = [d["chat"] for d in diffs if d["type"] != CHAT_READ]
+            if changed:
+                await self.client.emit("on_unread_chat", changed)
+
+        # Turn the changed chats into on_message events
+        await self.client.message_pipeline.process(diffs)
+
     async def _extract_image_from_canvas(
         self, canvas_element: Optional[ElementHandle]
     ) -> Optional[bytes]:
@@ -4,6 +4,8 @@ Utilities for interacting with WhatsApp Web elements
 
 import asyncio
 import datetime
+import logging
+import time
 from typing import Optional, List, Dict, Any
 from playwright.async_api import (
     Page,
@@ -12,9 +14,115 @@ from playwright.async_api import (
 )
 import re
 
+from .chat_index import ROUTE_ROW, ROUTE_SEARCH, ROUTE_URL
 from .constants import locator as loc
+from .open_guard import (
+    OPEN_ERROR_EXCEPTION,
+    OPEN_ERROR_INVALID_NUMBER,
+    OPEN_ERROR_NOT_FOUND,
+    OPEN_ERROR_TIMEOUT,
+)
 from .constants.states import State
 from .filters import MessageFilter
+from .waits import timed_wait, wait_for_condition, wait_for_dom_quiet
+
+logger = logging.getLogger(__name__)
+
+# Probe de estado en una sola ida y vuelta: resuelve todos los locators de
+# estado, el modal "Continue" y el QR dentro de la página.
+STATE_PROBE_JS = """
+(sel) => {
+    const isVisible = (el) => {
+        if (!el || el.nodeType !== 1) return false;
+        if (getComputedStyle(el).visibility === 'hidden') return false;
+        const r = el.getBoundingClientRect();
+        return r.width > 0 && r.height > 0;
+    };
+    const anyVisible = (xpath) => {
+        const snap = document.evaluate(
+            xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        for (let i = 0; i < snap.snapshotLength; i++) {
+            if (isVisible(snap.snapshotItem(i))) return true;
+        }
+        return false;
+    };
+    const continueModal = Array.from(document.querySelectorAll('button')).some(
+        (b) => Array.from(b.querySelectorAll('div')).some(
+            (d) => /continue/i.test(d.textContent || '')
+        )
+    );
+    const qr = anyVisible(sel.qr_code);
+    let state = null;
+    if (anyVisible(sel.logged_in)) state = 'LOGGED_IN';
+    else if (anyVisible(sel.loading)) state = 'LOADING';
+    else if (qr) state = 'QR_AUTH';
+    else if (anyVisible(sel.auth)) state = 'AUTH';
+    else if (anyVisible(sel.loading_chats)) state = 'LOADING';
+    return { state, continue_modal: continueModal, qr };
+}
+"""
+
+# Etiquetas de las pestañas de filtro de chats (ES/EN)
+CHAT_FILTER_LABELS = {
+    "all": ("Todos", "All"),
+    "unread": ("No leídos", "Unread"),
+    "groups": ("Grupos", "Groups"),
+    "favourites": ("Favoritos", "Favourites"),
+}
+
+# True once a search result whose title contains the query is rendered
+SEARCH_HIT_JS = """
+({ item, title, query }) => {
+    const q = query.toLowerCase();
+    const rows = document.evaluate(item, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < rows.snapshotLength; i++) {
+        const span = document.evaluate(
+            title, rows.snapshotItem(i), null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        const t = span ? (span.getAttribute('title') || '') : '';
+        if (t.toLowerCase().includes(q)) return true;
+    }
+    return false;
+}
+"""
+
+# True once the member picker lists a contact whose title contains the query.
+# Only the picker is searched: the climb from its search input stops before
+# the ancestor that also holds the chat list.
+MEMBER_RESULT_JS = """
+({ input, query }) => {
+    const box = document.evaluate(input, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!box) return false;
+    const q = query.toLowerCase();
+    for (let el = box.parentElement; el && !el.querySelector('#pane-side'); el = el.parentElement) {
+        for (const span of el.querySelectorAll('span[title]')) {
+            if ((span.getAttribute('title') || '').toLowerCase().includes(q)) return true;
+        }
+    }
+    return false;
+}
+"""
+
+# True once the picker took the member and cleared its search input
+MEMBER_PICKED_JS = """
+(input) => {
+    const box = document.evaluate(input, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return !box || !box.value;
+}
+"""
+
+# Límites de las esperas por condición que reemplazaron sleeps fijos (ms)
+SEARCH_HIT_TIMEOUT = 3000
+UI_SETTLE_TIMEOUT = 2000
+
+STATE_PROBE_SELECTORS = {
+    "logged_in": loc.LOGGED_IN,
+    "loading": loc.LOADING,
+    "qr_code": loc.QR_CODE,
+    "auth": loc.AUTH,
+    "loading_chats": loc.LOADING_CHATS,
+}
 
 
 class WhatsAppElements:
@@ -22,31 +130,42 @@ class WhatsAppElements:
 
     def __init__(self, page: Page):
         self.page = page
+        # Idas y vueltas al driver hechas por el probe de estado
+        self.round_trips = 0
+        self.last_probe: Optional[Dict[str, Any]] = None
+        # Ruta usada por el último open() exitoso (ver ChatIndex)
+        self.last_open_route: Optional[str] = None
+        # Motivo del último open() fallido (ver open_guard)
+        self.last_open_error: Optional[str] = None
+
+    async def probe(self) -> Optional[Dict[str, Any]]:
+        """
+        Consulta estado, modal "Continue" y QR en un único ``evaluate``.
+
+        Returns:
+            Dict con ``state`` (nombre de State o None), ``continue_modal`` y
+            ``qr``, o None si la página no pudo evaluarse
+        """
+        self.round_trips += 1
+        try:
+            result = await self.page.evaluate(STATE_PROBE_JS, STATE_PROBE_SELECTORS)
+        except Exception as e:
+            logger.debug("probe failed: %s", e)
+            self.last_probe = None
+            return None
+        self.last_probe = result
+        return result
 
     async def get_state(self) -> Optional[State]:
         """
         Determina el estado actual de WhatsApp Web basado en los elementos visibles
         """
-        try:
-            # Checkear en orden de prioridad
-            if await self.page.locator(loc.LOGGED_IN).is_visible():
-                print("LOGGED_IN")
-                return State.LOGGED_IN
-            elif await self.page.locator(loc.LOADING).is_visible():
-                print("LOADING")
-                return State.LOADING
-            elif await self.page.locator(loc.QR_CODE).is_visible():
-                print("QR_AUTH")
-                return State.QR_AUTH
-            elif await self.page.locator(loc.AUTH).is_visible():
-                print("AUTH")
-                return State.AUTH
-            elif await self.page.locator(loc.LOADING_CHATS).is_visible():
-                print("LOADING_CHATS")
-                return State.LOADING
-            return None
-        except Exception:
+        probe = await self.probe()
+        if not probe or not probe.get("state"):
             return None
+        state = State[probe["state"]]
+        logger.debug("state: %s", state.name)
+        return state
 
     async def wait_for_selector(
         self, selector: str, timeout: int = 5000, state: str = "visible"
@@ -78,7 +197,6 @@ class WhatsAppElements:
                     inp = await self.page.wait_for_selector(sel, timeout=3000, state="visible")
                     if inp:
                         await inp.click()
-                        await asyncio.sleep(0.3)
                         return True
                 except Exception:
                     continue
@@ -106,8 +224,8 @@ class WhatsAppElements:
                 try:
                     await self.page.keyboard.press("Escape")
                     await self.page.keyboard.press(shortcut)
-                    await asyncio.sleep(0.5)
-                    return True
+                    if await self.verify_search_active():
+                        return True
                 except Exception:
                     continue
 
@@ -205,120 +323,196 @@ class WhatsAppElements:
 
         return results
 
-    async def open(self, chat_name: str, timeout: int = 10000, open_via_url: bool = False) -> bool:
+    async def open(
+        self,
+        chat_name: str,
+        timeout: int = 10000,
+        open_via_url: bool = False,
+        route: Optional[str] = None,
+        title: Optional[str] = None,
+    ) -> bool:
         """
         Abre un chat por su nombre visible o número. Si no está visible, lo busca.
+
+        La ruta usada queda en ``self.last_open_route`` (``"row"``,
+        ``"search"`` o ``"url"``) para que el índice de chats la recuerde, y
+        el motivo de un fallo en ``self.last_open_error``.
+
+        Args:
+            chat_name: Nombre o número del chat
+            timeout: Tiempo máximo de espera del chat en milisegundos
+            open_via_url: Fuerza la apertura por URL ``send?phone=``
+            route: Ruta conocida del ``ChatIndex``; con ``"url"`` se prueban
+                primero la fila y la búsqueda, y la URL queda como respaldo
+            title: Título exacto conocido del chat, para clickear su fila
         """
-        import time as _time
-        _t0 = _time.time()
+        _t0 = time.monotonic()
+
         def _log(msg: str) -> None:
-            elapsed = _time.time() - _t0
-            print(f"[open:{elapsed:.2f}s] {msg}")
+            logger.debug("[open:%.2fs] %s", time.monotonic() - _t0, msg)
 
-        _log(f"inicio: chat_name='{chat_name}' timeout={timeout}")
+        _log(f"inicio: chat_name='{chat_name}' timeout={timeout} route={route}")
+        self.last_open_route = None
+        self.last_open_error = None
 
-        if open_via_url:
-            numero_limpio = re.sub(r"\D", "", chat_name)
-            url = f"https://web.whatsapp.com/send?phone={numero_limpio}"
-            _log(f"abriendo por URL: {url}")
-            try:
-                await self.page.goto(url, timeout=60000)
-                await self.page.wait_for_selector(loc.LOGGED_IN, timeout=30000)
-                _log("LOGGED_IN detectado tras navegacion")
-                await self.page.wait_for_selector(
-                    f"{loc.CHAT_INPUT_BOX}|{loc.INVALID_NUMBER_WARNING}",
-                    timeout=timeout
-                )
-                invalid_warning = await self.page.query_selector(loc.INVALID_NUMBER_WARNING)
-                if invalid_warning and await invalid_warning.is_visible():
-                    _log("numero invalido detectado")
-                    return False
-                _log("chat abierto via URL OK")
+        if not open_via_url:
+            if await self._open_via_sidebar(chat_name, timeout, title, _log):
                 return True
-            except PlaywrightTimeoutError:
-                _log(f"TIMEOUT via URL")
-                return False
-            except Exception as e:
-                _log(f"EXCEPTION via URL: {e}")
+            if route != ROUTE_URL:
                 return False
+            # El chat se abrió antes por URL: usarla solo si lo barato falla
+            _log("fila y busqueda fallaron, usando la ruta URL conocida")
+            self.last_open_error = None
 
-        span_xpath = f"//span[contains(@title, {repr(chat_name)})]"
+        if await self._open_via_url(chat_name, timeout, _log):
+            self.last_open_route = ROUTE_URL
+            return True
+        return False
 
+    async def _open_via_sidebar(
+        self, chat_name: str, timeout: int, title: Optional[str], log
+    ) -> bool:
+        """Abre el chat clickeando su fila visible o, si no está, buscándolo."""
         try:
-            chat_element = await self.page.query_selector(f"xpath={span_xpath}")
-            _log(f"query_selector directo: {'encontrado' if chat_element else 'no encontrado'}")
-
-            if chat_element:
-                await chat_element.click()
-                _log("click directo OK")
+            if await self._click_visible_row(title or chat_name, exact=bool(title), log=log):
+                used = ROUTE_ROW
             else:
-                _log("chat no visible, entrando a ruta de busqueda")
-                await asyncio.sleep(2)
-                await self.page.screenshot(path="before_search.png")
-                activated = await self.click_search_button()
-                _log(f"click_search_button: {activated}")
-                if not activated:
-                    await self.page.screenshot(path="no_search_button.png")
-                    raise Exception("Boton de busqueda no encontrado")
-
-                for j, input_xpath in enumerate(loc.SEARCH_TEXT_BOX):
-                    inputs = await self.page.query_selector_all(input_xpath)
-                    _log(f"search_input[{j}] count={len(inputs)} selector={input_xpath}")
-                    if inputs:
-                        await asyncio.sleep(1)
-                        await self.page.screenshot(path=f"search_input_{j}.png")
-                        await inputs[0].fill("")
-                        await asyncio.sleep(0.5)
-                        await inputs[0].type(chat_name, delay=100)
-                        _log("texto tipeado en input de busqueda")
-                        await asyncio.sleep(1)
-                        break
-                else:
-                    raise Exception("Input de busqueda no encontrado")
-
-                _log("esperando SEARCH_ITEM...")
-                results = await self.page.wait_for_selector(loc.SEARCH_ITEM, timeout=5000)
-                _log(f"SEARCH_ITEM: {results is not None}")
-                if not results:
-                    raise Exception("No se encontraron resultados de busqueda")
-
-                await asyncio.sleep(1)
-                chat_results = await self.page.query_selector_all(loc.SEARCH_ITEM)
-                _log(f"chat_results count={len(chat_results)}")
-
-                found = False
-                for chat in chat_results:
-                    title_el = await chat.query_selector(f"xpath={loc.SPAN_TITLE}")
-                    if title_el:
-                        title = await title_el.get_attribute("title")
-                        if title and chat_name.lower() in title.lower():
-                            _log(f"clickeando chat: {title}")
-                            await chat.click()
-                            found = True
-                            break
-                if not found:
-                    _log("chat no encontrado en results, usando ArrowDown+Enter")
-                    await self.page.keyboard.press("ArrowDown")
-                    await asyncio.sleep(0.5)
-                    await self.page.keyboard.press("Enter")
-
-            _log(f"esperando CHAT_INPUT_BOX (timeout={timeout}ms)...")
+                await self._open_via_search(chat_name, log)
+                used = ROUTE_SEARCH
+
+            log(f"esperando CHAT_INPUT_BOX (timeout={timeout}ms)...")
             await self.page.wait_for_selector(loc.CHAT_INPUT_BOX, timeout=timeout)
-            _log("CHAT_INPUT_BOX encontrado, SUCCESS")
+            log("CHAT_INPUT_BOX encontrado, SUCCESS")
+            self.last_open_route = used
             return True
 
         except PlaywrightTimeoutError:
-            _log("TIMEOUT esperando CHAT_INPUT_BOX")
+            log("TIMEOUT esperando CHAT_INPUT_BOX")
+            self.last_open_error = OPEN_ERROR_TIMEOUT
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             await self.page.screenshot(path=f"search_timeout_error_{timestamp}.png")
             return False
 
         except Exception as e:
-            _log(f"EXCEPTION: {type(e).__name__}: {e}")
+            log(f"EXCEPTION: {type(e).__name__}: {e}")
+            if self.last_open_error == OPEN_ERROR_NOT_FOUND:
+                return False
+            self.last_open_error = OPEN_ERROR_EXCEPTION
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             await self.page.screenshot(path=f"search_exception_error_{timestamp}.png")
             return False
 
+    async def _open_via_url(self, chat_name: str, timeout: int, log) -> bool:
+        """Abre un chat navegando a ``send?phone=`` con el número."""
+        numero_limpio = re.sub(r"\D", "", chat_name)
+        url = f"https://web.whatsapp.com/send?phone={numero_limpio}"
+        log(f"abriendo por URL: {url}")
+        try:
+            await self.page.goto(url, timeout=60000)
+            await self.page.wait_for_selector(loc.LOGGED_IN, timeout=30000)
+            log("LOGGED_IN detectado tras navegacion")
+            await self.page.wait_for_selector(
+                f"{loc.CHAT_INPUT_BOX}|{loc.INVALID_NUMBER_WARNING}",
+                timeout=timeout
+            )
+            invalid_warning = await self.page.query_selector(loc.INVALID_NUMBER_WARNING)
+            if invalid_warning and await invalid_warning.is_visible():
+                log("numero invalido detectado")
+                self.last_open_error = OPEN_ERROR_INVALID_NUMBER
+                return False
+            log("chat abierto via URL OK")
+            return True
+        except PlaywrightTimeoutError:
+            log(f"TIMEOUT via URL")
+            self.last_open_error = OPEN_ERROR_TIMEOUT
+            return False
+        except Exception as e:
+            log(f"EXCEPTION via URL: {e}")
+            self.last_open_error = OPEN_ERROR_EXCEPTION
+            return False
+
+    async def _click_visible_row(self, chat_name: str, exact: bool, log) -> bool:
+        """
+        Clickea la fila del chat si ya está renderizada en la barra lateral.
+
+        Returns:
+            True si se encontró y clickeó la fila
+        """
+        if exact:
+            span_xpath = f"//span[@title={repr(chat_name)}]"
+        else:
+            span_xpath = f"//span[contains(@title, {repr(chat_name)})]"
+        chat_element = await self.page.query_selector(f"xpath={span_xpath}")
+        log(f"query_selector directo: {'encontrado' if chat_element else 'no encontrado'}")
+        if not chat_element:
+            return False
+        await chat_element.click()
+        log("click directo OK")
+        return True
+
+    async def _open_via_search(self, chat_name: str, log) -> None:
+        """
+        Busca el chat en el buscador de la barra lateral y abre el resultado.
+
+        Raises:
+            Exception: Si no hay buscador o resultados
+        """
+        log("chat no visible, entrando a ruta de busqueda")
+        activated = await self.click_search_button()
+        log(f"click_search_button: {activated}")
+        if not activated:
+            await self.page.screenshot(path="no_search_button.png")
+            raise Exception("Boton de busqueda no encontrado")
+
+        for j, input_xpath in enumerate(loc.SEARCH_TEXT_BOX):
+            inputs = await self.page.query_selector_all(input_xpath)
+            log(f"search_input[{j}] count={len(inputs)} selector={input_xpath}")
+            if inputs:
+                await timed_wait(
+                    inputs[0].wait_for_element_state("editable", timeout=UI_SETTLE_TIMEOUT),
+                    "open.search_input", replaces=1.5,
+                )
+                await inputs[0].fill(chat_name)
+                log("texto tipeado en input de busqueda")
+                break
+        else:
+            raise Exception("Input de busqueda no encontrado")
+
+        # Un timeout aquí no prueba que el chat no exista: se propaga como tal.
+        # Solo el estado vacío del buscador cuenta como "no encontrado".
+        log("esperando SEARCH_ITEM o SEARCH_NO_RESULTS...")
+        await self.page.wait_for_selector(
+            f"{loc.SEARCH_ITEM} | {loc.SEARCH_NO_RESULTS}", timeout=5000
+        )
+        empty = await self.page.query_selector(loc.SEARCH_NO_RESULTS)
+        if empty and await empty.is_visible():
+            log("buscador sin resultados")
+            self.last_open_error = OPEN_ERROR_NOT_FOUND
+            raise Exception("No se encontraron resultados de busqueda")
+
+        # Los resultados se filtran mientras se escribe: esperar uno que coincida
+        await wait_for_condition(
+            self.page,
+            SEARCH_HIT_JS,
+            {"item": loc.SEARCH_ITEM, "title": loc.SPAN_TITLE, "query": chat_name},
+            timeout=SEARCH_HIT_TIMEOUT,
+            name="open.search_hit",
+            replaces=2.0,
+        )
+        chat_results = await self.page.query_selector_all(loc.SEARCH_ITEM)
+        log(f"chat_results count={len(chat_results)}")
+
+        for chat in chat_results:
+            title_el = await chat.query_selector(f"xpath={loc.SPAN_TITLE}")
+            if title_el:
+                title = await title_el.get_attribute("title")
+                if title and chat_name.lower() in title.lower():
+                    log(f"clickeando chat: {title}")
+                    await chat.click()
+                    return
+        log("chat no encontrado en results, usando ArrowDown+Enter")
+        await self.page.keyboard.press("ArrowDown")
+        await self.page.keyboard.press("Enter")
 
     async def new_group(self, group_name: str, members: List[str]) -> Optional[ElementHandle]:
         print(f"Creating new group: {group_name} with members: {members}")
@@ -343,10 +537,8 @@ class WhatsAppElements:
             )
             if member_name_input:
                 for name in members:
-                    await member_name_input.fill(name)
-                    await asyncio.sleep(0.5)  # Esperar un poco entre entradas
-                    await self.page.keyboard.press("Enter")
-                    
+                    await self._pick_member(member_name_input, name)
+
             enter_arrow = await self.page.wait_for_selector(
                 "xpath=//span[@data-icon='arrow-forward']", timeout=5000
             )
@@ -369,6 +561,26 @@ class WhatsAppElements:
             print(f"Error creating new group: {e}")
             return None
             
+    async def _pick_member(self, member_input: ElementHandle, member: str) -> None:
+        """
+        Busca un contacto en el selector de miembros y lo selecciona.
+
+        Espera a que la lista filtrada muestre al contacto antes de pulsar
+        Enter, y a que el selector lo tome (el campo de búsqueda se vacía).
+        """
+        await member_input.fill(member)
+        input_xpath = loc.INPUT_MEMBERS_GROUP[len("xpath="):]
+        if not await wait_for_condition(
+            self.page, MEMBER_RESULT_JS, {"input": input_xpath, "query": member},
+            timeout=UI_SETTLE_TIMEOUT, name="group.member_results", replaces=0.5,
+        ):
+            logger.debug("group: no picker result for %s", member)
+        await self.page.keyboard.press("Enter")
+        await wait_for_condition(
+            self.page, MEMBER_PICKED_JS, input_xpath,
+            timeout=UI_SETTLE_TIMEOUT, name="group.member_added", replaces=0.5,
+        )
+
     async def add_members_to_group(
         self, group_name: str, members: List[str]
     ) -> bool:
@@ -396,22 +608,20 @@ class WhatsAppElements:
                 loc.INPUT_MEMBERS_GROUP, timeout=5000
             )
             for member in members:
-                await member_input.fill(member)
-                await asyncio.sleep(0.5)
-                await self.page.keyboard.press("Enter")
-                await asyncio.sleep(0.5)
+                await self._pick_member(member_input, member)
 
             # 4. Confirmar la adición
             confirm_button = await self.page.wait_for_selector(
                 loc.CONFIRM_ADD_MEMBERS_BUTTON, timeout=5000
             )
             await confirm_button.click()
-            await asyncio.sleep(0.5)  # Esperar un poco para que se procese
-            
+
             confirm_add_button = await self.page.wait_for_selector('//div[text()="Add member"]', timeout=3000)
             
-            # Esperar un poco para que se procese y cerrar el panel
-            await asyncio.sleep(1)
+            # Esperar a que se procese y cerrar el panel
+            await wait_for_dom_quiet(
+                self.page, timeout=UI_SETTLE_TIMEOUT, name="group.members_confirmed", replaces=1.5
+            )
             await self.page.keyboard.press("Escape")
             return True
 
@@ -502,12 +712,14 @@ class WhatsAppElements:
             # 8. Clic en "Remove"
             remove_button = await self.page.wait_for_selector(loc.REMOVE_MEMBER_BUTTON, timeout=5000)
             await remove_button.click()
-            await asyncio.sleep(0.5)
 
             # 9. Confirmar
             confirm_button = await self.page.wait_for_selector('//div[text()="Remove"]', timeout=3000)
             await confirm_button.click()
-            await asyncio.sleep(0.5)
+            await timed_wait(
+                confirm_button.wait_for_element_state("hidden", timeout=UI_SETTLE_TIMEOUT),
+                "group.member_removed", replaces=0.5,
+            )
 
             print(f"✅ Miembro '{member_name}' eliminado de '{group_name}'.")
             return True
@@ -521,32 +733,70 @@ class WhatsAppElements:
             await self.page.keyboard.press("Escape")
             return False
 
+    async def get_active_chat_filter(self) -> Optional[str]:
+        """
+        Devuelve el filtro de chats activo ("all", "unread", "groups", "favourites")
+
+        Returns:
+            Clave del filtro activo, "all" si no se puede determinar cuál está
+            seleccionado, o None si no hay pestañas de filtro
+        """
+        try:
+            label = await self.page.evaluate(
+                """() => {
+                    const tabs = Array.from(document.querySelectorAll('button[role="tab"]'));
+                    if (!tabs.length) return null;
+                    const active = tabs.find((t) => t.getAttribute('aria-selected') === 'true');
+                    return active ? (active.textContent || '').trim() : '';
+                }"""
+            )
+        except Exception:
+            return None
+        if label is None:
+            return None
+        for key, names in CHAT_FILTER_LABELS.items():
+            if any(name.lower() in label.lower() for name in names):
+                return key
+        return "all"
+
     async def click_chat_filter(self, filter_type: str) -> bool:
         """Hace click en los filtros de chat (Todos, Grupos, No leídos)"""
-        labels = {"all": "Todos", "groups": "Grupos", "unread": "No leídos"}
-        label = labels.get(filter_type)
-        if not label:
+        labels = CHAT_FILTER_LABELS.get(filter_type)
+        if not labels:
             return False
 
         async def _click_tab() -> bool:
-            tab = self.page.locator(f'button[role="tab"]:has-text("{label}")')
-            if await tab.count() > 0 and await tab.first.is_visible():
-                await tab.first.click()
-                await asyncio.sleep(0.3)
-                return True
+            for label in labels:
+                tab = self.page.locator(f'button[role="tab"]:has-text("{label}")')
+                if await tab.count() > 0 and await tab.first.is_visible():
+                    await tab.first.click()
+                    selected = self.page.locator(
+                        f'button[role="tab"][aria-selected="true"]:has-text("{label}")'
+                    )
+                    await timed_wait(
+                        selected.first.wait_for(timeout=UI_SETTLE_TIMEOUT),
+                        "chat_filter.tab_selected", replaces=0.3,
+                    )
+                    return True
             return False
 
         async def _click_dropdown() -> bool:
-            more = self.page.locator("button#additional-filters")
+            more = self.page.locator(loc.ADDITIONAL_FILTERS_BUTTON)
             if await more.count() == 0:
                 return False
             await more.first.click()
-            await asyncio.sleep(0.3)
-            item = self.page.locator(f'button[role="menuitem"]:has-text("{label}")')
-            if await item.count() > 0:
-                await item.first.click()
-                await asyncio.sleep(0.3)
-                return True
+            await timed_wait(
+                self.page.locator('button[role="menuitem"]').first.wait_for(timeout=UI_SETTLE_TIMEOUT),
+                "chat_filter.menu_open", replaces=0.3,
+            )
+            for label in labels:
+                item = self.page.locator(f'button[role="menuitem"]:has-text("{label}")')
+                if await item.count() > 0:
+                    await item.first.click()
+                    await wait_for_dom_quiet(
+                        self.page, timeout=UI_SETTLE_TIMEOUT, name="chat_filter.applied", replaces=0.3
+                    )
+                    return True
             return False
 
         async def _click_xpath_fallback() -> bool:
@@ -554,13 +804,16 @@ class WhatsAppElements:
                 "all": loc.ALL_CHATS_BUTTON,
                 "groups": loc.GROUPS_CHATS_BUTTON,
                 "unread": loc.UNREAD_CHATS_BUTTON,
+                "favourites": loc.FAVOURITES_CHATS_BUTTON,
             }.get(filter_type)
             if not xpath:
                 return False
             el = await self.wait_for_selector(xpath, timeout=3000)
             if el:
                 await el.click()
-                await asyncio.sleep(0.3)
+                await wait_for_dom_quiet(
+                    self.page, timeout=UI_SETTLE_TIMEOUT, name="chat_filter.applied", replaces=0.3
+                )
                 return True
             return False
 
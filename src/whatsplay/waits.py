@@ -0,0 +1,202 @@
+"""
+Condition-based waits for the WhatsApp Web page.
+
+Hot paths wait for an explicit readiness condition (a predicate becoming
+true in the page, or the DOM going quiet after an action) with a bounded
+timeout, instead of sleeping a fixed time. Every wait is timed in
+``WAIT_STATS``, together with the fixed sleep it replaced, so
+``WAIT_STATS.format_report()`` shows how much time the conditions save.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONDITION_TIMEOUT = 5000
+DEFAULT_QUIET_MS = 150
+
+# Resolves once no mutation has been seen for ``quietMs`` (or after
+# ``timeoutMs``). Returns true if the DOM went quiet.
+DOM_QUIET_JS = """
+({ quietMs, timeoutMs }) => new Promise((resolve) => {
+    let timer = null;
+    const done = (quiet) => {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(limit);
+        resolve(quiet);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(() => done(true), quietMs);
+    });
+    observer.observe(document.body, { childList: true, subtree: true, attributes: true });
+    timer = setTimeout(() => done(true), quietMs);
+    const limit = setTimeout(() => done(false), timeoutMs);
+})
+"""
+
+
+class WaitStats:
+    """
+    Durations of condition waits, by name.
+
+    Attributes:
+        waits: name -> {"count", "timeouts", "total", "max", "replaces"}
+    """
+
+    def __init__(self) -> None:
+        self.waits: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, seconds: float, ok: bool, replaces: Optional[float] = None) -> None:
+        """
+        Record one wait.
+
+        Args:
+            name: Wait name, e.g. ``"send_file.preview"``
+            seconds: Time spent waiting
+            ok: False if the wait timed out
+            replaces: Fixed sleep (in seconds) this wait replaced, if any
+        """
+        stats = self.waits.setdefault(
+            name, {"count": 0, "timeouts": 0, "total": 0.0, "max": 0.0, "replaces": replaces or 0.0}
+        )
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+        if not ok:
+            stats["timeouts"] += 1
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Summarize every wait.
+
+        Returns:
+            One dict per wait name with count, timeouts, average and max
+            seconds, the fixed sleep it replaced and the average saving
+        """
+        rows = []
+        for name, s in sorted(self.waits.items()):
+            avg = s["total"] / s["count"] if s["count"] else 0.0
+            rows.append({
+                "name": name,
+                "count": int(s["count"]),
+                "timeouts": int(s["timeouts"]),
+                "avg": avg,
+                "max": s["max"],
+                "fixed": s["replaces"],
+                "saved": s["replaces"] - avg if s["replaces"] else 0.0,
+            })
+        return rows
+
+    def format_report(self) -> str:
+        """Render ``report()`` as a text table."""
+        lines = [f"{'wait':<32} {'n':>5} {'t/o':>4} {'avg s':>7} {'max s':>7} {'fixed s':>8} {'saved s':>8}"]
+        for r in self.report():
+            lines.append(
+                f"{r['name']:<32} {r['count']:>5} {r['timeouts']:>4} {r['avg']:>7.3f} "
+                f"{r['max']:>7.3f} {r['fixed']:>8.2f} {r['saved']:>8.3f}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Forget every recorded wait."""
+        self.waits.clear()
+
+
+WAIT_STATS = WaitStats()
+
+
+async def wait_for_condition(
+    page,
+    expression: str,
+    arg: Any = None,
+    timeout: int = DEFAULT_CONDITION_TIMEOUT,
+    name: str = "",
+    replaces: Optional[float] = None,
+) -> bool:
+    """
+    Wait until a predicate is truthy in the page.
+
+    Args:
+        page: Playwright page
+        expression: JS function evaluated until it returns a truthy value
+        arg: Argument passed to the function
+        timeout: Maximum time to wait in milliseconds
+        name: Wait name for ``WAIT_STATS``
+        replaces: Fixed sleep (in seconds) this wait replaced
+
+    Returns:
+        True if the condition was met, False on timeout or error
+    """
+    start = time.monotonic()
+    try:
+        await page.wait_for_function(expression, arg=arg, timeout=timeout)
+        ok = True
+    except Exception as e:
+        logger.debug("wait %s not met: %s", name or expression[:40], e)
+        ok = False
+    WAIT_STATS.record(name or "condition", time.monotonic() - start, ok, replaces)
+    return ok
+
+
+async def wait_for_dom_quiet(
+    page,
+    quiet_ms: int = DEFAULT_QUIET_MS,
+    timeout: int = DEFAULT_CONDITION_TIMEOUT,
+    name: str = "",
+    replaces: Optional[float] = None,
+) -> bool:
+    """
+    Wait until the page stops mutating after an action.
+
+    Used where there is no specific element to wait for, e.g. the results
+    of a member picker settling after typing a name.
+
+    Args:
+        page: Playwright page
+        quiet_ms: Milliseconds without mutations that count as settled
+        timeout: Maximum time to wait in milliseconds
+        name: Wait name for ``WAIT_STATS``
+        replaces: Fixed sleep (in seconds) this wait replaced
+
+    Returns:
+        True if the DOM went quiet, False on timeout or error
+    """
+    start = time.monotonic()
+    try:
+        ok = bool(await page.evaluate(DOM_QUIET_JS, {"quietMs": quiet_ms, "timeoutMs": timeout}))
+    except Exception as e:
+        logger.debug("wait %s not quiet: %s", name or "dom_quiet", e)
+        ok = False
+    WAIT_STATS.record(name or "dom_quiet", time.monotonic() - start, ok, replaces)
+    return ok
+
+
+async def timed_wait(
+    awaitable,
+    name: str,
+    replaces: Optional[float] = None,
+) -> bool:
+    """
+    Time an existing Playwright wait (e.g. ``locator.wait_for``).
+
+    Args:
+        awaitable: The wait to run
+        name: Wait name for ``WAIT_STATS``
+        replaces: Fixed sleep (in seconds) this wait replaced
+
+    Returns:
+        True if the wait finished, False if it raised (timeout)
+    """
+    start = time.monotonic()
+    try:
+        await awaitable
+        ok = True
+    except Exception as e:
+        logger.debug("wait %s failed: %s", name, e)
+        ok = False
+    WAIT_STATS.record(name, time.monotonic() - start, ok, replaces)
+    return ok
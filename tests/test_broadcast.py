@@ -0,0 +1,141 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from whatsplay.broadcast import Broadcaster, BroadcastCheckpoint, TokenBucket
+from whatsplay.chat_manager import ChatManager
+from whatsplay.receipts import RECEIPT_DELIVERED, RECEIPT_SENT, DeliveryReceipt
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# Mock de un cliente mínimo para Broadcaster
+class MockClient:
+    def __init__(self, fail=()):
+        self.chat_manager = MagicMock()
+        self.chat_manager._await_receipt = ChatManager._await_receipt
+        self.sent = []
+
+        async def send(target, message, open_via_url=False):
+            self.sent.append((target, open_via_url))
+            if target in fail:
+                return None
+            receipt = DeliveryReceipt(f"true_{target}", target)
+            receipt.update(RECEIPT_SENT)
+            return receipt
+
+        self.chat_manager.send_message_tracked = AsyncMock(side_effect=send)
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=1, clock=clock)
+
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.delay() == pytest.approx(0.5)
+    clock.now = 0.5
+    assert bucket.try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_sends_once_per_chat_and_uses_url_for_numbers():
+    client = MockClient(fail={"Luis"})
+    results = await Broadcaster(client).run(
+        ["+54 11 2233", "Ana", "Luis", "ana"], message="Hola", rate=None, per_chat_rate=None
+    )
+
+    assert results == {"+54 11 2233": "sent", "Ana": "sent", "Luis": "failed"}
+    assert client.sent == [("+54 11 2233", True), ("Ana", False), ("Luis", False)]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_resumes_from_checkpoint(tmp_path):
+    path = str(tmp_path / "promo.jsonl")
+    first = MockClient(fail={"Luis"})
+    await Broadcaster(first).run(["Ana", "Luis"], message="Hola", checkpoint=path, rate=None)
+
+    second = MockClient()
+    results = await Broadcaster(second).run(
+        ["Ana", "Luis", "Eva"], message="Hola", checkpoint=path, rate=None
+    )
+    assert [t for t, _ in second.sent] == ["Eva"]
+    assert results == {"Ana": "sent", "Luis": "failed", "Eva": "sent"}
+
+    third = MockClient()
+    await Broadcaster(third).run(["Luis"], message="Hola", checkpoint=path, rate=None, retry_failed=True)
+    assert [t for t, _ in third.sent] == ["Luis"]
+
+
+def test_checkpoint_rejects_other_broadcast_and_ignores_torn_line(tmp_path):
+    path = tmp_path / "promo.jsonl"
+    path.write_text(
+        json.dumps({"fingerprint": "abc"}) + "\n"
+        + json.dumps({"target": "ana", "status": "sent"}) + "\n"
+        + '{"target": "lu'
+    )
+
+    store = BroadcastCheckpoint(str(path), "abc")
+    assert store.status == {"ana": "sent"}
+    store.close()
+    with pytest.raises(ValueError):
+        BroadcastCheckpoint(str(path), "other")
+
+
+@pytest.mark.asyncio
+async def test_broadcast_pipelines_receipts():
+    client = MockClient()
+    pending = []
+
+    async def send(target, message, open_via_url=False):
+        client.sent.append((target, open_via_url))
+        receipt = DeliveryReceipt(f"true_{target}", target)
+        pending.append(receipt)
+        return receipt
+
+    client.chat_manager.send_message_tracked = AsyncMock(side_effect=send)
+    run = asyncio.create_task(
+        Broadcaster(client).run(
+            ["Ana", "Luis", "Eva"], message="Hola", rate=None, wait_for=RECEIPT_DELIVERED, timeout=1
+        )
+    )
+    await asyncio.sleep(0.01)
+    # Every recipient was sent before any delivery receipt arrived
+    assert len(client.sent) == 3
+    for receipt in pending:
+        receipt.update(RECEIPT_DELIVERED)
+    assert set((await run).values()) == {"sent"}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_requires_content():
+    with pytest.raises(ValueError):
+        await Broadcaster(MockClient()).run(["Ana"])
+
+
+@pytest.mark.asyncio
+async def test_broadcast_never_resends_unconfirmed_recipients(tmp_path):
+    path = str(tmp_path / "promo.jsonl")
+    client = MockClient()
+
+    async def send(target, message, open_via_url=False):
+        client.sent.append((target, open_via_url))
+        return DeliveryReceipt(f"true_{target}", target)  # rendered, tick never seen
+
+    client.chat_manager.send_message_tracked = AsyncMock(side_effect=send)
+    results = await Broadcaster(client).run(
+        ["Ana"], message="Hola", checkpoint=path, rate=None, timeout=0.01
+    )
+    assert results == {"Ana": "unconfirmed"}
+
+    again = MockClient()
+    results = await Broadcaster(again).run(
+        ["Ana"], message="Hola", checkpoint=path, rate=None, retry_failed=True
+    )
+    assert again.sent == [] and results == {"Ana": "unconfirmed"}
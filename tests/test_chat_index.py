@@ -0,0 +1,44 @@
+from whatsplay.chat_index import ROUTE_ROW, ROUTE_SEARCH, ROUTE_URL, ChatIndex, normalize_chat_key
+
+
+def test_numbers_normalize_to_digits_and_names_ignore_case():
+    assert normalize_chat_key("+54 9 11 2233-4455") == "5491122334455"
+    assert normalize_chat_key("  Ana Pérez ") == normalize_chat_key("ana pérez")
+
+
+def test_record_indexes_query_and_header_title():
+    index = ChatIndex()
+    index.record("+54 9 11 2233-4455", ROUTE_URL, title="Ana")
+
+    assert index.route("5491122334455") == ROUTE_URL
+    assert index.get("ana")["title"] == "Ana"
+
+
+def test_observed_rows_replace_url_routes_only():
+    index = ChatIndex()
+    index.record("Ana", ROUTE_URL)
+    index.record("Luis", ROUTE_SEARCH)
+
+    index.observe_rows(["Ana", "Luis", "Soporte", ""])
+
+    assert index.route("Ana") == ROUTE_ROW
+    assert index.route("Luis") == ROUTE_SEARCH
+    assert index.route("Soporte") == ROUTE_ROW
+    assert len(index) == 3
+
+
+def test_index_persists_and_skips_clean_saves(tmp_path):
+    path = tmp_path / "chat_index.json"
+    index = ChatIndex(str(path))
+    index.record("Ana", ROUTE_SEARCH)
+
+    assert index.save() is True
+    assert index.save() is False
+    assert ChatIndex(str(path)).route("ana") == ROUTE_SEARCH
+
+
+def test_corrupt_index_file_is_ignored(tmp_path):
+    path = tmp_path / "chat_index.json"
+    path.write_text("{not json")
+
+    assert len(ChatIndex(str(path))) == 0
@@ -0,0 +1,84 @@
+from whatsplay.chat_list import (
+    CHAT_MOVED_UP,
+    CHAT_NEW_MESSAGE,
+    CHAT_READ,
+    CHAT_UNREAD,
+    CHAT_UNREAD_INCREASE,
+    ChatListModel,
+)
+
+
+def _chat(name, message="Hola", activity="10:00", unread="1", group=None):
+    return {
+        "name": name,
+        "group": group,
+        "last_message": message,
+        "last_activity": activity,
+        "unread_count": unread,
+    }
+
+
+def test_first_sweep_reports_every_chat_as_unread():
+    model = ChatListModel()
+
+    diffs = model.update([_chat("A"), _chat("B")])
+
+    assert [(d["type"], d["chat"]["name"]) for d in diffs] == [
+        (CHAT_UNREAD, "A"),
+        (CHAT_UNREAD, "B"),
+    ]
+    assert diffs[0]["previous"] is None
+    assert len(model) == 2
+
+
+def test_identical_sweep_has_no_diffs():
+    model = ChatListModel()
+    model.update([_chat("A"), _chat("B")])
+
+    assert model.update([_chat("A"), _chat("B")]) == []
+
+
+def test_new_message_and_unread_increase():
+    model = ChatListModel()
+    model.update([_chat("A")])
+
+    diffs = model.update([_chat("A", message="Otro", activity="10:05", unread="2")])
+
+    assert len(diffs) == 1
+    assert diffs[0]["type"] == CHAT_NEW_MESSAGE
+    assert diffs[0]["changes"] == [CHAT_NEW_MESSAGE, CHAT_UNREAD_INCREASE]
+    assert diffs[0]["previous"]["last_message"] == "Hola"
+
+
+def test_moved_up_only_when_overtaking():
+    model = ChatListModel()
+    model.update([_chat("A"), _chat("B"), _chat("C")])
+
+    # A is read: B and C move up in absolute position but overtake nobody
+    diffs = model.update([_chat("B"), _chat("C")])
+    assert [(d["type"], d["chat"]["name"]) for d in diffs] == [(CHAT_READ, "A")]
+
+    diffs = model.update([_chat("C"), _chat("B")])
+    assert [(d["changes"], d["chat"]["name"]) for d in diffs] == [([CHAT_MOVED_UP], "C")]
+
+
+def test_chats_are_keyed_by_group_and_name():
+    model = ChatListModel()
+    model.update([_chat("Ana", group="Familia"), _chat("Ana")])
+
+    assert len(model) == 2
+    assert [c["group"] for c in model.chats] == ["Familia", None]
+
+
+def test_chats_outside_the_sweep_coverage_are_not_read():
+    model = ChatListModel()
+    model.update([_chat("A"), _chat("B")])
+
+    # The sweep only reached A (read now): B is kept, not reported as read
+    assert model.update([], covered={(None, "A")}) == [
+        {"type": CHAT_READ, "changes": [CHAT_READ], "chat": _chat("A"), "previous": _chat("A")}
+    ]
+    assert [c["name"] for c in model.chats] == ["B"]
+
+    # A sweep over the whole list reports it
+    assert [d["type"] for d in model.update([])] == [CHAT_READ]
@@ -1,6 +1,10 @@
+import asyncio
 import pytest
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
+from whatsplay.scheduler import PageScheduler
 from whatsplay.chat_manager import ChatManager
+from whatsplay.chat_manager import COLLECT_MESSAGES_JS
 
 # Mock de loc (locator) para evitar dependencias reales
 class MockLocator:
@@ -11,8 +15,7 @@ class MockLocator:
 class MockClient:
     def __init__(self):
         self._page = AsyncMock()
-        self._page_lock = MagicMock()
-        self._page_lock.locked.return_value = False
+        self.scheduler = PageScheduler()
         self.wa_elements = MagicMock()
         self.unread_messages_sleep = 1
 
@@ -29,162 +32,681 @@ def mock_chat_manager():
     manager.loc = MockLocator() # Inyectar el mock de loc
     return manager
 
+
+def _raw_row(**overrides):
+    row = {
+        "layout": 2,
+        "group": None,
+        "title": "Contacto",
+        "last_activity": "10:30",
+        "preview": "Hola",
+        "unread_count": "0",
+        "mic": False,
+        "has_unread_aria": False,
+        "has_unread_badge": False,
+        "has_unread_text": False,
+        "is_bold": False,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_row_to_chat_individual():
+    chat = ChatManager._row_to_chat(_raw_row(unread_count="2", mic=True))
+
+    assert chat == {
+        "type": "CHATS",
+        "group": None,
+        "name": "Contacto",
+        "last_activity": "10:30",
+        "last_message": "Hola",
+        "last_message_type": "audio",
+        "unread_count": "2",
+    }
+
+
+def test_row_to_chat_group_and_transient_rows():
+    group = ChatManager._row_to_chat(_raw_row(layout=3, group="Grupo", title="Grupo"))
+    assert group["group"] == "Grupo"
+
+    assert ChatManager._row_to_chat(_raw_row(preview="typing...")) is None
+    assert ChatManager._row_to_chat(_raw_row(layout=1)) is None
+
+
+def test_row_to_chat_group_chat():
+    chat = ChatManager._row_to_chat(_raw_row(
+        layout=3, group="Nombre del Grupo", title="Nombre del Grupo",
+        last_activity="Ayer", preview="Juan Pérez: Mensaje del grupo", unread_count="12",
+    ))
+
+    assert chat["type"] == "CHATS"
+    assert chat["group"] == "Nombre del Grupo"
+    assert chat["name"] == "Nombre del Grupo"
+    assert chat["last_activity"] == "Ayer"
+    assert chat["last_message"] == "Juan Pérez: Mensaje del grupo"
+    assert chat["unread_count"] == "12"
+
+
+def test_row_to_chat_individual_chat_with_colon_in_message():
+    # Un chat individual cuyo mensaje contiene dos puntos no es un grupo
+    chat = ChatManager._row_to_chat(_raw_row(
+        title="Contacto Individual", last_activity="11:00 AM",
+        preview="Mensaje: con dos puntos", unread_count="1",
+    ))
+
+    assert chat["name"] == "Contacto Individual"
+    assert chat["last_message"] == "Mensaje: con dos puntos"
+    assert chat["last_message_type"] == "text"
+    assert chat["group"] is None
+
+
+def test_row_to_chat_defaults_missing_fields():
+    chat = ChatManager._row_to_chat(_raw_row(title=None, last_activity=None, preview=None, unread_count=None))
+
+    assert chat["name"] == ""
+    assert chat["last_activity"] == ""
+    assert chat["last_message"] == ""
+    assert chat["unread_count"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_check_unread_chats_uses_single_batched_evaluate(mock_chat_manager):
+    rows_locator = MagicMock()
+    rows_locator.evaluate_all = AsyncMock(return_value=[
+        _raw_row(title="A", has_unread_badge=True, unread_count="3"),
+        _raw_row(title="B"),
+        _raw_row(title="C", is_bold=True),
+        _raw_row(title="C", is_bold=True),
+    ] + [_raw_row(title=f"R{i}") for i in range(5)])
+    grid_locator = MagicMock()
+    grid_locator.wait_for = AsyncMock()
+    page = mock_chat_manager._page
+    page.locator = MagicMock(
+        side_effect=lambda sel: rows_locator if "row" in sel else grid_locator
+    )
+
+    chats = await mock_chat_manager._check_unread_chats(
+        debug=False, full_crawl=False, strategy="scan"
+    )
+
+    assert [c["name"] for c in chats] == ["A", "C"]
+    assert chats[0]["unread_count"] == "3"
+    rows_locator.evaluate_all.assert_called_once()
+    # Without a crawl only the rendered rows were covered, read ones included
+    assert (None, "B") in mock_chat_manager.last_sweep_covered
+    assert (None, "Z") not in mock_chat_manager.last_sweep_covered
+
+
+@pytest.mark.asyncio
+async def test_crawl_chat_list_pages_until_unchanged(mock_chat_manager):
+    pages = [
+        [_raw_row(title="A", has_unread_badge=True), _raw_row(title="B")],
+        [_raw_row(title="B"), _raw_row(title="C")],
+        [_raw_row(title="D")],
+    ]
+    mock_chat_manager._extract_chat_rows = AsyncMock(side_effect=pages)
+    scroller = AsyncMock()
+    # Two successful page-downs, then the bottom is reached, then scroll reset
+    scroller.evaluate.side_effect = [True, True, False, None]
+    mock_chat_manager._get_chat_list_scroller = AsyncMock(return_value=scroller)
+
+    rows = await mock_chat_manager._crawl_chat_list()
+
+    # First crawl has no snapshot: it pages through the whole list
+    assert [r["title"] for r in rows] == ["A", "B", "C", "D"]
+    scroller.dispose.assert_called_once()
+
+    # Second crawl: the only new row on the first page is already read and
+    # unchanged since the previous crawl, so it stops without scrolling. The
+    # unread row found deeper by the first crawl is carried forward.
+    mock_chat_manager._extract_chat_rows = AsyncMock(return_value=[_raw_row(title="B")])
+    mock_chat_manager._get_chat_list_scroller.reset_mock()
+
+    rows = await mock_chat_manager._crawl_chat_list()
+
+    assert [r["title"] for r in rows] == ["B", "A"]
+    assert mock_chat_manager.last_crawl_complete
+    mock_chat_manager._get_chat_list_scroller.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_crawl_carries_deep_unread_rows_until_opened(mock_chat_manager):
+    scroller = AsyncMock()
+    scroller.evaluate.side_effect = [True, False, None]
+    mock_chat_manager._get_chat_list_scroller = AsyncMock(return_value=scroller)
+    mock_chat_manager._extract_chat_rows = AsyncMock(side_effect=[
+        [_raw_row(title="new"), _raw_row(title="read")],
+        [_raw_row(title="old-unread", has_unread_badge=True)],
+    ])
+    await mock_chat_manager._crawl_chat_list()
+
+    # Second sweep stops after page 1, but old-unread is still unread
+    mock_chat_manager._extract_chat_rows = AsyncMock(
+        return_value=[_raw_row(title="new"), _raw_row(title="read")]
+    )
+    rows = await mock_chat_manager._crawl_chat_list()
+    assert [r["title"] for r in rows if ChatManager._row_is_unread(r)] == ["old-unread"]
+
+    # Opening it reads it: it is no longer carried
+    mock_chat_manager._page.evaluate = AsyncMock(return_value="Old-Unread")
+    assert await mock_chat_manager.open("old-unread")
+    rows = await mock_chat_manager._crawl_chat_list()
+    assert [r["title"] for r in rows] == ["new", "read"]
+
+
+@pytest.mark.asyncio
+async def test_crawl_chat_list_respects_row_limit(mock_chat_manager):
+    mock_chat_manager._extract_chat_rows = AsyncMock(
+        return_value=[_raw_row(title=f"R{i}", is_bold=True) for i in range(10)]
+    )
+
+    rows = await mock_chat_manager._crawl_chat_list(max_rows=4)
+
+    assert len(rows) == 4
+    assert not mock_chat_manager.last_crawl_complete
+
+
+@pytest.mark.asyncio
+async def test_check_unread_chats_filter_strategy_restores_previous_filter(mock_chat_manager):
+    wa = mock_chat_manager.wa_elements
+    wa.get_active_chat_filter = AsyncMock(return_value="groups")
+    wa.click_chat_filter = AsyncMock(return_value=True)
+    # In the Unread view every row is unread, heuristics are not needed
+    mock_chat_manager._extract_chat_rows = AsyncMock(
+        return_value=[_raw_row(title="A"), _raw_row(title="B")]
+    )
+
+    chats = await mock_chat_manager._check_unread_chats(
+        debug=False, full_crawl=False, strategy="filter"
+    )
+
+    assert [c["name"] for c in chats] == ["A", "B"]
+    assert [c.args[0] for c in wa.click_chat_filter.await_args_list] == ["unread", "groups"]
+
+
+@pytest.mark.asyncio
+async def test_check_unread_chats_filter_strategy_falls_back_to_scan(mock_chat_manager):
+    wa = mock_chat_manager.wa_elements
+    wa.get_active_chat_filter = AsyncMock(return_value=None)
+    wa.click_chat_filter = AsyncMock()
+    mock_chat_manager._page.locator = MagicMock()
+    mock_chat_manager._page.locator.return_value.wait_for = AsyncMock()
+    mock_chat_manager._extract_chat_rows = AsyncMock(return_value=[
+        _raw_row(title="A", has_unread_aria=True),
+        _raw_row(title="B"),
+        _raw_row(title="C"),
+    ])
+
+    chats = await mock_chat_manager._check_unread_chats(
+        debug=False, full_crawl=False, strategy="filter"
+    )
+
+    assert [c["name"] for c in chats] == ["A"]
+    wa.click_chat_filter.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_collect_messages_extracts_all_containers_in_one_evaluate(mock_chat_manager):
+    page = mock_chat_manager._page
+    rows = [
+        {"id": "m1", "testid": "conv-msg-1", "pre_plain_text": "[10:00] Ana: ", "text": "Hola"},
+        {"id": "m2", "testid": "conv-msg-2", "pre_plain_text": "", "text": "Sigo yo"},
+    ]
+
+    async def evaluate(script, arg=None):
+        if script == COLLECT_MESSAGES_JS:
+            return {"chat": "Ana", "messages": rows}
+        return 2  # container count / scroll helpers
+
+    page.evaluate = AsyncMock(side_effect=evaluate)
+
+    messages = await mock_chat_manager.collect_messages()
+
+    assert [m.msg_id for m in messages] == ["m1", "m2"]
+    # Sender carries over to consecutive messages without a header
+    assert [m.sender for m in messages] == ["Ana", "Ana"]
+    # Messages are detached: no ElementHandles are fetched or kept
+    page.query_selector_all.assert_not_called()
+    assert not hasattr(messages[0], "__dict__")
+
+
+def _pane_evaluate(page, panes):
+    """Stub page.evaluate returning successive message panes."""
+    scripts = []
+
+    async def evaluate(script, arg=None):
+        scripts.append(script)
+        if script == COLLECT_MESSAGES_JS:
+            return panes.pop(0)
+        return 1
+
+    page.evaluate = AsyncMock(side_effect=evaluate)
+    return scripts
+
+
+def _msg_row(msg_id, text):
+    return {"id": msg_id, "testid": "conv-msg-" + msg_id, "pre_plain_text": "[10:00] Ana: ", "text": text}
+
+
+@pytest.mark.asyncio
+async def test_collect_messages_incremental_returns_only_new_messages(mock_chat_manager):
+    page = mock_chat_manager._page
+    first = [_msg_row("m1", "a"), _msg_row("m2", "b")]
+    second = first + [_msg_row("m3", "c")]
+    scripts = _pane_evaluate(page, [
+        {"chat": "Ana", "messages": first},
+        {"chat": "Ana", "messages": second},
+        {"chat": "Ana", "messages": second},
+    ])
+
+    assert [m.msg_id for m in await mock_chat_manager.collect_messages(incremental=True)] == ["m1", "m2"]
+    assert [m.msg_id for m in await mock_chat_manager.collect_messages(incremental=True)] == ["m3"]
+    assert await mock_chat_manager.collect_messages(incremental=True) == []
+    # No scroll-to-top script in incremental mode
+    assert not any("scrollTop = 0" in s for s in scripts)
+
+
+@pytest.mark.asyncio
+async def test_collect_messages_incremental_watermarks_are_per_chat(mock_chat_manager):
+    page = mock_chat_manager._page
+    _pane_evaluate(page, [
+        {"chat": "Ana", "messages": [_msg_row("a1", "x")]},
+        {"chat": "Luis", "messages": [_msg_row("l1", "y")]},
+        {"chat": "Ana", "messages": [_msg_row("a1", "x"), _msg_row("a2", "z")]},
+    ])
+
+    await mock_chat_manager.collect_messages(incremental=True)
+    luis = await mock_chat_manager.collect_messages(incremental=True)
+    ana = await mock_chat_manager.collect_messages(incremental=True)
+
+    assert [m.msg_id for m in luis] == ["l1"]
+    assert [m.msg_id for m in ana] == ["a2"]
+
+
+@pytest.mark.asyncio
+async def test_full_collect_does_not_move_the_watermark(mock_chat_manager):
+    page = mock_chat_manager._page
+    first = [_msg_row("m1", "a")]
+    later = first + [_msg_row("m2", "b"), _msg_row("m3", "c")]
+    _pane_evaluate(page, [
+        {"chat": "Ana", "messages": first},
+        {"chat": "Ana", "messages": later},
+        {"chat": "Ana", "messages": later},
+    ])
+
+    await mock_chat_manager.collect_messages(incremental=True)
+    assert len(await mock_chat_manager.collect_messages()) == 3
+    result = await mock_chat_manager.collect_messages(incremental=True)
+
+    assert [m.msg_id for m in result] == ["m2", "m3"]
+
+
+@pytest.mark.asyncio
+async def test_collect_messages_incremental_lost_watermark_returns_all(mock_chat_manager):
+    page = mock_chat_manager._page
+    _pane_evaluate(page, [
+        {"chat": "Ana", "messages": [_msg_row("m1", "a")]},
+        {"chat": "Ana", "messages": [_msg_row("m7", "b"), _msg_row("m8", "c")]},
+    ])
+
+    await mock_chat_manager.collect_messages(incremental=True)
+    result = await mock_chat_manager.collect_messages(incremental=True)
+
+    assert [m.msg_id for m in result] == ["m7", "m8"]
+
+
+def _history_evaluate(page, history, loads):
+    """Stub the history scripts over a fake rendered pane.
+
+    ``history`` is the full chat (oldest first); ``loads`` is how many older
+    pages the pane can still load, each revealing ``len(history) // (loads+1)``.
+    """
+    from whatsplay.chat_manager import MESSAGES_BEFORE_JS, MESSAGE_PANE_LOAD_OLDER_JS
+
+    state = {"rendered": history[-len(history) // (loads + 1):], "loads": loads}
+    calls = []
+
+    async def evaluate(script, arg=None):
+        calls.append(script)
+        rendered = state["rendered"]
+        if script == MESSAGES_BEFORE_JS:
+            ids = [r["id"] for r in rendered]
+            end = ids.index(arg["before"]) if arg["before"] else len(rendered)
+            return rendered[max(0, end - arg["size"]):end]
+        if script == MESSAGE_PANE_LOAD_OLDER_JS:
+            if not state["loads"]:
+                return False
+            state["loads"] -= 1
+            start = history.index(rendered[0])
+            state["rendered"] = history[max(0, start - len(rendered)):]
+            return True
+        return None
+
+    page.evaluate = AsyncMock(side_effect=evaluate)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_pages_backwards_through_history(mock_chat_manager):
+    from whatsplay.chat_manager import MESSAGE_PANE_LOAD_OLDER_JS
+
+    history = [_msg_row("m%d" % i, str(i)) for i in range(9)]
+    calls = _history_evaluate(mock_chat_manager._page, history, loads=2)
+
+    ids = [m.msg_id async for m in mock_chat_manager.iter_messages(batch_size=2)]
+
+    assert ids == ["m%d" % i for i in reversed(range(9))]
+    assert calls.count(MESSAGE_PANE_LOAD_OLDER_JS) == 3  # last one hits the top
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_stops_at_limit_without_loading_more(mock_chat_manager):
+    from whatsplay.chat_manager import MESSAGE_PANE_LOAD_OLDER_JS
+
+    history = [_msg_row("m%d" % i, str(i)) for i in range(9)]
+    calls = _history_evaluate(mock_chat_manager._page, history, loads=2)
+
+    ids = [m.msg_id async for m in mock_chat_manager.iter_messages(limit=2, batch_size=5)]
+
+    assert ids == ["m8", "m7"]
+    assert MESSAGE_PANE_LOAD_OLDER_JS not in calls
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_stops_at_since(mock_chat_manager):
+    history = [
+        dict(_msg_row("m%d" % i, str(i)), pre_plain_text="[10:0%d] Ana: " % i)
+        for i in range(6)
+    ]
+    _history_evaluate(mock_chat_manager._page, history, loads=1)
+    since = datetime.now().replace(hour=10, minute=3, second=0, microsecond=0)
+
+    ids = [m.msg_id async for m in mock_chat_manager.iter_messages(since=since)]
+
+    assert ids == ["m5", "m4", "m3"]
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_since_uses_the_message_date(mock_chat_manager):
+    history = [
+        dict(_msg_row("old", "a"), pre_plain_text="[11:00, 2/1/2024] Ana: "),
+        dict(_msg_row("new", "b"), pre_plain_text="[09:00, 3/1/2024] Ana: "),
+    ]
+    _history_evaluate(mock_chat_manager._page, history, loads=0)
+
+    ids = [m.msg_id async for m in mock_chat_manager.iter_messages(since=datetime(2024, 1, 3))]
+
+    assert ids == ["new"]
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_reopens_chat_closed_between_batches(mock_chat_manager):
+    from whatsplay.chat_manager import MESSAGE_PANE_LOAD_OLDER_JS
+
+    history = [_msg_row("m%d" % i, str(i)) for i in range(6)]
+    calls = _history_evaluate(mock_chat_manager._page, history, loads=2)
+    mock_chat_manager.open = AsyncMock(return_value=True)
+
+    messages = mock_chat_manager.iter_messages("Ana", batch_size=2)
+    assert [(await messages.__anext__()).msg_id for _ in range(2)] == ["m5", "m4"]
+    assert mock_chat_manager._pinned_chats == ["Ana"]
+
+    # Another operation reopened the chat: only its last page is rendered
+    _history_evaluate(mock_chat_manager._page, history, loads=2)
+    ids = [m.msg_id async for m in messages]
+
+    assert ids == ["m3", "m2", "m1", "m0"]
+    assert mock_chat_manager.open.await_count == 4
+    assert mock_chat_manager._pinned_chats == []
+    assert MESSAGE_PANE_LOAD_OLDER_JS not in calls
+
+
+@pytest.mark.asyncio
+async def test_check_unread_chats_keeps_watched_chat_open(mock_chat_manager):
+    mock_chat_manager.client.chat_watcher = MagicMock(chat="Soporte")
+    mock_chat_manager.close = AsyncMock()
+    mock_chat_manager._unread_rows_by_filter = AsyncMock(return_value=[])
+
+    await mock_chat_manager._check_unread_chats(debug=False)
+
+    mock_chat_manager.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_check_unread_chats_keeps_pinned_chat_open(mock_chat_manager):
+    mock_chat_manager._pinned_chats.append("Ana")
+    mock_chat_manager.current_chat_title = AsyncMock(return_value="ana")
+    mock_chat_manager.close = AsyncMock()
+    mock_chat_manager._unread_rows_by_filter = AsyncMock(return_value=[])
+
+    await mock_chat_manager._check_unread_chats(debug=False)
+
+    mock_chat_manager.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_leave_chat_reopens_watched_chat(mock_chat_manager):
+    missed = [MagicMock()]
+    mock_chat_manager.client.chat_watcher = MagicMock(chat="Soporte")
+    mock_chat_manager.client.chat_watcher.reopen = AsyncMock(return_value=missed)
+    mock_chat_manager.close = AsyncMock()
+
+    assert await mock_chat_manager._leave_chat() == missed
+    mock_chat_manager.close.assert_not_called()
+
+
 @pytest.mark.asyncio
-async def test_parse_search_result_individual_chat(mock_chat_manager):
-    # Simular un elemento de chat individual (2 componentes)
-    mock_element = AsyncMock()
-    
-    # Mock de components[0] (título y datetime)
-    mock_component0 = AsyncMock()
-    mock_span_title0 = AsyncMock()
-    mock_span_title0.get_attribute.return_value = "Contacto Individual"
-    mock_component0.query_selector.return_value = mock_span_title0
-    
-    mock_datetime_child = AsyncMock()
-    mock_datetime_child.text_content.return_value = "10:30 AM"
-    mock_component0.query_selector_all.return_value = [MagicMock(), mock_datetime_child]
-
-    # Mock de components[1] (info_text)
-    mock_component1 = AsyncMock()
-    mock_info_child = AsyncMock()
-    mock_info_child.text_content.return_value = "Hola, ¿cómo estás?"
-    mock_component1.query_selector_all.return_value = [mock_info_child]
-
-    mock_element.query_selector_all.return_value = [mock_component0, mock_component1]
-
-    # Mock de unread_el
-    mock_unread_el = AsyncMock()
-    mock_unread_el.inner_text.return_value = "5"
-    mock_element.query_selector.return_value = mock_unread_el
-
-    result = await mock_chat_manager._parse_search_result(mock_element)
-
-    assert result is not None
-    assert result["type"] == "CHATS"
-    assert result["name"] == "Contacto Individual"
-    assert result["last_activity"] == "10:30 AM"
-    assert result["last_message"] == "Hola, ¿cómo estás?"
-    assert result["unread_count"] == "5"
-    assert result["group"] is None
-
-@pytest.mark.asyncio
-async def test_parse_search_result_group_chat(mock_chat_manager):
-    # Simular un elemento de chat de grupo (3 componentes)
-    mock_element = AsyncMock()
-
-    # Mock de components[0] (group_title y datetime)
-    mock_component0 = AsyncMock()
-    mock_span_title0 = AsyncMock()
-    mock_span_title0.get_attribute.return_value = "Nombre del Grupo"
-    mock_component0.query_selector.return_value = mock_span_title0
-
-    mock_datetime_child = AsyncMock()
-    mock_datetime_child.text_content.return_value = "Ayer"
-    mock_component0.query_selector_all.return_value = [MagicMock(), mock_datetime_child]
-
-    # Mock de components[1] (title - que es el mismo que el grupo en este caso)
-    mock_component1 = AsyncMock()
-    mock_span_title1 = AsyncMock()
-    mock_span_title1.get_attribute.return_value = "Nombre del Grupo"
-    mock_component1.query_selector.return_value = mock_span_title1
-
-    # Mock de components[2] (info_text con remitente)
-    mock_component2 = AsyncMock()
-    mock_component2.text_content.return_value = "Juan Pérez: Mensaje del grupo"
-
-    mock_element.query_selector_all.return_value = [mock_component0, mock_component1, mock_component2]
-
-    # Mock de unread_el
-    mock_unread_el = AsyncMock()
-    mock_unread_el.inner_text.return_value = "12"
-    mock_element.query_selector.return_value = mock_unread_el
-
-    result = await mock_chat_manager._parse_search_result(mock_element)
-
-    assert result is not None
-    assert result["type"] == "CHATS"
-    assert result["group"] == "Nombre del Grupo"
-    assert result["name"] == "Nombre del Grupo"
-    assert result["last_activity"] == "Ayer"
-    assert result["last_message"] == "Juan Pérez: Mensaje del grupo"
-    assert result["unread_count"] == "12"
-
-@pytest.mark.asyncio
-async def test_parse_search_result_group_chat_with_different_sender(mock_chat_manager):
-    # Simular un elemento de chat de grupo (3 componentes) donde el remitente es diferente al título del grupo
-    mock_element = AsyncMock()
-
-    # Mock de components[0] (group_title y datetime)
-    mock_component0 = AsyncMock()
-    mock_span_title0 = AsyncMock()
-    mock_span_title0.get_attribute.return_value = "Mi Grupo de Amigos"
-    mock_component0.query_selector.return_value = mock_span_title0
-
-    mock_datetime_child = AsyncMock()
-    mock_datetime_child.text_content.return_value = "Hoy"
-    mock_component0.query_selector_all.return_value = [MagicMock(), mock_datetime_child]
-
-    # Mock de components[1] (title - que es el mismo que el grupo en este caso)
-    mock_component1 = AsyncMock()
-    mock_span_title1 = AsyncMock()
-    mock_span_title1.get_attribute.return_value = "Mi Grupo de Amigos"
-    mock_component1.query_selector.return_value = mock_span_title1
-
-    # Mock de components[2] (info_text con remitente diferente al título del grupo)
-    mock_component2 = AsyncMock()
-    mock_component2.text_content.return_value = "Ana: Hola a todos!"
-
-    mock_element.query_selector_all.return_value = [mock_component0, mock_component1, mock_component2]
-
-    # Mock de unread_el
-    mock_unread_el = AsyncMock()
-    mock_unread_el.inner_text.return_value = "3"
-    mock_element.query_selector.return_value = mock_unread_el
-
-    result = await mock_chat_manager._parse_search_result(mock_element)
-
-    assert result is not None
-    assert result["type"] == "CHATS"
-    assert result["group"] == "Mi Grupo de Amigos" # Sigue siendo un grupo
-    assert result["name"] == "Mi Grupo de Amigos"
-    assert result["last_activity"] == "Hoy"
-    assert result["last_message"] == "Ana: Hola a todos!"
-    assert result["unread_count"] == "3"
-
-@pytest.mark.asyncio
-async def test_parse_search_result_individual_chat_with_colon_in_message(mock_chat_manager):
-    # Simular un chat individual donde el mensaje contiene dos puntos, pero no es un grupo
-    mock_element = AsyncMock()
-    
-    # Mock de components[0] (título y datetime)
-    mock_component0 = AsyncMock()
-    mock_span_title0 = AsyncMock()
-    mock_span_title0.get_attribute.return_value = "Contacto Individual"
-    mock_component0.query_selector.return_value = mock_span_title0
-    
-    mock_datetime_child = AsyncMock()
-    mock_datetime_child.text_content.return_value = "11:00 AM"
-    mock_component0.query_selector_all.return_value = [MagicMock(), mock_datetime_child]
-
-    # Mock de components[1] (info_text con dos puntos, pero sin remitente)
-    mock_component1 = AsyncMock()
-    mock_info_child = AsyncMock()
-    mock_info_child.text_content.return_value = "Mensaje: con dos puntos"
-    mock_component1.query_selector_all.return_value = [mock_info_child]
-
-    mock_element.query_selector_all.return_value = [mock_component0, mock_component1]
-
-    # Mock de unread_el
-    mock_unread_el = AsyncMock()
-    mock_unread_el.inner_text.return_value = "1"
-    mock_element.query_selector.return_value = mock_unread_el
-
-    result = await mock_chat_manager._parse_search_result(mock_element)
-
-    assert result is not None
-    assert result["type"] == "CHATS"
-    assert result["name"] == "Contacto Individual"
-    assert result["last_activity"] == "11:00 AM"
-    assert result["last_message"] == "Mensaje: con dos puntos"
-    assert result["unread_count"] == "1"
-    assert result["group"] is None
+async def test_send_message_keeps_chat_open_until_sent_tick(mock_chat_manager):
+    from whatsplay.receipts import RECEIPT_SENT, DeliveryReceipt
+
+    manager = mock_chat_manager
+    manager.open = AsyncMock(return_value=True)
+    manager._leave_chat = AsyncMock(return_value=[])
+    manager._page.wait_for_selector.return_value = AsyncMock()
+    receipt = DeliveryReceipt("true_1@c.us_NEW", "Ana")
+    manager.receipts = MagicMock()
+    manager.receipts.last_outgoing_id = AsyncMock(return_value="true_1@c.us_OLD")
+    manager.receipts.wait_new_outgoing_id = AsyncMock(return_value="true_1@c.us_NEW")
+    manager.receipts.track = AsyncMock(return_value=receipt)
+
+    async def confirm_later():
+        await asyncio.sleep(0.01)
+        # The bubble is still on screen: the chat has not been left yet
+        assert manager.client.scheduler.locked()
+        manager._leave_chat.assert_not_awaited()
+        receipt.update(RECEIPT_SENT)
+
+    confirmer = asyncio.create_task(confirm_later())
+
+    assert await manager.send_message("Ana", "Hola", timeout=1) is True
+    await confirmer
+    manager.receipts.wait_new_outgoing_id.assert_awaited_once()
+    assert manager.receipts.wait_new_outgoing_id.call_args[0][0] == "true_1@c.us_OLD"
+    manager.receipts.track.assert_awaited_once_with("true_1@c.us_NEW", "Ana")
+    manager._leave_chat.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_send_message_without_rendered_bubble_fails(mock_chat_manager):
+    manager = mock_chat_manager
+    manager.open = AsyncMock(return_value=True)
+    manager._leave_chat = AsyncMock(return_value=[])
+    manager._page.wait_for_selector.return_value = AsyncMock()
+    manager.receipts = MagicMock()
+    manager.receipts.last_outgoing_id = AsyncMock(return_value=None)
+    manager.receipts.wait_new_outgoing_id = AsyncMock(return_value=None)
+    manager._page.wait_for_selector.return_value.inner_text.return_value = "Hola"
+
+    assert await manager.send_message("Ana", "Hola", wait_for=None) is False
+
+
+@pytest.mark.asyncio
+async def test_send_message_taken_but_not_found_is_not_reported_failed(mock_chat_manager):
+    manager = mock_chat_manager
+    manager.open = AsyncMock(return_value=True)
+    manager._leave_chat = AsyncMock(return_value=[])
+    manager._page.wait_for_selector.return_value = AsyncMock()
+    manager._page.wait_for_selector.return_value.inner_text.return_value = ""
+    manager.receipts = MagicMock()
+    manager.receipts.last_outgoing_id = AsyncMock(return_value=None)
+    manager.receipts.wait_new_outgoing_id = AsyncMock(return_value=None)
+
+    receipt = await manager.send_message_tracked("Ana", "Hola")
+
+    assert receipt is not None and receipt.msg_id == ""
+    assert await manager.send_message("Ana", "Hola") is True
+
+
+@pytest.mark.asyncio
+async def test_check_unread_chats_gives_up_when_page_stays_busy(mock_chat_manager):
+    mock_chat_manager.sweep_deadline = 0.01
+    await mock_chat_manager.client.scheduler.acquire(name="long scrape")
+
+    assert await mock_chat_manager._check_unread_chats(debug=False) == []
+    assert mock_chat_manager.last_sweep_ok is False
+
+
+@pytest.mark.asyncio
+async def test_open_reuses_chat_already_open(mock_chat_manager):
+    mock_chat_manager._page.evaluate = AsyncMock(return_value="Ana")
+    mock_chat_manager.wa_elements = MagicMock(open=AsyncMock(return_value=True))
+
+    assert await mock_chat_manager.open(" ana ") is True
+    mock_chat_manager.wa_elements.open.assert_not_called()
+    assert mock_chat_manager.current_chat == "Ana"
+
+
+@pytest.mark.asyncio
+async def test_open_other_chat_goes_through_search(mock_chat_manager):
+    mock_chat_manager._page.evaluate = AsyncMock(side_effect=["Ana", "Luis"])
+    mock_chat_manager.wa_elements = MagicMock(open=AsyncMock(return_value=True))
+
+    assert await mock_chat_manager.open("Luis") is True
+    mock_chat_manager.wa_elements.open.assert_awaited_once()
+    assert mock_chat_manager.current_chat == "Luis"
+
+
+@pytest.mark.asyncio
+async def test_close_skips_escape_when_no_chat_is_open(mock_chat_manager):
+    mock_chat_manager._page.evaluate = AsyncMock(return_value=None)
+
+    await mock_chat_manager.close()
+
+    mock_chat_manager._page.keyboard.press.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_leave_chat_keeps_chat_open_for_reuse(mock_chat_manager):
+    mock_chat_manager.close = AsyncMock()
+
+    assert await mock_chat_manager._leave_chat() == []
+    mock_chat_manager.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_check_unread_chats_flushes_and_closes_lingering_chat(mock_chat_manager):
+    pipeline = MagicMock(enabled=True, watermarks={"Ana": "m1"})
+    mock_chat_manager.client.message_pipeline = pipeline
+    mock_chat_manager.current_chat_title = AsyncMock(return_value="Ana")
+    mock_chat_manager.collect_messages = AsyncMock(return_value=["m2"])
+    mock_chat_manager.close = AsyncMock()
+    mock_chat_manager._unread_rows_by_filter = AsyncMock(return_value=[])
+
+    await mock_chat_manager._check_unread_chats(debug=False)
+
+    mock_chat_manager.collect_messages.assert_awaited_once_with(
+        incremental=True, chat="Ana", watermarks=pipeline.watermarks
+    )
+    pipeline.offer.assert_called_once_with(["m2"])
+    mock_chat_manager.close.assert_awaited_once_with(force=True)
+
+
+@pytest.mark.asyncio
+async def test_open_uses_and_updates_chat_index(mock_chat_manager):
+    from whatsplay.chat_index import ROUTE_SEARCH, ROUTE_URL
+
+    manager = mock_chat_manager
+    manager._page.evaluate = AsyncMock(side_effect=[None, "Ana"])
+    manager.chat_index.record("5491122", ROUTE_URL, title="Ana")
+    manager.wa_elements = MagicMock(open=AsyncMock(return_value=True), last_open_route=ROUTE_SEARCH)
+
+    assert await manager.open("5491122") is True
+
+    kwargs = manager.wa_elements.open.call_args.kwargs
+    assert kwargs["route"] == ROUTE_URL and kwargs["title"] == "Ana"
+    assert manager.chat_index.route("5491122") == ROUTE_SEARCH
+
+
+@pytest.mark.asyncio
+async def test_open_failure_forgets_route(mock_chat_manager):
+    from whatsplay.chat_index import ROUTE_URL
+
+    manager = mock_chat_manager
+    manager._page.evaluate = AsyncMock(return_value=None)
+    manager.chat_index.record("5491122", ROUTE_URL)
+    manager.wa_elements = MagicMock(open=AsyncMock(return_value=False))
+
+    assert await manager.open("5491122") is False
+    assert "5491122" not in manager.chat_index
+
+
+@pytest.mark.asyncio
+async def test_open_skips_targets_that_definitely_failed(mock_chat_manager):
+    from whatsplay.open_guard import OPEN_ERROR_INVALID_NUMBER
+
+    manager = mock_chat_manager
+    manager._page.evaluate = AsyncMock(return_value=None)
+    manager.wa_elements = MagicMock(
+        open=AsyncMock(return_value=False), last_open_error=OPEN_ERROR_INVALID_NUMBER
+    )
+
+    assert await manager.open("+54 11 0000", open_via_url=True) is False
+    assert await manager.open("54110000", open_via_url=True) is False
+    manager.wa_elements.open.assert_awaited_once()
+
+    manager.reset_open_failures("54110000")
+    await manager.open("54110000", open_via_url=True)
+    assert manager.wa_elements.open.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_stops_retrying_timeouts(mock_chat_manager):
+    from whatsplay.open_guard import OPEN_ERROR_TIMEOUT
+
+    manager = mock_chat_manager
+    manager._page.evaluate = AsyncMock(return_value=None)
+    manager.wa_elements = MagicMock(open=AsyncMock(return_value=False), last_open_error=OPEN_ERROR_TIMEOUT)
+
+    for _ in range(manager.breaker.threshold + 2):
+        await manager.open("Ana")
+
+    assert manager.wa_elements.open.await_count == manager.breaker.threshold
+
+
+@pytest.mark.asyncio
+async def test_open_releases_half_open_trial_that_raised(mock_chat_manager):
+    from whatsplay.open_guard import BREAKER_HALF_OPEN
+
+    manager = mock_chat_manager
+    manager._page.evaluate = AsyncMock(return_value=None)
+    manager.breaker.cooldown = 0
+    for _ in range(manager.breaker.threshold):
+        manager.breaker.record_failure("ana")
+    manager.wa_elements = MagicMock(open=AsyncMock(side_effect=asyncio.CancelledError))
+
+    with pytest.raises(asyncio.CancelledError):
+        await manager.open("Ana")
+
+    assert manager.breaker.state("ana") == BREAKER_HALF_OPEN
+    assert manager.breaker.allow("ana")
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_header_instead_of_sleeping(mock_chat_manager):
+    mock_chat_manager._page.evaluate = AsyncMock(return_value="Ana")
+
+    await mock_chat_manager.close()
+
+    mock_chat_manager._page.keyboard.press.assert_awaited_once_with("Escape")
+    mock_chat_manager._page.wait_for_function.assert_awaited_once()
+    assert mock_chat_manager.current_chat is None
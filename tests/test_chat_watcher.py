@@ -0,0 +1,101 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from whatsplay.scheduler import PageScheduler
+from whatsplay.chat_watcher import WATCH_BINDING_NAME, ChatWatcher
+from whatsplay.message_pipeline import SeenCache
+from whatsplay.object.message import Message
+
+
+def _msg(msg_id, outgoing=False):
+    return Message(MagicMock(), "Ana", datetime.now(), msg_id, is_outgoing=outgoing, msg_id=msg_id)
+
+
+def _node(msg_id, outgoing=False):
+    return {
+        "id": msg_id,
+        "testid": "conv-msg-" + msg_id,
+        "pre_plain_text": "" if outgoing else "[10:00] Ana: ",
+        "sender_label": "Tú:" if outgoing else "",
+        "text": "hola",
+    }
+
+
+# Mock de un cliente mínimo para ChatWatcher
+class MockClient:
+    def __init__(self):
+        self._page = AsyncMock()
+        self.scheduler = PageScheduler()
+        self.chat_manager = AsyncMock()
+        self.chat_manager.open.return_value = True
+        self.chat_manager.collect_messages.return_value = [_msg("old1"), _msg("old2")]
+        self.message_pipeline = MagicMock()
+        self.message_pipeline.seen = SeenCache()
+        self.message_pipeline.watermarks = {}
+        self.emit = AsyncMock()
+
+
+@pytest.fixture
+def watcher():
+    return ChatWatcher(MockClient())
+
+
+@pytest.mark.asyncio
+async def test_watch_opens_chat_and_seeds_history_without_emitting(watcher):
+    assert await watcher.watch("Soporte") is True
+
+    client = watcher.client
+    assert watcher.chat == "Soporte"
+    client.chat_manager.open.assert_awaited_once_with("Soporte")
+    client._page.expose_binding.assert_awaited_once()
+    assert client._page.expose_binding.call_args[0][0] == WATCH_BINDING_NAME
+    assert "old1" in client.message_pipeline.seen
+    client.emit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_watch_fails_when_chat_cannot_be_opened(watcher):
+    watcher.client.chat_manager.open.return_value = False
+
+    assert await watcher.watch("Nadie") is False
+    assert watcher.chat is None
+
+
+@pytest.mark.asyncio
+async def test_pushed_nodes_are_emitted_once(watcher):
+    await watcher.watch("Soporte")
+
+    await watcher._on_node(None, _node("n1"))
+    await watcher._on_node(None, _node("n1"))
+    await watcher._on_node(None, _node("n2", outgoing=True))
+
+    emitted = [c.args for c in watcher.client.emit.call_args_list]
+    assert len(emitted) == 1
+    assert emitted[0][0] == "on_message"
+    assert emitted[0][1].msg_id == "n1"
+    assert emitted[0][1].chat == "Soporte"
+    assert watcher.client.message_pipeline.watermarks["Soporte"] == "n2"
+
+
+@pytest.mark.asyncio
+async def test_nodes_are_ignored_after_unwatch(watcher):
+    await watcher.watch("Soporte")
+    await watcher.unwatch()
+
+    await watcher._on_node(None, _node("n1"))
+
+    watcher.client.emit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reopen_returns_missed_incoming_messages(watcher):
+    await watcher.watch("Soporte")
+    watcher.client.chat_manager.collect_messages.return_value = [
+        _msg("old2"), _msg("m3"), _msg("m4", outgoing=True)
+    ]
+
+    missed = await watcher.reopen()
+
+    assert [m.msg_id for m in missed] == ["m3"]
+    # Only one binding per page
+    watcher.client._page.expose_binding.assert_awaited_once()
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+from whatsplay.dom_observer import BINDING_NAME, DomObserver
+
+
+@pytest.fixture
+def observer():
+    return DomObserver(AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_install_exposes_binding_and_script_once(observer):
+    await observer.install()
+    await observer.install()
+
+    observer.page.expose_binding.assert_called_once()
+    assert observer.page.expose_binding.call_args[0][0] == BINDING_NAME
+    observer.page.add_init_script.assert_called_once()
+    script = observer.page.add_init_script.call_args[0][0]
+    assert "MutationObserver" in script
+    assert BINDING_NAME in script
+    assert observer.installed
+
+
+@pytest.mark.asyncio
+async def test_state_notification_wakes_waiter(observer):
+    async def push():
+        await asyncio.sleep(0.01)
+        observer._on_notify(None, {"kind": "state", "state": "LOGGED_IN"})
+
+    asyncio.ensure_future(push())
+    assert await observer.wait(1) is True
+    assert observer.last_state == "LOGGED_IN"
+
+
+@pytest.mark.asyncio
+async def test_sidebar_notification_is_counted(observer):
+    observer._on_notify(None, {"kind": "sidebar"})
+
+    assert observer.sidebar_changes == 1
+    assert await observer.wait(1) is True
+    # The signal is consumed by the wait
+    assert await observer.wait(0.01) is False
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_without_notification(observer):
+    assert await observer.wait(0.01) is False
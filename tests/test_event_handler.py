@@ -0,0 +1,173 @@
+import asyncio
+import pytest
+from whatsplay.events.event_handler import Event, EventHandler
+
+
+@pytest.mark.asyncio
+async def test_sequential_emit_awaits_listeners_and_records_timing():
+    event = Event()
+    calls = []
+
+    async def listener(value):
+        calls.append(value)
+
+    event.add_listener(listener)
+    await event.emit(1)
+
+    assert calls == [1]
+    stats = event.stats[listener]
+    assert stats["calls"] == 1 and stats["errors"] == 0
+    assert stats["name"] == listener.__qualname__
+
+
+@pytest.mark.asyncio
+async def test_concurrent_emit_does_not_wait_for_slow_listener():
+    event = Event()
+    event.configure(max_concurrency=2)
+    release = asyncio.Event()
+    done = []
+
+    async def slow(value):
+        await release.wait()
+        done.append(value)
+
+    event.add_listener(slow)
+    await asyncio.wait_for(event.emit("a"), 0.1)
+    assert event.pending == 1 and done == []
+
+    release.set()
+    await event.drain()
+    assert done == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_respected():
+    event = Event()
+    event.configure(max_concurrency=2, max_backlog=10)
+    running, peak = 0, 0
+
+    async def listener(_):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    event.add_listener(listener)
+    for i in range(6):
+        await event.emit(i)
+    await event.drain()
+
+    assert peak == 2
+    assert event.stats[listener]["calls"] == 6
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overflow,expected", [("drop_oldest", [0, 2, 3]), ("coalesce", [0, 3])])
+async def test_overflow_policies(overflow, expected):
+    event = Event()
+    event.configure(max_concurrency=1, max_backlog=2, overflow=overflow)
+    release = asyncio.Event()
+    seen = []
+
+    async def listener(value):
+        await release.wait()
+        seen.append(value)
+
+    event.add_listener(listener)
+    for i in range(4):
+        await event.emit(i)
+    release.set()
+    await event.drain()
+
+    assert seen == expected
+    assert event.dropped == 4 - len(expected)
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_room():
+    event = Event()
+    event.configure(max_concurrency=1, max_backlog=1, overflow="block")
+    release = asyncio.Event()
+
+    async def listener(_):
+        await release.wait()
+
+    event.add_listener(listener)
+    await event.emit(0)  # running
+    await event.emit(1)  # queued
+    blocked = asyncio.ensure_future(event.emit(2))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    release.set()
+    await asyncio.wait_for(blocked, 0.5)
+    await event.drain()
+    assert event.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_listener_errors_are_counted_not_raised():
+    handler = EventHandler(["on_tick"])
+    handler.configure_event("on_tick")
+
+    @handler.event("on_tick")
+    async def broken():
+        raise RuntimeError("boom")
+
+    await handler.emit("on_tick")
+    await handler._events["on_tick"].drain()
+
+    (stats,) = handler.event_stats()["on_tick"]["listeners"]
+    assert stats["name"] == broken.__qualname__ and stats["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_listeners_sharing_a_name_keep_separate_stats():
+    event = Event()
+
+    def make(fails):
+        async def listener():
+            if fails:
+                raise RuntimeError("boom")
+        return listener
+
+    ok, broken = make(False), make(True)
+    event.add_listener(ok)
+    await event.emit()
+    event.add_listener(broken)
+    with pytest.raises(RuntimeError):
+        await event.emit()
+
+    assert ok.__qualname__ == broken.__qualname__
+    assert event.stats[ok]["calls"] == 2 and event.stats[ok]["errors"] == 0
+    assert event.stats[broken]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_drain_events_cancels_calls_still_running_after_timeout():
+    handler = EventHandler(["on_fast", "on_slow"])
+    handler.configure_event("on_fast")
+    handler.configure_event("on_slow", max_concurrency=1)
+    done = []
+
+    @handler.event("on_fast")
+    async def fast():
+        done.append("fast")
+
+    @handler.event("on_slow")
+    async def slow():
+        await asyncio.sleep(10)
+
+    await handler.emit("on_fast")
+    await handler.emit("on_slow")
+    await handler.emit("on_slow")
+    await handler.drain_events(timeout=0.05)
+
+    assert done == ["fast"]
+    assert handler._events["on_slow"].pending == 0
+
+
+def test_configure_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        Event().configure(overflow="later")
@@ -0,0 +1,76 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from whatsplay.events.event_handler import Event
+from whatsplay.filters import (
+    AndFilter,
+    ChatFilter,
+    CustomFilter,
+    OutgoingFilter,
+    SenderFilter,
+    TextFilter,
+    TypeFilter,
+)
+from whatsplay.object.message import FileMessage, Message
+
+
+def _msg(text, sender="Ana", chat="Soporte", outgoing=False):
+    msg = Message(MagicMock(), sender, datetime.now(), text, is_outgoing=outgoing, msg_id=text)
+    msg.chat = chat
+    return msg
+
+
+def test_field_filters_on_messages_and_chats():
+    msg = _msg("Necesito AYUDA urgente")
+    chat = {"name": "Ana", "group": None, "last_message": "hola", "last_message_type": "audio"}
+
+    assert SenderFilter("ana").test(msg)
+    assert ChatFilter("Soporte").test(msg) and ChatFilter("ana").test(chat)
+    assert TextFilter(r"\bayuda\b").test(msg) and not TextFilter("ayuda").test(chat)
+    assert TypeFilter("text").test(msg) and TypeFilter("audio").test(chat)
+    assert TypeFilter("file").test(FileMessage(MagicMock(), "Ana", datetime.now(), "", filename="a.pdf"))
+    assert OutgoingFilter(False).test(msg) and not OutgoingFilter().test(msg)
+
+
+def test_combinators_flatten_and_share_keys():
+    f = SenderFilter("Ana") & ChatFilter("Soporte") & SenderFilter("ana")
+    assert isinstance(f, AndFilter) and len(f.filters) == 2
+    assert (ChatFilter("x") | ChatFilter("y")).key == (ChatFilter("y") | ChatFilter("x")).key
+    assert (~OutgoingFilter()).test(_msg("hi"))
+    assert (~~OutgoingFilter()).key == OutgoingFilter().key
+
+
+def test_evaluate_memoizes_shared_sub_filters():
+    calls = []
+    func = lambda m: calls.append(m) or True
+    cache = {}
+    msg = _msg("hi")
+
+    assert (CustomFilter(func) & SenderFilter("Ana")).evaluate(msg, cache)
+    assert (CustomFilter(func) | ChatFilter("Otro")).evaluate(msg, cache)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_emit_filters_single_item_and_lists():
+    event = Event()
+    got = []
+
+    async def support(arg):
+        got.append(("support", arg))
+
+    async def rest(arg):
+        got.append(("rest", arg))
+
+    event.add_listener(support, ChatFilter("Soporte"))
+    event.add_listener(rest, ~ChatFilter("Soporte"))
+
+    msg = _msg("hi")
+    await event.emit(msg)
+    await event.emit([{"name": "Soporte"}, {"name": "Ana"}])
+
+    assert got == [
+        ("support", msg),
+        ("support", [{"name": "Soporte"}]),
+        ("rest", [{"name": "Ana"}]),
+    ]
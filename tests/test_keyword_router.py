@@ -0,0 +1,99 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from whatsplay.events.event_handler import EventHandler
+from whatsplay.filters import CommandRouter, KeywordFilter, KeywordMatcher, OutgoingFilter
+from whatsplay.object.message import Message
+
+
+def _msg(text, outgoing=False):
+    return Message(MagicMock(), "Ana", datetime.now(), text, is_outgoing=outgoing, msg_id=text)
+
+
+def test_matcher_finds_overlapping_keywords_in_one_pass():
+    matcher = KeywordMatcher(["he", "she", "hers", "his"], whole_words=False)
+
+    found = [(start, keyword) for start, _, keyword, _ in matcher.find_all("USHERS")]
+
+    assert found == [(1, "she"), (2, "he"), (2, "hers")]
+    assert not matcher.matches("xyz")
+
+
+def test_matcher_outputs_stay_correct_after_adding_keywords():
+    matcher = KeywordMatcher(["he", "she"], whole_words=False)
+    assert len(matcher.find_all("ushers")) == 2
+
+    matcher.add("x")
+    matcher.add("hers")
+
+    found = [keyword for _, _, keyword, _ in matcher.find_all("ushers")]
+    assert found == ["she", "he", "hers"]
+
+
+def test_matcher_whole_words_and_phrases():
+    matcher = KeywordMatcher(["precio", "a qué hora abren"])
+
+    assert matcher.matches("¿Precio del envío?")
+    assert not matcher.matches("preciosa foto")
+    assert matcher.search("hola, A QUÉ HORA ABREN mañana")[2] == "a qué hora abren"
+
+
+
+def test_matcher_offsets_refer_to_the_original_text():
+    matcher = KeywordMatcher(["strasse", "precio"])
+    text = "Die Straße, PRECIO?"
+
+    found = [(text[start:end], keyword) for start, end, keyword, _ in matcher.find_all(text)]
+
+    assert found == [("Straße", "strasse"), ("PRECIO", "precio")]
+
+def test_matcher_scales_to_many_keywords():
+    matcher = KeywordMatcher(f"producto{i}" for i in range(5000))
+
+    assert len(matcher) == 5000
+    assert matcher.search("quiero el producto4321 ya")[2] == "producto4321"
+    assert not matcher.matches("quiero el producto50000")
+
+
+def test_keyword_filter_key_and_chats():
+    f = KeywordFilter("Ayuda", "soporte")
+
+    assert f.key == KeywordFilter("soporte", "ayuda").key
+    assert f.test(_msg("necesito ayuda"))
+    assert f.test({"name": "Ana", "last_message": "hablar con soporte"})
+    assert not f.test(_msg("todo bien"))
+
+
+@pytest.mark.asyncio
+async def test_router_commands_take_precedence_over_keywords():
+    router = CommandRouter()
+    price = AsyncMock()
+    hours = AsyncMock()
+    router.command("precio")(price)
+    router.keyword("horario", "abren")(hours)
+
+    msg = _msg("/Precio pizza grande, horario?")
+    assert await router.dispatch(msg) == 1
+    price.assert_awaited_once_with(msg, "pizza grande, horario?")
+    hours.assert_not_awaited()
+
+    msg = _msg("¿horario? ¿a qué hora abren?")
+    assert await router.dispatch(msg) == 1
+    hours.assert_awaited_once_with(msg, "horario")
+
+    assert await router.dispatch(_msg("/desconocido")) == 0
+
+
+@pytest.mark.asyncio
+async def test_router_attaches_as_listener():
+    handler = EventHandler(["on_message"])
+    router = CommandRouter()
+    hello = AsyncMock()
+    router.keyword("hola")(hello)
+    router.attach(handler, filter_obj=~OutgoingFilter())
+
+    await handler.emit("on_message", _msg("hola!", outgoing=True))
+    await handler.emit("on_message", _msg("hola!"))
+
+    assert hello.await_count == 1
+    assert router.filter.test(_msg("hola")) and not router.filter.test(_msg("chau"))
@@ -47,6 +47,13 @@ def test_parse_timestamp_midnight():
     assert result.minute == 0
 
 
+def test_parse_timestamp_with_date():
+    from whatsplay.object.message import parse_timestamp
+    assert parse_timestamp("[10:30, 15/3/2024] Ana: Hola") == datetime(2024, 3, 15, 10, 30)
+    # Month-first locales are detected when the day cannot be a month
+    assert parse_timestamp("[9:05, 3/15/24] Ann: Hi") == datetime(2024, 3, 15, 9, 5)
+
+
 def test_parse_timestamp_invalid_format_returns_none():
     from whatsplay.object.message import parse_timestamp
     result = parse_timestamp("no brackets here")
@@ -406,3 +413,108 @@ async def test_context_menu_logs_warning_when_no_target(caplog):
     assert result is None
     # Verify warning was actually logged
     assert "no target element found" in caplog.text
+
+
+# ============================================================
+# message_from_data — bulk in-page extraction
+# ============================================================
+
+def _node_data(**overrides):
+    data = {
+        "id": "false_123@c.us_ABC",
+        "testid": "conv-msg-false_123",
+        "pre_plain_text": "[14:30] Juan Perez: ",
+        "sender_label": "",
+        "text": "Hola",
+        "has_download_icon": False,
+        "file_title": "",
+        "is_quoted": False,
+        "has_voice_button": False,
+        "has_voice_container": False,
+        "has_voice_icon": False,
+        "duration": None,
+    }
+    data.update(overrides)
+    return data
+
+
+def test_message_from_data_plain_text():
+    from whatsplay.object.message import Message, message_from_data
+    msg = message_from_data(_node_data(), MagicMock())
+    assert type(msg) is Message
+    assert msg.sender == "Juan Perez"
+    assert msg.text == "Hola"
+    assert msg.msg_id == "false_123@c.us_ABC"
+    assert msg.timestamp.hour == 14 and msg.timestamp.minute == 30
+    assert msg.is_outgoing is False
+
+
+def test_message_from_data_sender_label_fallback_and_outgoing():
+    from whatsplay.object.message import message_from_data
+    msg = message_from_data(_node_data(pre_plain_text="", sender_label="Tú:"), MagicMock())
+    assert msg.sender == "Tú"
+    assert msg.is_outgoing is True
+
+
+def test_message_from_data_file_message():
+    from whatsplay.object.message import FileMessage, message_from_data
+    msg = message_from_data(
+        _node_data(has_download_icon=True, file_title='Download "informe.pdf"'),
+        MagicMock(),
+    )
+    assert isinstance(msg, FileMessage)
+    assert msg.filename == "informe.pdf"
+    assert msg.msg_id == "false_123@c.us_ABC"
+
+
+def test_message_from_data_voice_takes_precedence():
+    from whatsplay.object.message import VoiceMessage, message_from_data
+    msg = message_from_data(
+        _node_data(has_voice_button=True, has_download_icon=True, duration=65.0),
+        MagicMock(),
+    )
+    assert isinstance(msg, VoiceMessage)
+    assert msg.duration == "01:05"
+
+
+def test_message_from_data_quoted_voice_is_not_voice():
+    from whatsplay.object.message import VoiceMessage, message_from_data
+    msg = message_from_data(_node_data(has_voice_icon=True, is_quoted=True), MagicMock())
+    assert not isinstance(msg, VoiceMessage)
+
+
+@pytest.mark.asyncio
+async def test_get_container_rehydrates_by_data_id():
+    from whatsplay.object.message import Message
+    page = MagicMock()
+    container = MagicMock()
+    page.query_selector = AsyncMock(return_value=container)
+    msg = Message(page, "Ana", datetime.now(), "Hola", msg_id='true_1@c.us_"AB"')
+
+    assert await msg.get_container() is container
+    selector = page.query_selector.call_args[0][0]
+    assert selector.endswith('[data-id="true_1@c.us_\\"AB\\""]')
+
+
+@pytest.mark.asyncio
+async def test_get_container_without_id_returns_none():
+    from whatsplay.object.message import Message
+    page = MagicMock()
+    page.query_selector = AsyncMock()
+    msg = Message(page, "Ana", datetime.now(), "Hola")
+
+    assert await msg.get_container() is None
+    page.query_selector.assert_not_called()
+
+
+def test_message_arguments_after_text_are_keyword_only():
+    from whatsplay.object.message import FileMessage, Message
+
+    # Old signature: container came right after text
+    with pytest.raises(TypeError):
+        Message(MagicMock(), "Ana", datetime.now(), "Hola", MagicMock())
+    with pytest.raises(TypeError):
+        FileMessage(MagicMock(), "Ana", datetime.now(), "", MagicMock(), "a.pdf", MagicMock())
+
+    msg = FileMessage(MagicMock(), "Ana", datetime.now(), "", filename="a.pdf", msg_id="x")
+    assert (msg.filename, msg.msg_id, msg.is_outgoing) == ("a.pdf", "x", False)
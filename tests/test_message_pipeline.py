@@ -0,0 +1,162 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from whatsplay.scheduler import PageScheduler
+from whatsplay.chat_list import CHAT_NEW_MESSAGE, CHAT_READ, CHAT_UNREAD
+from whatsplay.chat_manager import COLLECT_MESSAGES_JS, ChatManager
+from whatsplay.events.event_handler import EventHandler
+from whatsplay.message_pipeline import MessagePipeline, SeenCache
+from whatsplay.object.message import Message
+from whatsplay.state_manager import StateManager
+
+
+def _msg(msg_id, outgoing=False):
+    return Message(MagicMock(), "Ana", datetime.now(), msg_id, is_outgoing=outgoing, msg_id=msg_id)
+
+
+# Mock de un cliente mínimo para MessagePipeline
+class MockClient(EventHandler):
+    def __init__(self):
+        super().__init__()
+        self.scheduler = PageScheduler()
+        self.chat_manager = AsyncMock()
+        self.chat_manager.open.return_value = True
+        self.chat_manager._leave_chat.return_value = []
+        self.emitted = []
+
+        @self.event("on_message")
+        async def on_message(msg):
+            self.emitted.append(msg.msg_id)
+
+
+def _diff(name, kind=CHAT_UNREAD, unread="1"):
+    return {"type": kind, "changes": [kind], "chat": {"name": name, "group": None, "unread_count": unread}}
+
+
+def test_seen_cache_is_bounded():
+    cache = SeenCache(maxsize=2)
+    assert cache.add("a") and cache.add("b") and cache.add("c")
+    assert "a" not in cache
+    assert len(cache) == 2
+    assert cache.add("c") is False
+
+
+@pytest.mark.asyncio
+async def test_pipeline_emits_one_event_per_new_incoming_message():
+    client = MockClient()
+    client.chat_manager.collect_messages.return_value = [_msg("m1"), _msg("m2"), _msg("m3", outgoing=True)]
+    pipeline = MessagePipeline(client)
+
+    await pipeline.process([_diff("Ana", unread="5")])
+
+    assert client.emitted == ["m1", "m2"]
+    client.chat_manager.collect_messages.assert_called_once_with(
+        incremental=True, chat="Ana", watermarks=pipeline.watermarks
+    )
+    client.chat_manager._leave_chat.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_first_time_only_takes_unread_count():
+    client = MockClient()
+    client.chat_manager.collect_messages.return_value = [_msg("old"), _msg("m1"), _msg("m2")]
+    pipeline = MessagePipeline(client)
+
+    await pipeline.process([_diff("Ana", unread="2")])
+
+    assert client.emitted == ["m1", "m2"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_dedupes_and_skips_read_chats():
+    client = MockClient()
+    client.chat_manager.collect_messages.return_value = [_msg("m1")]
+    pipeline = MessagePipeline(client)
+    pipeline.watermarks["Ana"] = "m0"
+
+    await pipeline.process([_diff("Ana"), _diff("Luis", kind=CHAT_READ)])
+    await pipeline.process([_diff("Ana", kind=CHAT_NEW_MESSAGE)])
+
+    assert client.emitted == ["m1"]
+    assert client.chat_manager.open.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_idle_without_listeners():
+    client = MockClient()
+    client._events.clear()
+    pipeline = MessagePipeline(client)
+
+    await pipeline.process([_diff("Ana")])
+
+    client.chat_manager.open.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_watched_chat_and_emits_its_missed_messages():
+    client = MockClient()
+    client.chat_watcher = MagicMock()
+    client.chat_watcher.chat = "Soporte"
+    client.chat_manager._leave_chat.return_value = [_msg("w1")]
+    client.chat_manager.collect_messages.return_value = [_msg("m1")]
+    pipeline = MessagePipeline(client)
+
+    await pipeline.process([_diff("Soporte"), _diff("Ana")])
+
+    client.chat_manager.open.assert_awaited_once_with("Ana")
+    assert client.emitted == ["m1", "w1"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_emits_offered_messages_on_next_process():
+    client = MockClient()
+    pipeline = MessagePipeline(client)
+
+    pipeline.offer([_msg("m1"), _msg("m2", outgoing=True)])
+    pipeline.offer([_msg("m1")])
+    await pipeline.process([])
+
+    assert client.emitted == ["m1"]
+
+
+# Mock de un cliente con ChatManager y pipeline reales, sobre una página falsa
+class CollectingClient(EventHandler):
+    def __init__(self, rows):
+        super().__init__()
+
+        async def evaluate(script, arg=None):
+            return {"chat": "Ana", "messages": rows} if script == COLLECT_MESSAGES_JS else None
+
+        self._page = AsyncMock()
+        self._page.evaluate.side_effect = evaluate
+        self.scheduler = PageScheduler()
+        self.wa_elements = MagicMock()
+        self.level_triggered_unread = False
+        self.chat_watcher = None
+        self.chat_manager = ChatManager(self)
+        self.chat_manager.open = AsyncMock(return_value=True)
+        self.chat_manager._leave_chat = AsyncMock(return_value=[])
+        self.message_pipeline = MessagePipeline(self)
+
+
+@pytest.mark.asyncio
+async def test_collecting_unread_handler_does_not_hide_messages_from_pipeline():
+    rows = [
+        {"id": m, "testid": "conv-msg-" + m, "pre_plain_text": "[10:00] Ana: ", "text": m}
+        for m in ("m1", "m2")
+    ]
+    client = CollectingClient(rows)
+    collected, emitted = [], []
+
+    @client.event("on_unread_chat")
+    async def on_unread(chats):
+        collected.extend(await client.chat_manager.collect_messages(incremental=True, chat="Ana"))
+
+    @client.event("on_message")
+    async def on_message(msg):
+        emitted.append(msg.msg_id)
+
+    await StateManager(client)._emit_unread_changes([{"name": "Ana", "group": None, "unread_count": "2"}])
+
+    assert [m.msg_id for m in collected] == ["m1", "m2"]
+    assert emitted == ["m1", "m2"]
@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from whatsplay.metrics import (
+    OPERATION_SECONDS,
+    OPERATIONS_TOTAL,
+    PAGE_WAIT_SECONDS,
+    Histogram,
+    MetricsRegistry,
+    MetricsServer,
+    timed,
+)
+from whatsplay.scheduler import PRIORITY_SEND, PageScheduler
+
+
+# Mock de un cliente mínimo para las métricas
+class MockClient:
+    def __init__(self):
+        self.metrics = MetricsRegistry()
+
+
+class MockManager:
+    def __init__(self, client):
+        self.client = client
+
+    @timed("open")
+    async def open(self, result):
+        return result
+
+    @timed("send_message")
+    async def send(self):
+        raise RuntimeError("boom")
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    h = Histogram(buckets=(1.0, 2.0))
+    for value in (0.5, 0.5, 1.5, 1.5):
+        h.observe(value)
+
+    assert h.count == 4 and h.sum == 4.0 and h.max == 1.5
+    assert h.quantile(0.5) == 1.0
+    assert 1.0 < h.quantile(0.95) <= 1.5
+    assert h.cumulative() == [(1.0, 2), (2.0, 4), (float("inf"), 4)]
+    assert Histogram().quantile(0.5) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_timed_records_duration_and_outcome():
+    manager = MockManager(MockClient())
+    metrics = manager.client.metrics
+
+    assert await manager.open(True)
+    assert not await manager.open(False)
+    with pytest.raises(RuntimeError):
+        await manager.send()
+
+    assert metrics.histogram(OPERATION_SECONDS, operation="open").count == 2
+    assert metrics.counter(OPERATIONS_TOTAL, operation="open", outcome="ok") == 1
+    assert metrics.counter(OPERATIONS_TOTAL, operation="open", outcome="failed") == 1
+    assert metrics.counter(OPERATIONS_TOTAL, operation="send_message", outcome="error") == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_without_registry_is_transparent():
+    manager = MockManager(object())
+    assert await manager.open("x") == "x"
+
+
+def test_render_prometheus_format():
+    metrics = MetricsRegistry(buckets=(0.1,))
+    metrics.inc("errors_total")
+    metrics.observe("operation_duration_seconds", 0.05, operation='se"nd')
+    metrics.add_collector(lambda: [("page_queue_depth", {}, 3)])
+
+    text = metrics.render_prometheus()
+
+    assert "# TYPE whatsplay_errors_total counter\nwhatsplay_errors_total 1\n" in text
+    assert 'whatsplay_operation_duration_seconds_bucket{operation="se\\"nd",le="0.1"} 1' in text
+    assert 'whatsplay_operation_duration_seconds_bucket{operation="se\\"nd",le="+Inf"} 1' in text
+    assert 'whatsplay_operation_duration_seconds_count{operation="se\\"nd"} 1' in text
+    assert "# TYPE whatsplay_page_queue_depth gauge\nwhatsplay_page_queue_depth 3" in text
+    assert metrics.snapshot()["histograms"]["operation_duration_seconds"][0]["p95"] <= 0.05
+
+
+@pytest.mark.asyncio
+async def test_scheduler_observes_page_wait():
+    scheduler = PageScheduler()
+    scheduler.metrics = MetricsRegistry()
+
+    async with scheduler.slot(PRIORITY_SEND, "send"):
+        pass
+
+    assert scheduler.metrics.histogram(PAGE_WAIT_SECONDS, priority=PRIORITY_SEND).count == 1
+
+
+@pytest.mark.asyncio
+async def test_server_serves_metrics():
+    metrics = MetricsRegistry()
+    metrics.inc("reconnects_total")
+    server = MetricsServer(metrics, port=0)
+    await server.start()
+    try:
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = (await reader.read()).decode()
+        writer.close()
+    finally:
+        await server.stop()
+
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert "whatsplay_reconnects_total 1" in response
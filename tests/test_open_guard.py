@@ -0,0 +1,81 @@
+from whatsplay.open_guard import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    NegativeCache,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_negative_cache_expires_after_ttl():
+    clock = FakeClock()
+    cache = NegativeCache(ttl=10, clock=clock)
+    cache.add("ana", "not_found")
+
+    assert cache.get("ana") == "not_found"
+    clock.now = 10
+    assert cache.get("ana") is None
+    assert len(cache) == 0
+
+
+def test_negative_cache_is_bounded():
+    cache = NegativeCache(maxsize=2)
+    for target in ("a", "b", "c"):
+        cache.add(target, "not_found")
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "not_found"
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_cooldown():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=2, cooldown=30, clock=clock)
+
+    breaker.record_failure("ana")
+    assert breaker.allow("ana")
+    breaker.record_failure("ana")
+    assert breaker.state("ana") == BREAKER_OPEN
+    assert not breaker.allow("ana")
+
+    clock.now = 30
+    assert breaker.state("ana") == BREAKER_HALF_OPEN
+    assert breaker.allow("ana")
+    assert not breaker.allow("ana")  # only one trial at a time
+
+    breaker.record_success("ana")
+    assert breaker.state("ana") == BREAKER_CLOSED
+    assert breaker.rejected == 2
+
+
+def test_failed_trial_reopens_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown=5, clock=clock)
+    breaker.record_failure("ana")
+    clock.now = 5
+    assert breaker.allow("ana")
+
+    breaker.record_failure("ana")
+
+    assert breaker.state("ana") == BREAKER_OPEN
+
+
+def test_breaker_forgets_least_recently_failed_target():
+    breaker = CircuitBreaker(threshold=1, maxsize=2, clock=FakeClock())
+    breaker.record_failure("ana")
+    breaker.record_failure("luis")
+    breaker.record_failure("ana")
+
+    breaker.record_failure("eva")
+
+    assert len(breaker._targets) == 2
+    assert breaker.state("luis") == BREAKER_CLOSED
+    assert breaker.state("ana") == BREAKER_OPEN
+    assert breaker.state("eva") == BREAKER_OPEN
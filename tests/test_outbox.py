@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from whatsplay.outbox import Outbox
+
+
+class RecordingSender:
+    """Fake send_batch that records each batch."""
+
+    def __init__(self, fail=()):
+        self.batches = []
+        self.fail = set(fail)
+
+    async def __call__(self, chat, messages, open_via_url):
+        self.batches.append((chat, list(messages)))
+        await asyncio.sleep(0)
+        return [m not in self.fail for m in messages]
+
+
+@pytest.mark.asyncio
+async def test_messages_to_same_chat_are_coalesced():
+    sender = RecordingSender()
+    outbox = Outbox(sender)
+
+    results = await asyncio.gather(
+        outbox.send("Ana", "1"), outbox.send("Luis", "a"), outbox.send("Ana", "2")
+    )
+
+    assert results == [True, True, True]
+    assert sender.batches == [("Ana", ["1", "2"]), ("Luis", ["a"])]
+    assert len(outbox) == 0
+
+
+@pytest.mark.asyncio
+async def test_each_message_gets_its_own_result():
+    sender = RecordingSender(fail={"bad"})
+    outbox = Outbox(sender)
+
+    futures = [outbox.submit("Ana", m) for m in ("ok", "bad", "ok2")]
+
+    assert await asyncio.gather(*futures) == [True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_messages_queued_during_a_batch_form_the_next_batch():
+    sender = RecordingSender()
+    outbox = Outbox(sender)
+
+    first = outbox.submit("Ana", "1")
+    await asyncio.sleep(0)  # drain task starts sending the first batch
+    second = [outbox.submit("Ana", "2"), outbox.submit("Ana", "3")]
+
+    await asyncio.gather(first, *second)
+    assert sender.batches == [("Ana", ["1"]), ("Ana", ["2", "3"])]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_resolves_futures_none():
+    async def broken(chat, messages, open_via_url):
+        raise RuntimeError("boom")
+
+    outbox = Outbox(broken)
+
+    assert await outbox.send("Ana", "hola") is None
+
+
+@pytest.mark.asyncio
+async def test_cancelled_drain_releases_every_sender():
+    started = asyncio.Event()
+
+    async def slow(chat, messages, open_via_url):
+        started.set()
+        await asyncio.sleep(10)
+
+    outbox = Outbox(slow)
+    sending = outbox.submit("Ana", "1")
+    await started.wait()
+    queued = outbox.submit("Luis", "2")
+    outbox._task.cancel()
+    await asyncio.sleep(0)
+
+    assert sending.cancelled() and queued.cancelled()
+    assert len(outbox) == 0
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_and_awaits_the_drain_task():
+    started = asyncio.Event()
+
+    async def slow(chat, messages, open_via_url):
+        started.set()
+        await asyncio.sleep(10)
+
+    outbox = Outbox(slow)
+    sending = outbox.submit("Ana", "1")
+    task = outbox._task
+    await started.wait()
+
+    await outbox.close()
+
+    assert task.done() and sending.cancelled()
+    assert outbox._task is None
+    # Nothing left to stop
+    await outbox.close()
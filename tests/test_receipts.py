@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from whatsplay.receipts import (
+    RECEIPT_BINDING_NAME,
+    RECEIPT_DELIVERED,
+    RECEIPT_PENDING,
+    RECEIPT_READ,
+    RECEIPT_SELECTORS,
+    RECEIPT_SENT,
+    DeliveryReceipt,
+    ReceiptTracker,
+)
+
+
+def test_receipt_selectors_have_no_playwright_prefix():
+    assert all(not css.startswith("css=") for css in RECEIPT_SELECTORS.values())
+
+
+def test_receipt_status_only_moves_forward():
+    receipt = DeliveryReceipt("true_1@c.us_A")
+    receipt.update(RECEIPT_DELIVERED)
+    receipt.update(RECEIPT_PENDING)
+
+    assert receipt.status == RECEIPT_DELIVERED
+    assert receipt.reached(RECEIPT_SENT)
+    assert not receipt.reached(RECEIPT_READ)
+    assert receipt.latency(RECEIPT_SENT) is not None
+
+
+@pytest.mark.asyncio
+async def test_receipt_wait_resolves_on_update():
+    receipt = DeliveryReceipt("true_1@c.us_A")
+    waiter = asyncio.create_task(receipt.wait(RECEIPT_SENT, timeout=1))
+    await asyncio.sleep(0)
+    receipt.update(RECEIPT_SENT)
+
+    assert await waiter is True
+    assert await receipt.wait(RECEIPT_READ, timeout=0.01) is False
+
+
+@pytest.mark.asyncio
+async def test_tracker_resolves_receipts_from_page_notifications():
+    client = MagicMock()
+    client._page = AsyncMock()
+    client._page.evaluate.side_effect = [None, RECEIPT_PENDING]  # install, track
+    tracker = ReceiptTracker(client)
+
+    receipt = await tracker.track("true_1@c.us_A", "Ana")
+
+    assert receipt.status == RECEIPT_PENDING
+    assert client._page.expose_binding.call_args[0][0] == RECEIPT_BINDING_NAME
+    tracker._on_receipt(None, {"id": "true_1@c.us_A", "status": RECEIPT_SENT})
+    assert receipt.status == RECEIPT_SENT
+    tracker._on_receipt(None, {"id": "true_1@c.us_A", "status": RECEIPT_READ})
+    assert receipt.status == RECEIPT_READ
+    assert tracker.get("true_1@c.us_A") is None  # read receipts are final
+
+
+@pytest.mark.asyncio
+async def test_wait_new_outgoing_id_returns_none_on_timeout():
+    client = MagicMock()
+    client._page = AsyncMock()
+    client._page.wait_for_function.side_effect = Exception("Timeout")
+    tracker = ReceiptTracker(client)
+
+    assert await tracker.wait_new_outgoing_id("true_old", timeout=0.1) is None
+
+
+@pytest.mark.asyncio
+async def test_tracker_retracks_pending_receipts_after_reload():
+    client = MagicMock()
+    client._page = AsyncMock()
+    client._page.evaluate.side_effect = [True, RECEIPT_PENDING]  # install, track
+    tracker = ReceiptTracker(client)
+    first = await tracker.track("true_1@c.us_A", "Ana")
+
+    # The page was reloaded: the observer is installed again
+    client._page.evaluate.side_effect = [True, [RECEIPT_SENT], None]  # install, re-track, track
+    await tracker.track("true_1@c.us_B", "Luis")
+
+    assert first.status == RECEIPT_SENT
+    assert client._page.evaluate.call_args_list[3][0][1] == ["true_1@c.us_A"]
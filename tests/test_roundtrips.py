@@ -0,0 +1,90 @@
+import pytest
+from whatsplay.metrics import timed
+from whatsplay.roundtrips import OTHER_OPERATION, RoundTripProxy, RoundTripStats
+
+
+# Objetos mínimos con los nombres de clase de Playwright
+class ElementHandle:
+    async def get_attribute(self, name):
+        return "title"
+
+
+class Locator:
+    def nth(self, index):
+        return self
+
+    async def is_visible(self):
+        return True
+
+
+class Keyboard:
+    async def press(self, key):
+        return None
+
+
+class Page:
+    def __init__(self):
+        self.keyboard = Keyboard()
+        self.evaluated_with = None
+
+    def locator(self, selector):
+        return Locator()
+
+    async def query_selector_all(self, selector):
+        return [ElementHandle(), ElementHandle()]
+
+    async def evaluate(self, script, arg=None):
+        self.evaluated_with = arg
+        return 1
+
+
+class MockManager:
+    def __init__(self, page):
+        self.client = object()
+        self.page = page
+
+    @timed("open")
+    async def open(self):
+        await self.page.locator("#x").nth(0).is_visible()
+        await self.page.keyboard.press("Enter")
+        return await self.inner()
+
+    @timed("collect_messages")
+    async def inner(self):
+        handles = await self.page.query_selector_all(".msg")
+        return [await h.get_attribute("title") for h in handles]
+
+
+@pytest.mark.asyncio
+async def test_calls_are_attributed_to_the_outermost_operation():
+    stats = RoundTripStats()
+    manager = MockManager(RoundTripProxy(Page(), stats))
+
+    assert await manager.open() == ["title", "title"]
+    await manager.page.evaluate("() => 1")
+
+    report = {r["operation"]: r for r in stats.report()}
+    assert report["open"]["calls"] == 5
+    assert report["open"]["methods"] == {
+        "ElementHandle.get_attribute": 2,
+        "Keyboard.press": 1,
+        "Locator.is_visible": 1,
+        "Page.query_selector_all": 1,
+    }
+    assert report[OTHER_OPERATION]["methods"] == {"Page.evaluate": 1}
+    assert "open" in stats.format_report()
+
+
+@pytest.mark.asyncio
+async def test_proxies_are_unwrapped_before_reaching_the_driver():
+    stats = RoundTripStats()
+    page = Page()
+    proxy = RoundTripProxy(page, stats)
+
+    handles = await proxy.query_selector_all(".msg")
+    assert isinstance(handles[0], RoundTripProxy)
+    await proxy.evaluate("(el) => el", handles[0])
+
+    assert isinstance(page.evaluated_with, ElementHandle)
+    stats.reset()
+    assert stats.report() == []
@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from whatsplay.scheduler import (
+    PRIORITY_SCRAPE,
+    PRIORITY_SEND,
+    PRIORITY_SWEEP,
+    PageLock,
+    PageScheduler,
+)
+
+
+async def _run(scheduler, priority, name, order, hold=0.0):
+    async with scheduler.slot(priority, name):
+        order.append(name)
+        await asyncio.sleep(hold)
+
+
+@pytest.mark.asyncio
+async def test_waiting_operations_run_by_priority():
+    scheduler = PageScheduler(aging_rate=0)
+    order = []
+    await scheduler.acquire(PRIORITY_SCRAPE, "busy")
+
+    tasks = [
+        asyncio.create_task(_run(scheduler, PRIORITY_SWEEP, "sweep", order)),
+        asyncio.create_task(_run(scheduler, PRIORITY_SCRAPE, "scrape", order)),
+        asyncio.create_task(_run(scheduler, PRIORITY_SEND, "send", order)),
+    ]
+    await asyncio.sleep(0)
+    assert len(scheduler) == 3
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["send", "scrape", "sweep"]
+    assert not scheduler.locked()
+
+
+@pytest.mark.asyncio
+async def test_aging_lets_old_low_priority_operations_through():
+    scheduler = PageScheduler(aging_rate=1000)
+    order = []
+    await scheduler.acquire(PRIORITY_SEND, "busy")
+
+    sweep = asyncio.create_task(_run(scheduler, PRIORITY_SWEEP, "sweep", order))
+    await asyncio.sleep(0.05)  # sweep has waited long enough to outrank a send
+    send = asyncio.create_task(_run(scheduler, PRIORITY_SEND, "send", order))
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.gather(sweep, send)
+
+    assert order == ["sweep", "send"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_and_cancellation_leave_the_queue():
+    scheduler = PageScheduler()
+    await scheduler.acquire(PRIORITY_SEND, "busy")
+
+    with pytest.raises(asyncio.TimeoutError):
+        await scheduler.acquire(PRIORITY_SWEEP, "sweep", deadline=0.01)
+
+    waiter = asyncio.create_task(scheduler.acquire(PRIORITY_SCRAPE, "scrape"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert len(scheduler) == 0
+    stats = scheduler.stats()
+    assert stats["timeouts"] == 1
+    assert stats["cancellations"] == 1
+    assert stats["running"] == "busy"
+
+    scheduler.release()
+    assert not scheduler.locked()
+
+
+@pytest.mark.asyncio
+async def test_stats_report_wait_times_per_priority():
+    scheduler = PageScheduler()
+    await scheduler.acquire(PRIORITY_SEND, "busy")
+    waiter = asyncio.create_task(_run(scheduler, PRIORITY_SCRAPE, "scrape", []))
+    await asyncio.sleep(0.02)
+    scheduler.release()
+    await waiter
+
+    stats = scheduler.stats()["priorities"]
+    assert stats[PRIORITY_SEND]["count"] == 1
+    assert stats[PRIORITY_SCRAPE]["max_wait"] >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_page_lock_compat():
+    scheduler = PageScheduler()
+    lock = PageLock(scheduler)
+
+    async with lock:
+        assert lock.locked()
+        assert scheduler.current == "user"
+    assert not lock.locked()
@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
+from whatsplay.scheduler import PageScheduler
 from whatsplay.state_manager import StateManager
 
 # Mock de un cliente mínimo para StateManager
@@ -7,10 +8,15 @@ class MockClient:
     def __init__(self):
         self._page = AsyncMock()
         self._is_running = True
-        self._page_lock = MagicMock()
-        self._page_lock.locked.return_value = False
+        self.scheduler = PageScheduler()
         self.wa_elements = MagicMock()
+        self.wa_elements.last_probe = None
         self.chat_manager = AsyncMock()
+        self.chat_manager.last_sweep_ok = True
+        self.chat_manager.last_sweep_covered = None
+        self.level_triggered_unread = False
+        self.message_pipeline = MagicMock()
+        self.message_pipeline.process = AsyncMock()
         self.emit = AsyncMock() # Make emit an AsyncMock
 
 @pytest.fixture
@@ -103,4 +109,89 @@ async def test_handle_logged_in_state_exception(mock_state_manager):
     # Verificar que se emitió 'on_error'
     mock_state_manager.client.emit.assert_called_with(
         "on_error", "Error in logged-in state: Test error"
-    )
\ No newline at end of file
+    )
+
+
+@pytest.mark.asyncio
+async def test_handle_logged_in_state_skips_continue_query_when_probe_clean(mock_state_manager):
+    # El probe de estado ya informó que no hay modal 'Continue'
+    mock_state_manager.wa_elements.last_probe = {
+        "state": "LOGGED_IN",
+        "continue_modal": False,
+        "qr": False,
+    }
+    mock_state_manager.client.chat_manager._check_unread_chats.return_value = []
+
+    await mock_state_manager._handle_logged_in_state()
+
+    mock_state_manager._page.query_selector.assert_not_called()
+    mock_state_manager.client.chat_manager._check_unread_chats.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_unread_chat_is_edge_triggered(mock_state_manager):
+    mock_state_manager._page.query_selector.return_value = None
+    chats = [{"name": "Chat1", "last_message": "Hola"}]
+    mock_state_manager.client.chat_manager._check_unread_chats.return_value = chats
+
+    await mock_state_manager._handle_logged_in_state()
+    assert mock_state_manager.client.emit.call_count == 2  # on_chat_update + on_unread_chat
+
+    # Same unread chat on the next tick: nothing new to report
+    mock_state_manager.client.emit.reset_mock()
+    await mock_state_manager._handle_logged_in_state()
+    mock_state_manager.client.emit.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_unread_chat_level_triggered_option(mock_state_manager):
+    mock_state_manager._page.query_selector.return_value = None
+    mock_state_manager.client.level_triggered_unread = True
+    chats = [{"name": "Chat1", "last_message": "Hola"}]
+    mock_state_manager.client.chat_manager._check_unread_chats.return_value = chats
+
+    await mock_state_manager._handle_logged_in_state()
+    mock_state_manager.client.emit.reset_mock()
+    await mock_state_manager._handle_logged_in_state()
+
+    mock_state_manager.client.emit.assert_called_once_with("on_unread_chat", chats)
+
+@pytest.mark.asyncio
+async def test_failed_sweep_does_not_report_chats_as_read(mock_state_manager):
+    mock_state_manager._page.query_selector.return_value = None
+    chat_manager = mock_state_manager.client.chat_manager
+    chat_manager._check_unread_chats.return_value = [{"name": "Chat1"}]
+    await mock_state_manager._handle_logged_in_state()
+
+    chat_manager.last_sweep_ok = False
+    chat_manager._check_unread_chats.return_value = []
+    mock_state_manager.client.emit.reset_mock()
+    await mock_state_manager._handle_logged_in_state()
+
+    mock_state_manager.client.emit.assert_not_called()
+    assert len(mock_state_manager.chat_list) == 1
+
+@pytest.mark.asyncio
+async def test_partial_sweep_only_reports_covered_chats_as_read(mock_state_manager):
+    mock_state_manager._page.query_selector.return_value = None
+    chat_manager = mock_state_manager.client.chat_manager
+    chat_manager.last_sweep_covered = None
+    chat_manager._check_unread_chats.return_value = [{"name": "Chat1"}, {"name": "Chat2"}]
+    await mock_state_manager._handle_logged_in_state()
+
+    chat_manager.last_sweep_covered = {(None, "Chat1")}
+    chat_manager._check_unread_chats.return_value = []
+    await mock_state_manager._handle_logged_in_state()
+
+    assert [c["name"] for c in mock_state_manager.chat_list.chats] == ["Chat2"]
+
+@pytest.mark.asyncio
+async def test_unread_diffs_are_fed_to_message_pipeline(mock_state_manager):
+    mock_state_manager._page.query_selector.return_value = None
+    pipeline = MagicMock()
+    pipeline.process = AsyncMock()
+    mock_state_manager.client.message_pipeline = pipeline
+    mock_state_manager.client.chat_manager._check_unread_chats.return_value = [{"name": "Chat1"}]
+
+    await mock_state_manager._handle_logged_in_state()
+
+    diffs = pipeline.process.call_args[0][0]
+    assert [d["chat"]["name"] for d in diffs] == ["Chat1"]
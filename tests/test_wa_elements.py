@@ -0,0 +1,161 @@
+import pytest
+from unittest.mock import AsyncMock
+from whatsplay.constants.states import State
+from whatsplay.wa_elements import WhatsAppElements
+
+
+@pytest.fixture
+def wa_elements():
+    return WhatsAppElements(AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_get_state_uses_single_evaluate(wa_elements):
+    wa_elements.page.evaluate.return_value = {
+        "state": "LOGGED_IN",
+        "continue_modal": False,
+        "qr": False,
+    }
+
+    state = await wa_elements.get_state()
+
+    assert state == State.LOGGED_IN
+    wa_elements.page.evaluate.assert_called_once()
+    wa_elements.page.locator.assert_not_called()
+    assert wa_elements.round_trips == 1
+    assert wa_elements.last_probe["continue_modal"] is False
+
+
+@pytest.mark.asyncio
+async def test_get_state_qr_auth(wa_elements):
+    wa_elements.page.evaluate.return_value = {
+        "state": "QR_AUTH",
+        "continue_modal": False,
+        "qr": True,
+    }
+
+    assert await wa_elements.get_state() == State.QR_AUTH
+
+
+@pytest.mark.asyncio
+async def test_get_state_unknown_returns_none(wa_elements):
+    wa_elements.page.evaluate.return_value = {
+        "state": None,
+        "continue_modal": False,
+        "qr": False,
+    }
+
+    assert await wa_elements.get_state() is None
+
+
+@pytest.mark.asyncio
+async def test_get_state_evaluate_error_returns_none(wa_elements):
+    wa_elements.page.evaluate.side_effect = Exception("navigating")
+
+    assert await wa_elements.get_state() is None
+    assert wa_elements.last_probe is None
+
+
+@pytest.mark.asyncio
+async def test_get_active_chat_filter_maps_labels(wa_elements):
+    wa_elements.page.evaluate.return_value = "No leídos 3"
+    assert await wa_elements.get_active_chat_filter() == "unread"
+
+    wa_elements.page.evaluate.return_value = "Groups"
+    assert await wa_elements.get_active_chat_filter() == "groups"
+
+    wa_elements.page.evaluate.return_value = None
+    assert await wa_elements.get_active_chat_filter() is None
+
+
+@pytest.mark.asyncio
+async def test_open_clicks_visible_row_by_exact_title(wa_elements):
+    row = AsyncMock()
+    wa_elements.page.query_selector.return_value = row
+    wa_elements._open_via_search = AsyncMock()
+
+    assert await wa_elements.open("ana", title="Ana") is True
+
+    selector = wa_elements.page.query_selector.call_args[0][0]
+    assert "@title='Ana'" in selector
+    row.click.assert_awaited_once()
+    wa_elements._open_via_search.assert_not_called()
+    assert wa_elements.last_open_route == "row"
+
+
+@pytest.mark.asyncio
+async def test_open_with_url_route_tries_sidebar_before_reloading(wa_elements):
+    wa_elements._open_via_url = AsyncMock(return_value=True)
+    wa_elements.page.query_selector.return_value = AsyncMock()
+
+    assert await wa_elements.open("+54 11 2233", route="url") is True
+
+    wa_elements._open_via_url.assert_not_called()
+    assert wa_elements.last_open_route == "row"
+
+
+@pytest.mark.asyncio
+async def test_open_with_url_route_falls_back_to_url(wa_elements):
+    wa_elements._open_via_url = AsyncMock(return_value=True)
+    wa_elements.page.query_selector.return_value = None
+    wa_elements._open_via_search = AsyncMock(side_effect=Exception("sin resultados"))
+
+    assert await wa_elements.open("+54 11 2233", route="url") is True
+
+    wa_elements._open_via_url.assert_awaited_once()
+    assert wa_elements.last_open_route == "url"
+    assert wa_elements.last_open_error is None
+
+
+@pytest.mark.asyncio
+async def test_open_only_reports_not_found_on_empty_search(wa_elements):
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    from whatsplay.constants import locator as loc
+
+    wa_elements.click_search_button = AsyncMock(return_value=True)
+    wa_elements.page.query_selector_all.return_value = [AsyncMock()]
+    empty = AsyncMock()
+    empty.is_visible.return_value = True
+    wa_elements.page.query_selector.side_effect = (
+        lambda sel: empty if sel == loc.SEARCH_NO_RESULTS else None
+    )
+
+    assert await wa_elements.open("Nadie") is False
+    assert wa_elements.last_open_error == "not_found"
+
+    # Results that never render are a timeout, not proof the chat is missing
+    wa_elements.page.wait_for_selector.side_effect = PlaywrightTimeoutError("lento")
+    assert await wa_elements.open("Nadie") is False
+    assert wa_elements.last_open_error == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_open_reports_invalid_number(wa_elements):
+    warning = AsyncMock()
+    warning.is_visible.return_value = True
+    wa_elements.page.query_selector.return_value = warning
+
+    assert await wa_elements.open("123", open_via_url=True) is False
+    assert wa_elements.last_open_error == "invalid_number"
+
+
+@pytest.mark.asyncio
+async def test_pick_member_waits_for_matching_picker_result(wa_elements):
+    from whatsplay.wa_elements import MEMBER_PICKED_JS, MEMBER_RESULT_JS
+
+    member_input = AsyncMock()
+    events = []
+    wa_elements.page.wait_for_function.side_effect = lambda script, **kw: events.append(
+        ("wait", script, kw["arg"])
+    )
+    wa_elements.page.keyboard.press.side_effect = lambda key: events.append(("press", key))
+
+    await wa_elements._pick_member(member_input, "Ana")
+
+    member_input.fill.assert_awaited_once_with("Ana")
+    assert [e[:2] for e in events] == [
+        ("wait", MEMBER_RESULT_JS),
+        ("press", "Enter"),
+        ("wait", MEMBER_PICKED_JS),
+    ]
+    assert events[0][2]["query"] == "Ana"
@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import AsyncMock
+from whatsplay.waits import WaitStats, timed_wait, wait_for_condition, wait_for_dom_quiet, WAIT_STATS
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    WAIT_STATS.reset()
+    yield
+    WAIT_STATS.reset()
+
+
+def test_report_compares_waits_with_replaced_sleep():
+    stats = WaitStats()
+    stats.record("send_file.preview", 0.5, True, replaces=5.0)
+    stats.record("send_file.preview", 1.5, False, replaces=5.0)
+
+    (row,) = stats.report()
+    assert row["count"] == 2 and row["timeouts"] == 1
+    assert row["avg"] == pytest.approx(1.0)
+    assert row["saved"] == pytest.approx(4.0)
+    assert "send_file.preview" in stats.format_report()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_condition_uses_wait_for_function():
+    page = AsyncMock()
+
+    assert await wait_for_condition(page, "() => true", timeout=100, name="ready") is True
+    page.wait_for_function.assert_awaited_once_with("() => true", arg=None, timeout=100)
+    assert WAIT_STATS.waits["ready"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_condition_timeout_returns_false():
+    page = AsyncMock()
+    page.wait_for_function.side_effect = TimeoutError("timeout")
+
+    assert await wait_for_condition(page, "() => false", name="never") is False
+    assert WAIT_STATS.waits["never"]["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_dom_quiet_and_timed_wait():
+    page = AsyncMock()
+    page.evaluate.return_value = True
+
+    assert await wait_for_dom_quiet(page, quiet_ms=50, timeout=500, name="quiet") is True
+    assert page.evaluate.call_args[0][1] == {"quietMs": 50, "timeoutMs": 500}
+
+    failing = AsyncMock(side_effect=TimeoutError())
+    assert await timed_wait(failing(), "locator") is False